@@ -0,0 +1,197 @@
+"""
+群の解析をプログラムから行うためのモジュール。
+解析画面のコマンドと同じ内容を、文字列ではなくオブジェクトとして返す。
+文字列への変換は formatter.py で行う。
+"""
+import numpy
+
+class GroupAnalyzer(object):
+    """
+    MasterGroup とその部分群を解析するクラス。
+    解析画面の各コマンドに対応するメソッドを持つ。
+
+    例:
+        analyzer = GroupAnalyzer(master)
+        g0 = analyzer.group("g0")
+        for normal in analyzer.normal_subgroups(g0):
+            print(normal.order, normal.isomorphic)
+
+    Parameters
+    ----------
+    master : MasterGroup
+        解析対象の群。
+
+    """
+    def __init__(self, master):
+        self._master = master
+
+    @property
+    def master(self):
+        return self._master
+
+    @property
+    def maximal_group(self):
+        return self._master.maximal_group
+
+    @property
+    def all_groups(self) -> 'tuple[Group]':
+        """
+        作成された群の一覧。位数の降順に並ぶ。
+        """
+        return self._master.all_groups
+
+    def group(self, name: str):
+        """
+        指定の名前の群を返す。該当する群が存在しない場合は None。
+        """
+        return self._master.name_to_group(name)
+
+    def overview(self, group) -> 'GroupOverview':
+        """
+        概要（コマンド ? ）。
+        """
+        return GroupOverview(group)
+
+    def elements(self, group) -> 'tuple[int]':
+        """
+        要素のインデックスの一覧（コマンド Elements ）。昇順に並ぶ。
+        """
+        return tuple(sorted(group.elements))
+
+    def cayley_table(self, group) -> numpy.ndarray:
+        """
+        乗積表（コマンド Table ）。
+        """
+        return group.cayley_table
+
+    def conjugacy_classes(self, group) -> 'tuple[ConjugacyClass]':
+        """
+        共役類の一覧（コマンド ConjClass ）。
+        """
+        return group.conjugacy_classes
+
+    def conjugacy_count(self, group) -> 'ConjugacyCount':
+        """
+        共役類のカウント（コマンド ConjCount ）。
+        """
+        return group.conjugacy_count
+
+    def isomorphic(self, group) -> str:
+        """
+        群同型の表示（コマンド Isomorphic ）。
+        """
+        return group.isomorphic
+
+    def is_abelian(self, group) -> bool:
+        return group.is_abelian
+
+    def is_perfect(self, group) -> bool:
+        return group.is_perfect
+
+    def is_simple(self, group) -> bool:
+        return group.is_simple
+
+    def is_solvable(self, group) -> bool:
+        return group.is_solvable
+
+    def center(self, group):
+        """
+        群の中心（コマンド Center ）。
+        """
+        return group.center
+
+    def centralizer(self, group):
+        """
+        最大の群における中心化群（コマンド Centralizer ）。
+        """
+        return group.centralizer
+
+    def derived(self, group):
+        """
+        導来部分群（コマンド Derived ）。
+        """
+        return group.derived
+
+    def derived_series(self, group) -> 'tuple[Group]':
+        """
+        導来列（コマンド DerivedSeries ）。
+        """
+        return group.derived_series
+
+    def normal_subgroups(self, group) -> 'tuple[Group]':
+        """
+        正規部分群の一覧（コマンド Normal ）。位数の降順に並ぶ。
+        """
+        return group.all_normalsub
+
+    def normalizer(self, group):
+        """
+        最大の群における正規化群（コマンド Normalizer ）。
+        """
+        return group.normalizer
+
+    def direct_products(self, group) -> 'tuple[DirectProduct]':
+        """
+        直積への分解の一覧（コマンド DirectDecompose ）。
+        """
+        return group.direct_product
+
+    def semidirect_products(self, group) -> 'tuple[SemidirectProduct]':
+        """
+        半直積への分解の一覧（コマンド SemidirectDecompose ）。
+        """
+        return group.semidirect_product
+
+class GroupOverview(object):
+    """
+    群の概要を表す。
+    各値は初めて参照されたときに群から取得する。
+
+    Parameters
+    ----------
+    group : Group
+        対象の群。
+
+    """
+    def __init__(self, group):
+        self._group = group
+
+    @property
+    def group(self):
+        return self._group
+
+    @property
+    def name(self) -> str:
+        return self._group.name
+
+    @property
+    def order(self) -> int:
+        return self._group.order
+
+    @property
+    def isomorphic(self) -> str:
+        return self._group.isomorphic
+
+    @property
+    def is_abelian(self) -> bool:
+        return self._group.is_abelian
+
+    @property
+    def is_perfect(self) -> bool:
+        return self._group.is_perfect
+
+    @property
+    def is_simple(self) -> bool:
+        return self._group.is_simple
+
+    @property
+    def is_solvable(self) -> bool:
+        return self._group.is_solvable
+
+    @property
+    def direct_products(self) -> 'tuple[DirectProduct]':
+        return self._group.direct_product
+
+    @property
+    def semidirect_products(self) -> 'tuple[SemidirectProduct]':
+        return self._group.semidirect_product
@@ -0,0 +1,299 @@
+"""
+解析画面を使用せずに、多数の生成元の組をまとめて解析する。
+
+入力ファイルの形式:
+    .npy   : 形状が (k, m, d, d) の配列。k組の、m個の d 次の生成元。
+             形状が (m, d, d) の場合は一組とする。
+    .npz   : 配列ごとに一組。配列の形状は (m, d, d)。配列の名前を id とする。
+    .jsonl : 一行ごとに一組。
+             {"id": ..., "generators": [...], "zero_base": ..., "maximal": ...}
+             generators の各成分は数値、または [実部, 虚部] とする。
+             id, zero_base, maximal は省略可能。
+
+結果は一組ごとに一行の JSON として、入力の順に出力する。
+コマンドの結果は解析画面の文字列ではなく、GroupAnalyzer の結果を
+JSON の値に変換したものとする。群は {"name", "order", "isomorphic"} とする。
+
+使用例（リポジトリの最上位のディレクトリで実行する）:
+    python -m application.batch input.jsonl --output result.jsonl \
+        --commands Isomorphic Normal --workers 4
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+import numpy
+from .analyzer import GroupAnalyzer
+from .controller import NullController
+from .exceptions import CalculationInterrupted
+from .service import AppServise
+
+# 既定で実行するコマンド
+DEFAULT_COMMANDS = ("Isomorphic",)
+
+def _group_data(group) -> dict:
+    return {"name": group.name, "order": group.order,
+            "isomorphic": group.isomorphic}
+
+def _products_data(products) -> 'list[dict]':
+    return [{"left": _group_data(p.left), "right": _group_data(p.right)}
+            for p in products]
+
+def _overview_data(overview) -> dict:
+    return {"name": overview.name, "order": overview.order,
+            "isomorphic": overview.isomorphic,
+            "is_abelian": overview.is_abelian,
+            "is_perfect": overview.is_perfect,
+            "is_simple": overview.is_simple,
+            "is_solvable": overview.is_solvable,
+            "direct_products": _products_data(overview.direct_products),
+            "semidirect_products": _products_data(
+                overview.semidirect_products)}
+
+# コマンド名と、GroupAnalyzer の結果を JSON の値として返す関数の対応
+# コマンド名は AppServise の解析画面のコマンドと一致させること
+# （test_batch.py で確認している）
+_COMMAND_DATA = {
+    "?": lambda a, g: _overview_data(a.overview(g)),
+    "Elements": lambda a, g: [int(i) for i in a.elements(g)],
+    "Table": lambda a, g: numpy.asarray(a.cayley_table(g)).tolist(),
+    "ConjClass": lambda a, g: [
+        {"order": c.order, "element_num": c.element_num,
+         "elements": sorted(int(i) for i in c.elements)}
+        for c in a.conjugacy_classes(g)],
+    "ConjCount": lambda a, g: [list(unit)
+                               for unit in a.conjugacy_count(g).key],
+    "Isomorphic": lambda a, g: a.isomorphic(g),
+    "IsAbelian": lambda a, g: bool(a.is_abelian(g)),
+    "IsPerfect": lambda a, g: bool(a.is_perfect(g)),
+    "IsSimple": lambda a, g: bool(a.is_simple(g)),
+    "IsSolvable": lambda a, g: bool(a.is_solvable(g)),
+    "Center": lambda a, g: _group_data(a.center(g)),
+    "Centralizer": lambda a, g: _group_data(a.centralizer(g)),
+    "Derived": lambda a, g: _group_data(a.derived(g)),
+    "DerivedSeries": lambda a, g: [_group_data(d)
+                                   for d in a.derived_series(g)],
+    "Normal": lambda a, g: [_group_data(n) for n in a.normal_subgroups(g)],
+    "Normalizer": lambda a, g: _group_data(a.normalizer(g)),
+    "DirectDecompose": lambda a, g: _products_data(a.direct_products(g)),
+    "SemidirectDecompose": lambda a, g: _products_data(
+        a.semidirect_products(g)),
+    "Decompose": lambda a, g: {
+        "direct": _products_data(a.direct_products(g)),
+        "semidirect": _products_data(a.semidirect_products(g))},
+    }
+
+# 使用できるコマンド名の一覧
+COMMAND_NAMES = tuple(_COMMAND_DATA.keys())
+
+def read_generator_sets(path: str) -> 'list[dict]':
+    """
+    入力ファイルから生成元の組の一覧を読み込む。
+
+    Parameters
+    ----------
+    path : str
+        入力ファイルのパス。拡張子で形式を判定する。
+
+    Returns
+    -------
+    'list[dict]'
+        {"id": 識別名, "generators": 生成元のリスト} の一覧。
+        入力に含まれていれば "zero_base", "maximal" も含む。
+
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        data = numpy.load(path)
+        if data.ndim == 3: data = data[numpy.newaxis]
+        return [{"id": str(i), "generators": list(gens)}
+                for (i, gens) in enumerate(data)]
+    if ext == ".npz":
+        with numpy.load(path) as data:
+            return [{"id": key, "generators": list(data[key])}
+                    for key in data.files]
+    if ext in (".jsonl", ".json"):
+        sets = []
+        with open(path, "r", encoding="utf-8") as f:
+            for (i, line) in enumerate(f):
+                if not line.strip(): continue
+                record = json.loads(line)
+                record.setdefault("id", str(i))
+                record["generators"] = [_decode_matrix(m)
+                                        for m in record["generators"]]
+                sets.append(record)
+        return sets
+    raise ValueError(f'対応していないファイル形式です: {path}')
+
+def analyze_generator_set(task: dict) -> dict:
+    """
+    一組の生成元から群を生成し、指定のコマンドを実行する。
+    プロセスプールから呼び出すため、モジュールの関数としている。
+
+    Parameters
+    ----------
+    task : dict
+        "id", "generators", "zero_base", "maximal", "commands" を含む辞書。
+        "cache_dir" を含む場合は、生成した群を保存して再利用する。
+        "time_limit" を含む場合は、コマンドごとの制限時間（秒）とする。
+        制限時間を超えたコマンドの結果は {"interrupted": 理由} となる。
+        群の生成と、最大の群の群同型の判定には制限時間を適用しない。
+        これらは群の位数の最大値 "maximal" によって制限する。
+
+    Returns
+    -------
+    dict
+        解析結果。
+        "id", "succeeded", "elapsed" と、成功した場合は
+        "order", "isomorphic", "commands"（コマンド名 -> 実行結果）を含む。
+        実行結果は JSON の値であり、コマンドで例外が発生した場合は
+        {"error": 例外の内容} となる。
+        それ以外で例外が発生した場合は "error" を含む。
+
+    """
+    start = time.perf_counter()
+    result = {"id": task["id"], "succeeded": False}
+    try:
+        ctrl = NullController()
+        service = AppServise(task["generators"], task["zero_base"],
+                             task["maximal"], task.get("cache_dir"), ctrl)
+        if service.is_succeeded:
+            maximal = service.master.maximal_group
+            result["succeeded"] = True
+            result["order"] = maximal.order
+            result["isomorphic"] = maximal.isomorphic
+            analyzer = GroupAnalyzer(service.master)
+            result["commands"] = {
+                cmd: _exec_command(analyzer, cmd, maximal,
+                                   ctrl.cancellation_token,
+                                   task.get("time_limit"))
+                for cmd in task["commands"]}
+    except Exception as e:
+        result["error"] = f'{type(e).__name__}: {e}'
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+def _exec_command(analyzer, cmd: str, group, token, time_limit: float):
+    """
+    コマンドを制限時間つきで実行し、結果を JSON の値として返す。
+    """
+    # 制限はコマンドごとに数え直す
+    token.reset(time_limit)
+    try:
+        return _COMMAND_DATA[cmd](analyzer, group)
+    except CalculationInterrupted as e:
+        return {"interrupted": str(e)}
+    except Exception as e:
+        return {"error": f'{type(e).__name__}: {e}'}
+
+def run_batch(sets: 'list[dict]', commands: 'list[str]', zero_base: float,
+              maximal: int, output: 'typing.TextIO', workers: int = None,
+              cache_dir: str = None, time_limit: float = None) -> int:
+    """
+    生成元の組の一覧を解析し、結果を一行ずつ出力する。
+
+    Parameters
+    ----------
+    sets : 'list[dict]'
+        read_generator_sets() で読み込んだ生成元の組の一覧。
+    commands : 'list[str]'
+        実行するコマンド名の一覧。
+    zero_base : float
+        許容誤差。組ごとに指定されていればそちらを優先する。
+    maximal : int
+        位数の最大値。組ごとに指定されていればそちらを優先する。
+    output : typing.TextIO
+        出力先のテキストストリーム。
+    workers : int, optional
+        並列に実行するプロセス数。1ならば並列化しない。
+        Noneならば CPU の数とする。
+        The default is None.
+    cache_dir : str, optional
+        生成した群の保存先。
+        The default is None.
+    time_limit : float, optional
+        コマンドごとの制限時間（秒）。Noneならば制限しない。
+        群の生成と、最大の群の群同型の判定には適用しない。
+        The default is None.
+
+    Returns
+    -------
+    int
+        生成に成功した組の数。
+
+    Raises
+    ------
+    ValueError
+        commands に使用できないコマンド名が含まれている。
+
+    """
+    unknown = [cmd for cmd in commands if cmd not in _COMMAND_DATA]
+    if unknown:
+        raise ValueError(f'コマンド名が不適切です: {unknown}')
+    tasks = [{"id": s["id"], "generators": s["generators"],
+              "zero_base": s.get("zero_base", zero_base),
+              "maximal": s.get("maximal", maximal),
+              "commands": list(commands), "cache_dir": cache_dir,
+              "time_limit": time_limit}
+             for s in sets]
+    n_succeeded = 0
+    def write(result):
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+    if workers == 1:
+        results = map(analyze_generator_set, tasks)
+        for result in results:
+            n_succeeded += result["succeeded"]
+            write(result)
+        return n_succeeded
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        for result in executor.map(analyze_generator_set, tasks):
+            n_succeeded += result["succeeded"]
+            write(result)
+    return n_succeeded
+
+def _decode_matrix(rows: list) -> numpy.ndarray:
+    """
+    JSON の入れ子のリストを複素行列に変換する。
+    各成分は数値、または [実部, 虚部] とする。
+    """
+    return numpy.array([[complex(*x) if isinstance(x, list) else complex(x)
+                         for x in row] for row in rows])
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        description="多数の生成元の組をまとめて解析する。")
+    parser.add_argument("input", help="入力ファイル (.npy, .npz, .jsonl)")
+    parser.add_argument("--output", default=None,
+                        help="出力ファイル (.jsonl)。省略時は標準出力")
+    parser.add_argument("--commands", nargs="*", default=DEFAULT_COMMANDS,
+                        choices=COMMAND_NAMES,
+                        help="最大の群に対して実行するコマンド名")
+    parser.add_argument("--zero-base", type=float, default=0.0001,
+                        help="浮動小数点の許容誤差")
+    parser.add_argument("--maximal", type=int, default=2000,
+                        help="群の位数の最大値")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="並列に実行するプロセス数")
+    parser.add_argument("--cache-dir", default=None,
+                        help="生成した群の保存先")
+    parser.add_argument("--time-limit", type=float, default=None,
+                        help="コマンドごとの制限時間（秒）。"
+                        "群の生成には適用しない")
+    args = parser.parse_args(argv)
+    sets = read_generator_sets(args.input)
+    output = (open(args.output, "w", encoding="utf-8")
+              if args.output is not None else sys.stdout)
+    try:
+        n_succeeded = run_batch(sets, args.commands, args.zero_base,
+                                args.maximal, output, args.workers,
+                                args.cache_dir, args.time_limit)
+    finally:
+        if args.output is not None: output.close()
+    print(f'{n_succeeded}/{len(sets)}組の生成に成功しました。',
+          file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
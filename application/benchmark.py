@@ -0,0 +1,533 @@
+"""
+NamedGroupGenerator の群の系列を用いて、解析の各段階の所要時間を計測する。
+系列ごとに n を大きくしながら、以下の段階を別々に計測する。
+    generate          : 生成元から群の要素を生成する
+    cayley_table      : 乗積表を作成する
+    master            : MasterGroup を作成する（逆元表などの計算）
+    conjugacy_classes : 共役類を計算する
+    normal_subgroups  : 正規部分群を計算する
+    decompositions    : 直積・半直積への分解を計算する
+    identification    : 群同型を同定する
+
+結果は JSON として出力する。以前の結果を基準として与えると、
+基準より遅くなった段階を表示し、終了コード 1 で終了する。
+
+--report を指定すると、段階ごとの所要時間を位数の冪 c * n^k で近似し、
+指数 k が想定より大きい段階を表示する。さらに近似式から、
+計算機の制限時間とメモリ量ごとに扱える位数の最大値を見積もる。
+
+使用例（リポジトリの最上位のディレクトリで実行する）:
+    python -m application.benchmark --output bench.json
+    python -m application.benchmark --families D_n Q_n --repeat 3 \
+        --baseline bench.json
+    python -m application.benchmark --input bench.json --report \
+        --time-budget 600 --node-memory 8 32
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import sys
+import numpy
+from .controller import NullController, CancellationToken
+from .exceptions import CalculationTimeout
+from .profiler import Profiler
+from .calc import matcal
+from .calc.group import MasterGroup
+from .calc.identifier import IdentificationCache
+from .namedgroup.ggen import NamedGroupGenerator as G
+
+# 結果の形式の版。形式を変更したときは値を変えること
+RESULT_VERSION = 1
+
+# 系列名 -> (生成元を返す関数, 位数を返す関数, 既定の n の一覧)
+BENCHMARK_FAMILIES = {
+    "S_n": (G.S_n, math.factorial, (3, 4, 5)),
+    "D_n": (G.D_n, lambda n: 2*n, (4, 8, 16, 32, 64, 128)),
+    "Q_n": (G.Q_n, lambda n: 2*n, (4, 8, 16, 32, 64, 128)),
+    "Sigma_2n_2": (G.Sigma_2n_2, lambda n: 2*n**2, (2, 3, 4, 5, 6, 8)),
+    "Delta_3n_2": (G.Delta_3n_2, lambda n: 3*n**2, (2, 3, 4, 5, 6)),
+    "Delta_6n_2": (G.Delta_6n_2, lambda n: 6*n**2, (2, 3, 4, 5)),
+    "Sigma_3n_3": (G.Sigma_3n_3, lambda n: 3*n**3, (2, 3, 4)),
+    }
+
+# 計測する段階。この順に実行する
+STAGES = ("generate", "cayley_table", "master", "conjugacy_classes",
+          "normal_subgroups", "decompositions", "identification")
+
+# 段階ごとの、位数 n に対する所要時間の想定の指数
+EXPECTED_EXPONENTS = {
+    # 新しい元ごとに既存の全ての元と比較する
+    "generate": 2.0,
+    # n^2 個の積ごとに要素の一覧を探索する
+    "cayley_table": 3.0,
+    # n×n の表の計算
+    "master": 2.0,
+    "conjugacy_classes": 2.0,
+    # 共役類の和ごとの閉包の計算と、作成済みの部分群との比較
+    "normal_subgroups": 3.0,
+    "decompositions": 3.0,
+    "identification": 2.0,
+    }
+
+# カウンターごとの、位数 n に対する想定の指数
+EXPECTED_COUNTER_EXPONENTS = {
+    # 乗積表の作成における行列の比較
+    "matrix_comparisons": 3.0,
+    # 群の生成における要素の一覧の探索
+    "matrix_lookups": 1.0,
+    "closures_computed": 1.0,
+    # 部分群の作成時の、作成済みの部分群との比較（上限）
+    "subgroup_comparisons": 1.0,
+    }
+
+def run_case(family: str, n: int, repeat: int = 1, zero_base: float = 0.0001,
+             time_limit: float = None, track_memory: bool = False) -> dict:
+    """
+    一つの群について各段階を計測する。
+
+    Parameters
+    ----------
+    family : str
+        系列名。BENCHMARK_FAMILIES のキー。
+    n : int
+        系列の引数。
+    repeat : int, optional
+        計測の回数。段階ごとに最小値を採用する。
+        The default is 1.
+    zero_base : float, optional
+        許容誤差。
+        The default is 0.0001.
+    time_limit : float, optional
+        一回の計測の制限時間（秒）。超えた場合は status を "timeout" とする。
+        The default is None.
+    track_memory : bool, optional
+        True ならばメモリ使用量のピークを記録する。所要時間は長くなる。
+        The default is False.
+
+    Returns
+    -------
+    dict
+        "family", "n", "order", "status" と、段階名 -> {"wall", "cpu"}
+        の "stages"、カウンター名 -> 値の "counters" を含む辞書。
+        status は "ok", "timeout", "failed" のいずれか。
+        メモリを記録した場合は "peak_memory"（バイト）も含む。
+
+    """
+    (generator, order, sizes) = BENCHMARK_FAMILIES[family]
+    record = {"family": family, "n": n, "order": order(n), "status": "ok",
+              "stages": dict(), "counters": dict()}
+    for i in range(repeat):
+        profiler = Profiler(track_memory)
+        ctrl = NullController()
+        ctrl.profiler = profiler
+        ctrl.cancellation_token = CancellationToken()
+        ctrl.cancellation_token.reset(time_limit)
+        try:
+            succeeded = _run_stages(generator(n), zero_base, ctrl)
+        except CalculationTimeout:
+            record["status"] = "timeout"
+            return record
+        finally:
+            profiler.close()
+        if track_memory:
+            record["peak_memory"] = max(record.get("peak_memory", 0),
+                                        profiler.peak_memory)
+        if not succeeded:
+            record["status"] = "failed"
+            return record
+        summary = profiler.summary()
+        for stage in STAGES:
+            item = summary[f'benchmark.{stage}']
+            timing = {"wall": item["wall"], "cpu": item["cpu"]}
+            best = record["stages"].get(stage)
+            if best is None or timing["wall"] < best["wall"]:
+                record["stages"][stage] = timing
+        record["counters"] = profiler.counters
+    return record
+
+def run_benchmark(families: 'list[str]' = None, repeat: int = 1,
+                  max_order: int = None, time_limit: float = None,
+                  log: 'typing.TextIO' = None,
+                  track_memory: bool = False) -> dict:
+    """
+    系列ごとに n を大きくしながら計測する。
+    制限時間を超えた場合や生成に失敗した場合は、その系列の残りを省略する。
+
+    Parameters
+    ----------
+    families : 'list[str]', optional
+        計測する系列名の一覧。Noneならば全ての系列。
+        The default is None.
+    repeat : int, optional
+        計測の回数。
+        The default is 1.
+    max_order : int, optional
+        計測する群の位数の最大値。Noneならば制限しない。
+        The default is None.
+    time_limit : float, optional
+        一回の計測の制限時間（秒）。
+        The default is None.
+    log : typing.TextIO, optional
+        進捗の出力先のテキストストリーム。 sys.stderr など。
+        The default is None.
+    track_memory : bool, optional
+        True ならばメモリ使用量のピークを記録する。
+        The default is False.
+
+    Returns
+    -------
+    dict
+        "version", "environment", "config", "results" を含む辞書。
+
+    """
+    if families is None: families = list(BENCHMARK_FAMILIES)
+    results = []
+    for family in families:
+        (generator, order, sizes) = BENCHMARK_FAMILIES[family]
+        for n in sizes:
+            if max_order is not None and order(n) > max_order: break
+            record = run_case(family, n, repeat, time_limit=time_limit,
+                              track_memory=track_memory)
+            results.append(record)
+            if log is not None:
+                total = sum(t["wall"] for t in record["stages"].values())
+                log.write(f'{family}({n})\t位数 {record["order"]}\t'
+                          f'{record["status"]}\t{total:.3f}s\n')
+                log.flush()
+            if record["status"] != "ok": break
+    return {"version": RESULT_VERSION,
+            "environment": _environment(),
+            "config": {"families": families, "repeat": repeat,
+                       "max_order": max_order, "time_limit": time_limit,
+                       "track_memory": track_memory},
+            "results": results}
+
+def compare_results(baseline: dict, current: dict, threshold: float = 1.5,
+                    min_seconds: float = 0.001) -> 'list[dict]':
+    """
+    基準の結果と比べて遅くなった段階の一覧を返す。
+
+    Parameters
+    ----------
+    baseline : dict
+        基準とする run_benchmark() の結果。
+    current : dict
+        比較する run_benchmark() の結果。
+    threshold : float, optional
+        基準に対する所要時間の比がこの値を超えた段階を遅くなったとみなす。
+        The default is 1.5.
+    min_seconds : float, optional
+        基準と今回のいずれもがこの時間未満の段階は、誤差が大きいため比較しない。
+        The default is 0.001.
+
+    Returns
+    -------
+    'list[dict]'
+        "family", "n", "stage", "baseline", "current", "ratio" を含む辞書の一覧。
+
+    """
+    base = {(r["family"], r["n"]): r for r in baseline["results"]}
+    regressions = []
+    for record in current["results"]:
+        old = base.get((record["family"], record["n"]))
+        if old is None: continue
+        for (stage, timing) in record["stages"].items():
+            if stage not in old["stages"]: continue
+            before = old["stages"][stage]["wall"]
+            after = timing["wall"]
+            if max(before, after) < min_seconds: continue
+            ratio = after / max(before, 1e-9)
+            if ratio > threshold:
+                regressions.append({"family": record["family"],
+                                    "n": record["n"], "stage": stage,
+                                    "baseline": before, "current": after,
+                                    "ratio": ratio})
+    return regressions
+
+def fit_power_law(orders: 'list[int]', values: 'list[float]') -> dict:
+    """
+    値を位数の冪 coefficient * order^exponent で近似する。
+    両対数をとった最小二乗法による。
+
+    Parameters
+    ----------
+    orders : 'list[int]'
+        位数の一覧。
+    values : 'list[float]'
+        各位数に対する値の一覧。正の値のみを用いる。
+
+    Returns
+    -------
+    dict
+        "exponent", "coefficient", "r2"（決定係数）, "points"（用いた点の数）。
+        異なる位数の点が二つ未満の場合は None。
+
+    """
+    points = [(n, v) for (n, v) in zip(orders, values) if n > 1 and v > 0]
+    if len({n for (n, v) in points}) < 2: return None
+    x = numpy.log([n for (n, v) in points])
+    y = numpy.log([v for (n, v) in points])
+    (exponent, intercept) = numpy.polyfit(x, y, 1)
+    residual = y - (exponent*x + intercept)
+    variance = ((y - y.mean())**2).sum()
+    r2 = 1.0 - (residual**2).sum()/variance if variance > 0 else 1.0
+    return {"exponent": float(exponent),
+            "coefficient": float(numpy.exp(intercept)),
+            "r2": float(r2), "points": len(points)}
+
+def scaling_report(result: dict, min_seconds: float = 0.001,
+                   tolerance: float = 0.5) -> dict:
+    """
+    計測結果から、段階ごと、カウンターごとの位数に対する指数を求める。
+
+    Parameters
+    ----------
+    result : dict
+        run_benchmark() の結果。
+    min_seconds : float, optional
+        この時間未満の計測値は誤差が大きいため近似に用いない。
+        The default is 0.001.
+    tolerance : float, optional
+        指数が想定の指数をこの値より超えた段階を "flagged" とする。
+        The default is 0.5.
+
+    Returns
+    -------
+    dict
+        "stages": 段階名 -> {"fit", "families", "expected", "flagged"}。
+            fit は全ての系列をまとめた近似、families は系列ごとの近似。
+        "counters": カウンター名 -> {"fit", "expected", "flagged"}。
+        "memory": メモリ使用量のピークの近似。記録されていなければ None。
+
+    """
+    records = [r for r in result["results"] if r["status"] == "ok"]
+    stages = dict()
+    for stage in STAGES:
+        points = [(r["family"], r["order"], r["stages"][stage]["wall"])
+                  for r in records if stage in r["stages"]
+                  and r["stages"][stage]["wall"] >= min_seconds]
+        fit = fit_power_law([n for (f, n, t) in points],
+                            [t for (f, n, t) in points])
+        families = dict()
+        for family in sorted({f for (f, n, t) in points}):
+            family_fit = fit_power_law(
+                [n for (f, n, t) in points if f == family],
+                [t for (f, n, t) in points if f == family])
+            if family_fit is not None: families[family] = family_fit
+        expected = EXPECTED_EXPONENTS.get(stage)
+        flagged = (fit is not None and expected is not None
+                   and fit["exponent"] > expected + tolerance)
+        stages[stage] = {"fit": fit, "families": families,
+                         "expected": expected, "flagged": flagged}
+    counters = dict()
+    for name in sorted({c for r in records for c in r["counters"]}):
+        fit = fit_power_law([r["order"] for r in records],
+                            [r["counters"].get(name, 0) for r in records])
+        if fit is None: continue
+        expected = EXPECTED_COUNTER_EXPONENTS.get(name)
+        counters[name] = {"fit": fit, "expected": expected,
+                          "flagged": (expected is not None and
+                                      fit["exponent"] > expected + tolerance)}
+    memory = fit_power_law([r["order"] for r in records if "peak_memory" in r],
+                           [r["peak_memory"] for r in records
+                            if "peak_memory" in r])
+    return {"stages": stages, "counters": counters, "memory": memory}
+
+def estimate_capacity(report: dict, time_budget: float,
+                      memory_budgets: 'list[float]' = (),
+                      limit: int = 10**8) -> dict:
+    """
+    近似式から、制限時間とメモリ量のもとで扱える位数の最大値を見積もる。
+    全ての段階の所要時間の合計が制限時間以下となる最大の位数と、
+    メモリ使用量のピークがメモリ量以下となる最大の位数を求める。
+    外挿であるため、計測した位数の範囲から離れるほど誤差は大きい。
+
+    Parameters
+    ----------
+    report : dict
+        scaling_report() の結果。
+    time_budget : float
+        一つの群の解析にかけられる時間（秒）。
+    memory_budgets : 'list[float]', optional
+        計算機のメモリ量（バイト）の一覧。
+        The default is ().
+    limit : int, optional
+        見積もる位数の上限。
+        The default is 10**8.
+
+    Returns
+    -------
+    dict
+        "time": 制限時間のもとでの最大の位数。
+        "memory": メモリ量 -> 最大の位数。メモリの近似がなければ空。
+        "maximal": メモリ量 -> 両方の制限のもとでの最大の位数。
+            メモリの近似がなければ、制限時間のみによる値を "any" に対応させる。
+
+    """
+    fits = [s["fit"] for s in report["stages"].values()
+            if s["fit"] is not None]
+    def total_time(n):
+        return sum(f["coefficient"] * n**f["exponent"] for f in fits)
+    by_time = _largest_order(lambda n: total_time(n) <= time_budget, limit)
+    memory = report["memory"]
+    by_memory = dict()
+    if memory is not None:
+        for budget in memory_budgets:
+            by_memory[budget] = _largest_order(
+                lambda n: memory["coefficient"] * n**memory["exponent"]
+                <= budget, limit)
+    if not by_memory:
+        return {"time": by_time, "memory": by_memory,
+                "maximal": {"any": by_time}}
+    return {"time": by_time, "memory": by_memory,
+            "maximal": {b: min(by_time, n) for (b, n) in by_memory.items()}}
+
+def format_report(report: dict, capacity: dict = None) -> str:
+    """
+    scaling_report() と estimate_capacity() の結果を表の文字列にする。
+    """
+    text = "段階	指数	想定	R^2	系列ごとの指数"
+    for (stage, item) in report["stages"].items():
+        fit = item["fit"]
+        if fit is None:
+            text += f'\n{stage}\t-\t{item["expected"]}\t-'
+            continue
+        families = ", ".join(f'{f}:{v["exponent"]:.2f}'
+                             for (f, v) in item["families"].items())
+        mark = "\t(想定より悪い)" if item["flagged"] else ""
+        text += (f'\n{stage}\t{fit["exponent"]:.2f}\t{item["expected"]}'
+                 f'\t{fit["r2"]:.3f}\t{families}{mark}')
+    text += "\n\nカウンター\t指数\t想定"
+    for (name, item) in report["counters"].items():
+        mark = "\t(想定より悪い)" if item["flagged"] else ""
+        text += (f'\n{name}\t{item["fit"]["exponent"]:.2f}'
+                 f'\t{item["expected"]}{mark}')
+    if report["memory"] is not None:
+        text += f'\n\nメモリ使用量の指数\t{report["memory"]["exponent"]:.2f}'
+    if capacity is not None:
+        text += f'\n\n制限時間内に扱える位数の最大値\t{capacity["time"]}'
+        for (budget, n) in capacity["maximal"].items():
+            label = (budget if isinstance(budget, str)
+                     else f'{budget / 2**30:g}GB')
+            text += f'\nmaximal の目安 ({label})\t{n}'
+    return text
+
+def _largest_order(accept, limit: int) -> int:
+    """
+    accept(n) が真となる最大の位数を求める。accept は n について単調減少とする。
+    位数 1 でも偽ならば 0 を返す。
+    """
+    if not accept(1): return 0
+    low = 1
+    high = 2
+    while high <= limit and accept(high):
+        (low, high) = (high, high*2)
+    if high > limit: return limit if accept(limit) else low
+    while high - low > 1:
+        middle = (low + high) // 2
+        if accept(middle): low = middle
+        else: high = middle
+    return low
+
+def _run_stages(generators: 'list[numpy.ndarray]', zero_base: float,
+                ctrl: 'NullController') -> bool:
+    """
+    各段階を順に実行する。段階ごとにスパン "benchmark.段階名" を記録する。
+    生成に失敗した場合は False を返す。
+    """
+    # 前の計測の同定結果を用いないようにする
+    IdentificationCache.clear()
+    with ctrl.span("benchmark.generate"):
+        result = matcal.generate_group(generators, zero_base, 100000, ctrl)
+    if not result.has_value: return False
+    with ctrl.span("benchmark.cayley_table"):
+        result = matcal.calc_cayleytable(result.value, zero_base, ctrl)
+    if not result.has_value: return False
+    with ctrl.span("benchmark.master"):
+        master = MasterGroup(result.value, controller=ctrl)
+        group = master.maximal_group
+    with ctrl.span("benchmark.conjugacy_classes"):
+        group.conjugacy_classes
+    with ctrl.span("benchmark.normal_subgroups"):
+        group.all_normalsub
+    with ctrl.span("benchmark.decompositions"):
+        group.direct_product
+        group.semidirect_product
+    with ctrl.span("benchmark.identification"):
+        group.isomorphic
+    return True
+
+def _environment() -> dict:
+    return {"python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.datetime.now().isoformat(
+                timespec="seconds")}
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        description="解析の各段階の所要時間を計測する。")
+    parser.add_argument("--families", nargs="*", default=None,
+                        choices=list(BENCHMARK_FAMILIES),
+                        help="計測する系列名。省略時は全ての系列")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="計測の回数。段階ごとに最小値を採用する")
+    parser.add_argument("--max-order", type=int, default=None,
+                        help="計測する群の位数の最大値")
+    parser.add_argument("--time-limit", type=float, default=60.0,
+                        help="一つの群の計測の制限時間（秒）")
+    parser.add_argument("--output", default=None,
+                        help="結果の出力先 (.json)。省略時は標準出力")
+    parser.add_argument("--baseline", default=None,
+                        help="比較の基準とする以前の結果 (.json)")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="遅くなったとみなす所要時間の比")
+    parser.add_argument("--track-memory", action="store_true",
+                        help="メモリ使用量のピークを記録する")
+    parser.add_argument("--input", default=None,
+                        help="計測せずに以前の結果 (.json) を読み込む")
+    parser.add_argument("--report", action="store_true",
+                        help="位数に対する指数と扱える位数の目安を表示する")
+    parser.add_argument("--time-budget", type=float, default=3600.0,
+                        help="一つの群の解析にかけられる時間（秒）")
+    parser.add_argument("--node-memory", type=float, nargs="*",
+                        default=[8, 32, 128],
+                        help="計算機のメモリ量 (GB) の一覧")
+    args = parser.parse_args(argv)
+    if args.input is None:
+        result = run_benchmark(args.families, args.repeat, args.max_order,
+                               args.time_limit, sys.stderr, args.track_memory)
+    else:
+        with open(args.input, "r", encoding="utf-8") as f:
+            result = json.load(f)
+    if args.report:
+        report = scaling_report(result)
+        capacity = estimate_capacity(
+            report, args.time_budget, [m * 2**30 for m in args.node_memory])
+        result["scaling"] = report
+        result["capacity"] = capacity
+        print(format_report(report, capacity), file=sys.stderr)
+    if args.input is None or args.output is not None:
+        text = json.dumps(result, ensure_ascii=False, indent=1)
+        if args.output is None:
+            print(text)
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+    if args.baseline is None: return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_results(baseline, result, args.threshold)
+    for r in regressions:
+        print(f'遅延: {r["family"]}({r["n"]}) {r["stage"]} '
+              f'{r["baseline"]:.4f}s -> {r["current"]:.4f}s '
+              f'(x{r["ratio"]:.2f})', file=sys.stderr)
+    if regressions: sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -166,6 +166,18 @@ class ConjugacyCountUnit(object):
         """
         return self._degeneracy
     
+    @property
+    def key(self) -> 'tuple[int]':
+        """
+
+        Returns
+        -------
+        'tuple[int]'
+            (位数, 要素数, 重複度)のタプル。
+
+        """
+        return (self._order, self._element_num, self._degeneracy)
+    
     @staticmethod
     def create_from_data(data: 'list[int]') -> 'ConjugacyCountUnit':
         if(len(data) != 3):
@@ -232,6 +244,19 @@ class ConjugacyCount(object):
         """
         return self._count             
     
+    @property
+    def key(self) -> 'tuple[tuple[int]]':
+        """
+
+        Returns
+        -------
+        'tuple[tuple[int]]'
+            共役類の特性を(位数, 要素数, 重複度)のタプルの一覧で表したもの。
+            辞書のキーとして使用できる。
+
+        """
+        return tuple(unit.key for unit in self._count)
+    
     @staticmethod
     def create_from_conjugacy_classes(
             conjugacy_classes: 'list[ConjugacyClass]'
@@ -0,0 +1,204 @@
+"""
+群同型の不変量を扱うためのモジュール。
+"""
+import hashlib
+import numpy
+from .calctools import prime_factorize
+from .conjugacy import ConjugacyCount
+
+class GroupFingerprint(object):
+    """
+    群同型の不変量の組を表す。
+    同型な群は必ず等しい不変量を持つ。
+    逆は一般には成り立たないため、同定の候補を絞り込むために用いる。
+
+    Parameters
+    ----------
+    order : int
+        群の位数。
+    conjugacy_count : 'ConjugacyCount'
+        共役類の特性。
+    center_order : int
+        中心の位数。
+    derived_order : int
+        導来部分群の位数。
+    order_histogram : 'tuple[tuple[int]]'
+        (元の位数, 元の個数)の一覧。
+        元の位数の昇順に並ぶ。
+    power_classes : 'tuple[tuple]'
+        共役類ごとの冪写像の情報の一覧。
+        (位数, 要素数, ((p乗した共役類の位数, 要素数),...)) を昇順に並べたもの。
+        pは群の位数の素因数を昇順に並べたもの。
+
+    """
+    def __init__(self, order: int, conjugacy_count: 'ConjugacyCount',
+                 center_order: int, derived_order: int,
+                 order_histogram: 'tuple[tuple[int]]',
+                 power_classes: 'tuple[tuple]'):
+        self._order = order
+        self._conjugacy_count = conjugacy_count
+        self._center_order = center_order
+        self._derived_order = derived_order
+        self._order_histogram = tuple(order_histogram)
+        self._power_classes = tuple(power_classes)
+        self._key = (order, conjugacy_count.key, center_order, derived_order,
+                     self._order_histogram, self._power_classes)
+        self._hash = hash(self._key)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GroupFingerprint): return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __str__(self):
+        return (f'order={self.order}, conj={self.conjugacy_count}, '
+                f'center={self.center_order}, derived={self.derived_order}')
+
+    @property
+    def order(self) -> int:
+        return self._order
+
+    @property
+    def conjugacy_count(self) -> 'ConjugacyCount':
+        return self._conjugacy_count
+
+    @property
+    def center_order(self) -> int:
+        return self._center_order
+
+    @property
+    def derived_order(self) -> int:
+        return self._derived_order
+
+    @property
+    def order_histogram(self) -> 'tuple[tuple[int]]':
+        return self._order_histogram
+
+    @property
+    def power_classes(self) -> 'tuple[tuple]':
+        return self._power_classes
+
+    @property
+    def key(self) -> tuple:
+        """
+
+        Returns
+        -------
+        tuple
+            全ての不変量をまとめたタプル。
+            辞書のキーとして使用できる。
+
+        """
+        return self._key
+
+    @property
+    def digest(self) -> int:
+        """
+
+        Returns
+        -------
+        int
+            全ての不変量から計算した64ビットのハッシュ値。
+            プロセスやPythonの版によらず同じ値となる。
+            ディスク上のデータベースの検索に用いる。
+
+        """
+        return calc_digest(self._key)
+
+    @property
+    def class_key(self) -> 'tuple[tuple[int]]':
+        """
+
+        Returns
+        -------
+        'tuple[tuple[int]]'
+            共役類の特性のみから定まる部分のキー。
+            登録されている名前付きの群の検索に用いる。
+
+        """
+        return self._conjugacy_count.key
+
+    @staticmethod
+    def create_from_group(group) -> 'GroupFingerprint':
+        """
+        指定の群の不変量を計算する。
+        MasterGroupの元の位数の表と冪写像の表から計算する。
+
+        Parameters
+        ----------
+        group : Group
+            指定の群。
+
+        Returns
+        -------
+        GroupFingerprint
+            群の不変量。
+
+        """
+        master = group.master
+        c_classes = group.conjugacy_classes
+        # 元 -> 共役類の (位数, 要素数) の対応表
+        class_label = numpy.zeros(master.order, dtype=int)
+        labels = []
+        for (i, c_class) in enumerate(c_classes):
+            class_label[list(c_class.elements)] = i
+            labels.append((c_class.order, c_class.element_num))
+        histogram = calc_order_histogram(group)
+        # 各共役類の代表元を素数乗した元の共役類
+        primes = sorted(prime_factorize(group.order).keys())
+        reps = [min(c_class.elements) for c_class in c_classes]
+        power_images = [master.power_map(p)[reps] for p in primes]
+        power_classes = []
+        for (i, label) in enumerate(labels):
+            images = tuple(labels[class_label[image[i]]]
+                           for image in power_images)
+            power_classes.append(label + (images,))
+        center_order = sum(c.element_num for c in c_classes
+                           if c.element_num == 1)
+        return GroupFingerprint(
+            group.order, group.conjugacy_count, center_order,
+            group.derived.order, histogram, sorted(power_classes))
+
+def calc_order_histogram(group) -> 'tuple[tuple[int]]':
+    """
+    指定の群の元の位数の分布を計算する。
+    MasterGroupの元の位数の表から計算する。
+
+    Parameters
+    ----------
+    group : Group
+        指定の群。
+
+    Returns
+    -------
+    'tuple[tuple[int]]'
+        (元の位数, 元の個数)の一覧。
+        元の位数の昇順に並ぶ。
+
+    """
+    elements = numpy.fromiter(group.elements, dtype=int, count=group.order)
+    orders = group.master.index_order_data[elements]
+    values, counts = numpy.unique(orders, return_counts=True)
+    return tuple((int(v), int(c)) for (v, c) in zip(values, counts))
+
+def calc_digest(key: tuple) -> int:
+    """
+    整数と文字列のみからなるタプルの64ビットのハッシュ値を計算する。
+    組み込みの hash() と異なり、プロセスやPythonの版によらず同じ値となる。
+
+    Parameters
+    ----------
+    key : tuple
+        整数と文字列のみからなるタプル。
+
+    Returns
+    -------
+    int
+        ハッシュ値。
+
+    """
+    data = repr(key).encode("utf-8")
+    return int.from_bytes(
+        hashlib.blake2b(data, digest_size=8).digest(), "little")
@@ -4,29 +4,65 @@
 import itertools
 import numpy
 from .calctools import calc_divisor
+from ..controller import NullController
 from .groupstructure import CartesianProduct, QuotientDecomposition
 from .groupstructure import DirectProduct, SemidirectProduct
 from .matcal import CayleyTable
 from .conjugacy import ConjugacyClass, ConjugacyCount
+from .fingerprint import GroupFingerprint
 from .identifier import GroupIdentifier
 
 class MasterGroup(object):
     """
     解析対象となる最大の群を表す。
+    
+    乗積表が numpy.memmap の場合は、マップされたファイルを直接参照する。
+    このとき n×n の共役変換表と交換子表は事前に計算せず、
+    必要な元についてのみ乗積表の行を参照して計算する。
  
     Parameters
     ----------
     cayley_table : 'CayleyTable'
         群の乗積表。
+    inverse_data : numpy.ndarray, optional
+        計算済みの逆元の対応表。Noneならば乗積表から計算する。
+        The default is None.
+    conjugate_data : numpy.ndarray, optional
+        計算済みの共役変換表。Noneならば乗積表から計算する。
+        The default is None.
+    commutator_data : numpy.ndarray, optional
+        計算済みの交換子表。Noneならば乗積表から計算する。
+        The default is None.
+    index_order_data : numpy.ndarray, optional
+        計算済みの元の位数の一覧。Noneならば乗積表から計算する。
+        The default is None.
+    controller : 'Controller', optional
+        時間のかかる計算の中断の確認と計測に用いるコントローラー。
+        The default is None.
    
     """  
-    def __init__(self, cayley_table: 'CayleyTable'):
-        # 全ての要素の行列表現のリスト。並び順の通りに採番する
+    # 乗積表を行ごとにまとめて処理する際の行数
+    _row_block_size = 1024
+    
+    def __init__(self, cayley_table: 'CayleyTable',
+                 inverse_data: numpy.ndarray = None,
+                 conjugate_data: numpy.ndarray = None,
+                 commutator_data: numpy.ndarray = None,
+                 index_order_data: numpy.ndarray = None,
+                 controller: 'Controller' = None):
+        # 時間のかかる計算の中断の確認と計測に用いるコントローラー
+        self._controller = (controller if controller is not None
+                            else NullController())
+        span = self._controller.span
+        # 全ての要素の行列表現の配列。並び順の通りに採番する
+        # 剰余群のように行列表現を持たない場合は None
         self._matrix_rep_of_elements = cayley_table.matlist
         # 乗積表
         self._cayley_table = cayley_table.table
+        # 乗積表がメモリマップであるか
+        self._is_mapped = isinstance(self._cayley_table, numpy.memmap)
         # 群の位数
-        self._order = len(self._matrix_rep_of_elements)
+        self._order = len(self._cayley_table)
         # 位数が1なら例外
         if self._order == 1:
             raise Exception("自明群です。")
@@ -35,13 +71,27 @@ class MasterGroup(object):
         # 単位元のインデックス
         self._identity_index = self._find_identity_index()
         # 逆元の対応表
-        self._inverse_data = self._calc_inverse_data()
-        # 共役変換表
-        self._conjugate_data = self._calc_conjugate_data()
-        # 交換子対応表
-        self._commutator_data = self._calc_commutator_data()
+        if inverse_data is None:
+            with span("MasterGroup.inverse_data"):
+                inverse_data = self._calc_inverse_data()
+        self._inverse_data = inverse_data
+        # 共役変換表と交換子対応表
+        # メモリマップの場合は、初めて表全体が必要になったときに計算する
+        if conjugate_data is None and not self._is_mapped:
+            with span("MasterGroup.conjugate_data"):
+                conjugate_data = self._calc_conjugate_data()
+        self._conjugate_data = conjugate_data
+        if commutator_data is None and not self._is_mapped:
+            with span("MasterGroup.commutator_data"):
+                commutator_data = self._calc_commutator_data()
+        self._commutator_data = commutator_data
         # 元の位数の対応表
-        self._index_order_data = self._calc_index_order_data()
+        if index_order_data is None:
+            with span("MasterGroup.index_order_data"):
+                index_order_data = self._calc_index_order_data()
+        self._index_order_data = index_order_data
+        # 冪写像の表。指数をkeyとして、初回の呼び出し時にのみ計算される
+        self._power_map_dict = dict()
         # 約数リスト
         self._divisor_dict = self._calc_divisor_dict()
         # 部分群の採番
@@ -54,6 +104,68 @@ class MasterGroup(object):
         self._maximal_group = None
         # 自明群
         self._trivial_group = None
+        # 部分群から作成された場合の親の群と、各元の親の群でのインデックス
+        self._parent = None
+        self._parent_index = None
+    
+    @property
+    def controller(self) -> 'Controller':
+        """
+        時間のかかる計算が中断の確認と計測に用いるコントローラー。
+        """
+        return self._controller
+    
+    @controller.setter
+    def controller(self, controller: 'Controller'):
+        self._controller = (controller if controller is not None
+                            else NullController())
+    
+    def check_point(self, steps: int = 1):
+        """
+        時間のかかる計算の途中で呼び出し、中断すべきか確認する。
+
+        Parameters
+        ----------
+        steps : int, optional
+            前回の確認から進んだステップ数。
+            The default is 1.
+
+        Raises
+        ------
+        CalculationInterrupted
+            キャンセルが要求された、または制限を超えた。
+
+        Returns
+        -------
+        None.
+
+        """
+        self._controller.check_point(steps)
+    
+    @property
+    def is_mapped(self) -> bool:
+        """
+
+        Returns
+        -------
+        bool
+            乗積表が numpy.memmap であるか。
+
+        """
+        return self._is_mapped
+    
+    @property
+    def group_count(self) -> int:
+        """
+
+        Returns
+        -------
+        int
+            これまでに作成された部分群の数。
+            次に作成される部分群の名前の番号となる。
+
+        """
+        return self._group_count
     
     @property
     def group_initial(self) -> str:
@@ -100,17 +212,145 @@ class MasterGroup(object):
         return self._cayley_table
     
     @property
-    def matrix_rep_of_elements(self) -> 'tuple[numpy.ndarray]':
+    def matrix_rep_of_elements(self) -> numpy.ndarray:
         """
 
         Returns
         -------
-        'tuple[numpy.ndarray]'
+        numpy.ndarray
             全ての元の行列表現の一覧。
+            形状が (n, d, d) の連続した配列であり、
+            [i] は元 i の行列表現のビューとなる。
+            Group.quotient() で作成された剰余群の場合は None。
 
         """
         return self._matrix_rep_of_elements
     
+    @property
+    def identity_index(self) -> int:
+        """
+
+        Returns
+        -------
+        int
+            単位元のインデックス。
+
+        """
+        return self._identity_index
+    
+    @property
+    def inverse_data(self) -> numpy.ndarray:
+        """
+
+        Returns
+        -------
+        numpy.ndarray
+            逆元の対応表。
+            元のインデックスの順に並ぶ。
+
+        """
+        return self._inverse_data
+    
+    @property
+    def commutator_data(self) -> numpy.ndarray:
+        """
+
+        Returns
+        -------
+        numpy.ndarray
+            交換子表。
+            [g,h] の値は、gとhの交換子 g * h * g^(-1) * h^(-1)。
+            乗積表がメモリマップの場合は、初回の呼び出し時に計算される。
+
+        """
+        if self._commutator_data is None:
+            self._commutator_data = self._calc_commutator_data()
+        return self._commutator_data
+    
+    @property
+    def index_order_data(self) -> numpy.ndarray:
+        """
+
+        Returns
+        -------
+        numpy.ndarray
+            全ての元の位数の一覧。
+            元のインデックスの順に並ぶ。
+
+        """
+        return self._index_order_data
+    
+    @property
+    def parent(self) -> 'MasterGroup':
+        """
+
+        Returns
+        -------
+        'MasterGroup'
+            Group.to_master() で作成された場合は、元の部分群の MasterGroup。
+            それ以外は None。
+
+        """
+        return self._parent
+    
+    @property
+    def parent_index(self) -> numpy.ndarray:
+        """
+
+        Returns
+        -------
+        numpy.ndarray
+            各元の、親の群でのインデックス。
+            親の群が存在しない場合は None。
+
+        """
+        return self._parent_index
+    
+    def to_parent(self, group: 'Group') -> 'Group':
+        """
+        この群の部分群を、親の群の部分群に写す。
+
+        Parameters
+        ----------
+        group : 'Group'
+            この群の部分群。
+
+        Returns
+        -------
+        'Group'
+            親の群の対応する部分群。
+
+        """
+        closure = self._parent_index[sorted(group.elements)]
+        return self._parent.create_group(set(closure.tolist()))
+    
+    def from_parent(self, group: 'Group') -> 'Group':
+        """
+        親の群の部分群のうち、この群に含まれるものを、この群の部分群に写す。
+
+        Parameters
+        ----------
+        group : 'Group'
+            親の群の部分群。この群に含まれるもの。
+
+        Returns
+        -------
+        'Group'
+            この群の対応する部分群。
+
+        Raises
+        ------
+        ValueError
+            この群に含まれない元がある場合。
+
+        """
+        elements = numpy.array(sorted(group.elements), dtype=int)
+        position = numpy.searchsorted(self._parent_index, elements)
+        position = numpy.minimum(position, self.order - 1)
+        if (self._parent_index[position] != elements).any():
+            raise ValueError(f'{group.name} はこの群に含まれない。')
+        return self.create_group(set(position.tolist()))
+    
     @property
     def maximal_group(self) -> 'Group':
         """
@@ -250,8 +490,55 @@ class MasterGroup(object):
             演算結果の元のインデックス。
 
         """
+        if self._conjugate_data is None:
+            table = self._cayley_table
+            return table[table[index2, index1], self._inverse_data[index2]]
         return self._conjugate_data[index1][index2]
     
+    @property
+    def conjugate_data(self) -> numpy.ndarray:
+        """
+
+        Returns
+        -------
+        numpy.ndarray
+            共役変換表。
+            [g,h] の値は、gをhで共役変換した元 h * g * h^(-1)。
+            乗積表がメモリマップの場合は、初回の呼び出し時に計算される。
+            一部の元のみが必要な場合は conjugate_block() を用いること。
+
+        """
+        if self._conjugate_data is None:
+            self._conjugate_data = self._calc_conjugate_data()
+        return self._conjugate_data
+    
+    def conjugate_block(self, indices1: numpy.ndarray,
+                        indices2: numpy.ndarray) -> numpy.ndarray:
+        """
+        共役変換表のうち、指定の元の組の部分を返す。
+        共役変換表が計算されていない場合は、乗積表の必要な行のみを参照して計算する。
+
+        Parameters
+        ----------
+        indices1 : numpy.ndarray
+            共役変換される元のインデックスの一覧。
+        indices2 : numpy.ndarray
+            共役変換する元のインデックスの一覧。
+
+        Returns
+        -------
+        numpy.ndarray
+            [i,j] の値は、indices1[i] を indices2[j] で共役変換した元。
+
+        """
+        if self._conjugate_data is not None:
+            return self._conjugate_data[numpy.ix_(indices1, indices2)]
+        table = self._cayley_table
+        # [g,h] -> (h * g) * h^(-1)
+        products = table[numpy.ix_(indices2, indices1)].T
+        inverse = self._inverse_data[indices2]
+        return table[products, inverse[numpy.newaxis,:]]
+    
     def index_commutator(self, index1: int, index2: int) -> int:
         """
         二つの元の交換子を返す。
@@ -272,6 +559,11 @@ class MasterGroup(object):
             演算結果の元のインデックス。
 
         """
+        if self._commutator_data is None:
+            table = self._cayley_table
+            inverse = self._inverse_data
+            product = table[table[index1, index2], inverse[index1]]
+            return table[product, inverse[index2]]
         return self._commutator_data[index1][index2]
    
     def index_order(self, index: int) -> int:
@@ -290,7 +582,28 @@ class MasterGroup(object):
             元の位数。
 
         """
-        return self._index_order_data[index]
+        return int(self._index_order_data[index])
+    
+    def power_map(self, exponent: int) -> numpy.ndarray:
+        """
+        全ての元を指定の指数で冪乗した元の一覧を返す。
+        初回の呼び出し時にのみ計算される。
+
+        Parameters
+        ----------
+        exponent : int
+            指数。0以上の整数。
+
+        Returns
+        -------
+        numpy.ndarray
+            冪乗した元のインデックスの一覧。
+            元のインデックスの順に並ぶ。
+
+        """
+        if exponent not in self._power_map_dict:
+            self._power_map_dict[exponent] = self._calc_power_map(exponent)
+        return self._power_map_dict[exponent]
     
     def indices_are_commutable(self, index1: int, index2: int) -> bool:
         """
@@ -375,10 +688,12 @@ class MasterGroup(object):
         # 部分群の位数は元の群の位数の約数である
         divisor = self.divisor_of_order()
         n_max = divisor[1]
+        self._controller.count("closures_computed")
         element_all = set(indexset)
         element_prev = set(indexset)
         n_all = len(element_all)
         while element_prev:
+            self.check_point(len(element_prev))
         # 新しいインデックスを生成
             generated = set(self.index_prod(index1,index2) for (index1,index2) 
                       in itertools.product(element_prev,indexset))
@@ -429,13 +744,45 @@ class MasterGroup(object):
 
         """
         group = Group(self, closure)
+        self._controller.count("subgroup_lookups")
+        self._controller.count("subgroup_comparisons", len(self._group_storage))
         for i in self._group_storage:
             if group.equal_to(i): return i
+        self._controller.count("subgroups_created")
         self._group_storage.add(group)
         self.naming_group(group)
         self._group_count += 1
         return group
     
+    def restore_group(self, closure: 'set[int]', name: str) -> 'Group':
+        """
+        保存されたセッションの群を、保存時の名前のまま登録する。
+        部分群の採番は変更しない。
+
+        Parameters
+        ----------
+        closure : 'set[int]'
+            閉じた元の集合。
+        name : str
+            群の名前。
+
+        Returns
+        -------
+        'Group'
+            登録された群オブジェクト。
+
+        """
+        group = Group(self, closure)
+        group.name = name
+        self._group_storage.add(group)
+        return group
+    
+    def restore_group_count(self, count: int):
+        """
+        保存されたセッションの部分群の採番を復元する。
+        """
+        self._group_count = count
+    
     def generate_group(self, indexset: 'set[int]') -> 'Group':
         """
         指定の集合から閉じた集合を生成し、群オブジェクトを作成する。
@@ -464,45 +811,44 @@ class MasterGroup(object):
             単位元のインデックス。
 
         """
-        for i in range(self.order):
-            if self._cayley_table[i][i] == i: return i
+        diagonal = numpy.diagonal(self._cayley_table)
+        return int(numpy.flatnonzero(diagonal == numpy.arange(self.order))[0])
     
-    def _calc_inverse_data(self) -> 'tuple[int]':
+    def _calc_inverse_data(self) -> numpy.ndarray:
         """
         逆元との対応表を作成する。
 
         Returns
         -------
-        'tuple[int]'
+        numpy.ndarray
             逆元との対応表。
 
         """
-        inverse_list = [None for i in range(self.order)]
-        for index1 in range(self.order):
-            for index2 in range(self.order):
-                if self.index_prod(index1,index2) == self._identity_index:
-                    inverse_list[index1] = index2
-                    continue
-        return tuple(inverse_list)
+        # 各行に単位元はちょうど一つ含まれる
+        # メモリマップの乗積表でも読み込む量が抑えられるよう、行ごとにまとめて処理する
+        table = self._cayley_table
+        inverse = numpy.empty(self.order, dtype=int)
+        for start in range(0, self.order, self._row_block_size):
+            rows = table[start:start+self._row_block_size]
+            inverse[start:start+len(rows)] = numpy.argmax(
+                rows == self._identity_index, axis=1)
+        return inverse
     
-    def _calc_conjugate_data(self) -> 'tuple[tuple[int]]':
+    def _calc_conjugate_data(self) -> numpy.ndarray:
         """
         共役変換表を作成する。
         gのhによる共役変換は、 h * g * h^(-1) とする。
 
         Returns
         -------
-        'tuple[tuple[int]]'
+        numpy.ndarray
             共役変換表。
 
         """
-        conjugate_table = numpy.identity(self.order,dtype=int)
-        for (g, h) in itertools.product(self.all_elements,self.all_elements):
-            h_inv = self.index_inverse(h)
-            result = self.index_prod(h,g)
-            result = self.index_prod(result,h_inv)
-            conjugate_table[g][h] = result
-        return conjugate_table        
+        table = self._cayley_table
+        inverse = self._inverse_data
+        # [g,h] -> (h * g) * h^(-1)
+        return table[table.T, inverse[numpy.newaxis,:]]
     
     def _calc_commutator_data(self) -> numpy.ndarray:
         """
@@ -515,50 +861,61 @@ class MasterGroup(object):
             交換子表。
 
         """
-        commutator_table = numpy.identity(self.order,dtype=int)
-        for (g, h) in itertools.product(self.all_elements,self.all_elements):
-            g_inv = self.index_inverse(g)
-            h_inv = self.index_inverse(h)
-            result = self.index_prod(g,h)
-            result = self.index_prod(result,g_inv)
-            result = self.index_prod(result,h_inv)
-            commutator_table[g][h] = result
-        return commutator_table 
+        table = self._cayley_table
+        inverse = self._inverse_data
+        # [g,h] -> ((g * h) * g^(-1)) * h^(-1)
+        result = table[table, inverse[:,numpy.newaxis]]
+        return table[result, inverse[numpy.newaxis,:]]
     
-    def _calc_index_order(self, index) -> int:
+    def _calc_index_order_data(self) -> numpy.ndarray:
         """
-        指定の元の位数を計算する。
-        元を位数乗すると単位元となる。
-
-        Parameters
-        ----------
-        index : TYPE
-            指定の元のインデックス。
+        全ての元の位数を計算する。
+        全ての元を同時に冪乗していき、初めて単位元となる指数を記録する。
 
         Returns
         -------
-        int
-            元の位数。
+        numpy.ndarray
+            元の位数の一覧。
 
         """
-        current_index = index
-        current_order = 1
-        while current_index != self._identity_index:
-            current_index = self.index_prod(current_index,index)
-            current_order +=1
-        return current_order
+        indices = numpy.arange(self.order)
+        order_data = numpy.zeros(self.order, dtype=int)
+        current = indices.copy()
+        exponent = 1
+        remaining = indices
+        while remaining.size:
+            reached = current[remaining] == self._identity_index
+            order_data[remaining[reached]] = exponent
+            remaining = remaining[~reached]
+            current[remaining] = self._cayley_table[current[remaining],
+                                                    remaining]
+            exponent += 1
+        return order_data
     
-    def _calc_index_order_data(self) -> 'tuple[int]':
+    def _calc_power_map(self, exponent: int) -> numpy.ndarray:
         """
-        全ての元の位数を計算する。
+        全ての元を指定の指数で冪乗した元の一覧を計算する。
+        二進法による冪乗を、全ての元について同時に行う。
+
+        Parameters
+        ----------
+        exponent : int
+            指数。0以上の整数。
 
         Returns
         -------
-        TYPE
-            元の位数の一覧。
+        numpy.ndarray
+            冪乗した元のインデックスの一覧。
 
         """
-        return tuple(self._calc_index_order(i) for i in self.all_elements)
+        table = self._cayley_table
+        result = numpy.full(self.order, self._identity_index)
+        base = numpy.arange(self.order)
+        while exponent:
+            if exponent & 1: result = table[result, base]
+            base = table[base, base]
+            exponent >>= 1
+        return result
         
     def _calc_divisor_dict(self):
         """
@@ -598,7 +955,9 @@ class Group(object):
         self._name = "nameless"
         # 以降は初期状態ではNone
         # 初回の呼び出し時にのみ計算される
+        self._index_array = None
         self._cayley_table = None
+        self._relabeled_cayley_table = None
         self._conjugacy_classes = None
         self._conjugacy_count = None
         self._center = None
@@ -615,6 +974,11 @@ class Group(object):
         self._direct_product = None
         self._semidirect_product = None
         self._max_element_order = None
+        self._fingerprint = None
+        self._sub_master = None
+        # 保存されたセッションから復元された群の場合に設定される
+        # 計算済みの値は初回の呼び出し時に読み込まれる
+        self._restorer = None
     
     def __str__(self):
         return f'{self.name}: {tuple(sorted(list(self.elements)))}'
@@ -693,9 +1057,43 @@ class Group(object):
 
         """
         if self._cayley_table is None:
-            self._cayley_table = self._calc_cayley_table()
+            with self.master.controller.span("Group.cayley_table"):
+                self._cayley_table = self._calc_cayley_table()
         return self._cayley_table  
     
+    @property
+    def index_array(self) -> numpy.ndarray:
+        """
+
+        Returns
+        -------
+        numpy.ndarray
+            この群の元のインデックスを昇順に並べた配列。
+            乗積表の行と列の順序に対応する。
+
+        """
+        if self._index_array is None:
+            self._index_array = numpy.array(sorted(self.elements), dtype=int)
+        return self._index_array
+    
+    @property
+    def relabeled_cayley_table(self) -> numpy.ndarray:
+        """
+
+        Returns
+        -------
+        numpy.ndarray
+            この群の乗積表を、元を昇順に 0, 1, ... と番号付け直して
+            表したもの。値 k は index_array[k] の元を表す。
+
+        """
+        if self._relabeled_cayley_table is None:
+            # 全体のインデックスからこの群での番号への逆引き表
+            inverse = numpy.full(self.master.order, -1, dtype=int)
+            inverse[self.index_array] = numpy.arange(self.order)
+            self._relabeled_cayley_table = inverse[self.cayley_table]
+        return self._relabeled_cayley_table
+    
     @property
     def conjugacy_classes(self) -> 'tuple[ConjugacyClass]':
         """
@@ -708,7 +1106,8 @@ class Group(object):
 
         """
         if self._conjugacy_classes is None:
-            self._conjugacy_classes = self._calc_conjugacy_classes()
+            self._conjugacy_classes = self._restore_or_calc(
+                "conjugacy_classes", self._calc_conjugacy_classes)
         return self._conjugacy_classes
     
     @property
@@ -726,6 +1125,21 @@ class Group(object):
                 .create_from_conjugacy_classes(self.conjugacy_classes)
         return self._conjugacy_count
     
+    @property
+    def fingerprint(self) -> 'GroupFingerprint':
+        """
+
+        Returns
+        -------
+        'GroupFingerprint'
+            この群の群同型の不変量。
+            同型な群は必ず等しい不変量を持つ。
+
+        """
+        if self._fingerprint is None:
+            self._fingerprint = GroupFingerprint.create_from_group(self)
+        return self._fingerprint
+    
     @property
     def center(self) -> 'Group':
         """
@@ -741,7 +1155,8 @@ class Group(object):
 
         """
         if self._center is None:
-            self._center = self._calc_center()
+            self._center = self._restore_or_calc(
+                "center", self._calc_center)
         return self._center   
 
     @property
@@ -759,7 +1174,8 @@ class Group(object):
 
         """
         if self._centralizer is None:
-            self._centralizer = self._calc_centralizer()
+            self._centralizer = self._restore_or_calc(
+                "centralizer", self._calc_centralizer)
         return self._centralizer 
     
     @property
@@ -777,7 +1193,8 @@ class Group(object):
             
         """
         if self._derived is None:
-            self._derived = self._calc_derived()
+            self._derived = self._restore_or_calc(
+                "derived", self._calc_derived)
         return self._derived
     
     @property
@@ -800,7 +1217,8 @@ class Group(object):
 
         """
         if self._derived_series is None:
-            self._derived_series = self._calc_derived_series()
+            self._derived_series = self._restore_or_calc(
+                "derived_series", self._calc_derived_series)
         return self._derived_series   
     
     @property
@@ -821,10 +1239,8 @@ class Group(object):
 
         """
         if self._is_abelian is None:
-            # 導来部分群が自明群と一致するかどうかで判定する
-            derived = self.derived
-            trivial = self.master.trivial_group
-            self._is_abelian = derived.equal_to(trivial)
+            self._is_abelian = self._restore_or_calc(
+                "is_abelian", self._calc_is_abelian)
         return self._is_abelian    
 
     @property
@@ -845,9 +1261,8 @@ class Group(object):
 
         """
         if self._is_perfect is None:
-            # 導来部分群が自分自身と一致するかで判定する
-            derived = self.derived
-            self._is_perfect = derived.equal_to(self)
+            self._is_perfect = self._restore_or_calc(
+                "is_perfect", self._calc_is_perfect)
         return self._is_perfect    
 
     @property
@@ -868,10 +1283,8 @@ class Group(object):
 
         """
         if self._is_solvable is None:
-            # 導来列の最後が自明群であるかでどうかで判定する
-            group = self.derived_series[-1]
-            trivial = self.master.trivial_group
-            self._is_solvable = group.equal_to(trivial)
+            self._is_solvable = self._restore_or_calc(
+                "is_solvable", self._calc_is_solvable)
         return self._is_solvable
     
     @property
@@ -890,7 +1303,8 @@ class Group(object):
 
         """
         if self._all_normalsub is None:
-            self._all_normalsub = self._calc_all_normalsub()
+            self._all_normalsub = self._restore_or_calc(
+                "all_normalsub", self._calc_all_normalsub)
         return self._all_normalsub
     
     @property
@@ -907,7 +1321,8 @@ class Group(object):
 
         """
         if self._normalizer is None:
-            self._normalizer = self._calc_normalizer()
+            self._normalizer = self._restore_or_calc(
+                "normalizer", self._calc_normalizer)
         return self._normalizer
     
     @property
@@ -931,7 +1346,8 @@ class Group(object):
 
         """
         if self._is_simple is None:
-            self._is_simple = self._calc_is_simple()
+            self._is_simple = self._restore_or_calc(
+                "is_simple", self._calc_is_simple)
         return self._is_simple
     
     @property
@@ -948,7 +1364,9 @@ class Group(object):
 
         """
         if self._isomorphic is None:
-            self._isomorphic = GroupIdentifier.find_isomorphic(self)
+            self._isomorphic = self._restore_or_calc(
+                "isomorphic",
+                lambda: GroupIdentifier.find_isomorphic(self))
         return self._isomorphic
     
     @isomorphic.setter
@@ -982,7 +1400,8 @@ class Group(object):
 
         """
         if self._direct_product is None:
-            self._direct_product = self._find_direct_product()
+            self._direct_product = self._restore_or_calc(
+                "direct_product", self._find_direct_product)
         return self._direct_product
     
     @property
@@ -999,7 +1418,8 @@ class Group(object):
 
         """
         if self._semidirect_product is None:
-            self._semidirect_product = self._find_semidirect_product()
+            self._semidirect_product = self._restore_or_calc(
+                "semidirect_product", self._find_semidirect_product)
         return self._semidirect_product
 
     @property
@@ -1036,6 +1456,114 @@ class Group(object):
     def has_same_master(self, other: 'Group') -> bool:
         return self.master is other.master
 
+    def to_master(self) -> 'MasterGroup':
+        """
+        この群を、元を 0, 1, ..., order-1 と番号付け直した MasterGroup とする。
+        元の番号は index_array の順であり、parent_index により
+        元の群のインデックスに戻せる。
+        表の大きさはこの群の位数で決まるため、大きな群の小さな部分群を
+        解析する場合は、この MasterGroup で解析すると速い。
+        作成した MasterGroup は保持され、二回目以降は同じものを返す。
+
+        Raises
+        ------
+        Exception
+            この群が自明群である場合。
+
+        Returns
+        -------
+        'MasterGroup'
+            この群を最大の群とする MasterGroup。
+
+        """
+        if self._sub_master is None:
+            master = self.master
+            index = self.index_array
+            matlist = (None if master.matrix_rep_of_elements is None
+                       else master.matrix_rep_of_elements[index])
+            table = CayleyTable(matlist, self.relabeled_cayley_table)
+            # 逆元と位数は元の群の表から取り出して番号を付け直す
+            inverse = numpy.searchsorted(index, master.inverse_data[index])
+            sub_master = MasterGroup(
+                table, inverse_data=inverse,
+                index_order_data=master.index_order_data[index],
+                controller=master.controller)
+            sub_master.group_initial = f'{self.name}_'
+            sub_master._parent = master
+            sub_master._parent_index = index
+            self._sub_master = sub_master
+        return self._sub_master
+
+    def coset_labels(self, normal: 'Group') -> numpy.ndarray:
+        """
+        この群の各元が属する、指定の正規部分群による剰余類の番号を求める。
+        各剰余類の代表を、その剰余類で index_array の順に最初の元とし、
+        代表の順に 0, 1, ... と番号を付ける。
+
+        Parameters
+        ----------
+        normal : 'Group'
+            この群の正規部分群。
+
+        Raises
+        ------
+        ValueError
+            指定の群がこの群の正規部分群でない場合。
+
+        Returns
+        -------
+        numpy.ndarray
+            剰余類の番号の一覧。index_array の順に並ぶ。
+
+        """
+        if not normal.is_normalsubgroup_of(self):
+            raise ValueError(
+                f'{normal.name} は {self.name} の正規部分群でない。')
+        inverse = numpy.full(self.master.order, -1, dtype=int)
+        inverse[self.index_array] = numpy.arange(self.order)
+        # g の剰余類 gN の元のうち、番号の最も小さい元を代表とする
+        table = self.relabeled_cayley_table
+        representative = table[:, inverse[normal.index_array]].min(axis=1)
+        return numpy.unique(representative, return_inverse=True)[1]
+
+    def quotient(self, normal: 'Group') -> 'MasterGroup':
+        """
+        指定の正規部分群による剰余群を MasterGroup として作成する。
+        元 k は coset_labels(normal) の値が k である元からなる剰余類を表す。
+        乗積表は剰余類の代表どうしの積から作成する。
+        剰余群は行列表現を持たない。
+
+        Parameters
+        ----------
+        normal : 'Group'
+            この群の正規部分群。
+
+        Raises
+        ------
+        ValueError
+            指定の群がこの群の正規部分群でない場合や、
+            剰余群が自明群となる場合。
+
+        Returns
+        -------
+        'MasterGroup'
+            剰余群。
+
+        """
+        labels = self.coset_labels(normal)
+        n_coset = self.order // normal.order
+        if n_coset == 1:
+            raise ValueError(f'{self.name}/{normal.name} は自明群である。')
+        self.master.check_point(n_coset * n_coset)
+        # 各剰余類で最初の元を代表とする
+        representative = numpy.unique(labels, return_index=True)[1]
+        table = labels[self.relabeled_cayley_table[
+            numpy.ix_(representative, representative)]]
+        quotient = MasterGroup(CayleyTable(None, table),
+                               controller=self.master.controller)
+        quotient.group_initial = f'{self.name}/{normal.name}_'
+        return quotient
+
     def equal_to(self, other: 'Group') -> bool:
         """
         この群と指定の群の要素が完全に一致するか判定する。
@@ -1178,17 +1706,22 @@ class Group(object):
         if not group in self.all_normalsub[1:-1]:
             return QuotientDecomposition.create_invalid()
         # 一般の場合の処理
+        # 各元の属する剰余類の番号。全体のインデックスで引けるようにする
+        coset = numpy.full(self.master.order, -1, dtype=int)
+        coset[self.index_array] = self.coset_labels(group)
         candidate = set(self.elements - group.elements)
         selected = set()
         while candidate:
+            self.master.check_point()
             index = sorted(candidate)[0]
             candidate.discard(index)
             indexset = selected | {index}
             closure = self.master.calc_closure(indexset)
             if len(closure.intersection(group.elements)) != 1: continue
-            generated = {self.master.index_prod(g, h) for (g,h) 
-                         in itertools.product(closure, group.elements)}
-            candidate = candidate - generated
+            # closure と group の積に含まれる元、すなわち closure の元の
+            # 剰余類に属する元を候補から除く
+            covered = set(coset[list(closure)].tolist())
+            candidate = {g for g in candidate if coset[g] not in covered}
             selected.add(index)
         closure = self.master.calc_closure(selected)
         if len(closure)*group.order != self.order:
@@ -1216,6 +1749,95 @@ class Group(object):
         return tuple(g for g in self.elements 
                      if self.master.index_order(g) == order)
     
+    def cached_value(self, field: str):
+        """
+        指定の属性の計算済みの値を返す。
+        値が未計算の場合にも計算は行わない。
+
+        Parameters
+        ----------
+        field : str
+            属性の名前。 "center" など。
+
+        Returns
+        -------
+        計算済みの値。未計算ならば None。
+
+        """
+        return getattr(self, "_" + field)
+    
+    def stored_value(self, field: str):
+        """
+        指定の属性の計算済みの値、または保存されたセッションに含まれる値を返す。
+        cached_value() と同じく計算は行わないが、
+        セッションから未読み込みの値も読み込んで返す。
+
+        Parameters
+        ----------
+        field : str
+            属性の名前。 "center" など。
+
+        Returns
+        -------
+        計算済みまたは保存済みの値。どちらでもなければ None。
+
+        """
+        value = self.cached_value(field)
+        if value is None and self._restorer is not None:
+            value = self._restorer.restore(self, field)
+            if value is not None: setattr(self, "_" + field, value)
+        return value
+    
+    @property
+    def restorer(self):
+        """
+        保存されたセッションから計算済みの値を読み込むオブジェクト。
+        セッションから復元された群でなければ None。
+        """
+        return self._restorer
+    
+    def set_restorer(self, restorer):
+        """
+        保存されたセッションから計算済みの値を読み込むオブジェクトを設定する。
+
+        Parameters
+        ----------
+        restorer : TYPE
+            restore(group, field) メソッドを持つオブジェクト。
+
+        Returns
+        -------
+        None.
+
+        """
+        self._restorer = restorer
+    
+    def _restore_or_calc(self, field: str, calc):
+        """
+        保存されたセッションに計算済みの値があればそれを返し、
+        なければ計算する。計算の区間は "Group.属性名" のスパンとして記録する。
+        """
+        if self._restorer is not None:
+            value = self._restorer.restore(self, field)
+            if value is not None: return value
+        with self.master.controller.span(f'Group.{field}'):
+            return calc()
+    
+    def _calc_is_abelian(self) -> bool:
+        # 導来部分群が自明群と一致するかどうかで判定する
+        return self.derived.equal_to(self.master.trivial_group)
+    
+    def _calc_is_perfect(self) -> bool:
+        # 導来部分群が自分自身と一致するかで判定する
+        return self.derived.equal_to(self)
+    
+    def _calc_is_solvable(self) -> bool:
+        # 導来列の最後が自明群であるかでどうかで判定する
+        # 導来列が空（完全群）の場合は、自身が自明群であるかで判定する
+        series = self.derived_series
+        last = series[-1] if series else self
+        return last.equal_to(self.master.trivial_group)
+    
     def _calc_cayley_table(self) -> numpy.ndarray:
         """
         この群の乗積表を計算する。
@@ -1227,17 +1849,11 @@ class Group(object):
             乗積表。
 
         """
-        mastertable = self.master.cayley_table
-        table = numpy.identity(self.order,int)
-        indexlist = sorted(self.elements)
-        row = 0
-        for i1 in indexlist:
-            column= 0
-            for i2 in indexlist:
-                table[row][column] = mastertable[i1][i2]
-                column += 1
-            row += 1
-        return table
+        self.master.check_point(self.order)
+        indexlist = self.index_array
+        # 全体の乗積表から、この群の行と列をまとめて取り出す
+        return numpy.asarray(
+            self.master.cayley_table[numpy.ix_(indexlist, indexlist)])
     
     def _calc_conjugacy_classes(self) -> 'tuple[ConjugacyClass]':
         """
@@ -1250,18 +1866,29 @@ class Group(object):
             位数 > 要素数 の優先度で昇順にソートされている。
 
         """
+        master = self.master
+        indices = self.index_array
+        order_data = master.index_order_data
+        # 共役類に分類済みの元
+        classified = numpy.zeros(len(indices), dtype=bool)
         c_classes = []
-        remaining = set(self.elements)
-        while remaining:
-            # 任意の要素を一つ取得
-            g = list(remaining)[0]
-            # 群の各元で共役変換
-            conjugacy = {self.master.index_conjugate(g,h) for h 
-                         in self.elements}
-            # 共役類の位数
-            order = self.master.index_order(g)
-            c_classes.append(ConjugacyClass(conjugacy, order))
-            remaining = remaining.difference(conjugacy)
+        # 表全体を作らないよう、未分類の元を一定数ずつ取り出し、
+        # 各元の群の全ての元による共役（＝共役類）を求める
+        # 必要なメモリは、位数 × 一度に取り出す元の数に比例する
+        block_size = master._row_block_size
+        while not classified.all():
+            candidates = indices[numpy.flatnonzero(~classified)[:block_size]]
+            master.check_point(len(candidates) * len(indices))
+            # 行ごとに、元を群の各元で共役変換した結果（＝共役類）が並ぶ
+            conjugate = master.conjugate_block(candidates, indices)
+            # 共役類の最小のインデックスを代表元とする
+            representatives = conjugate.min(axis=1)
+            # 未分類の元の共役類は、全ての元が未分類である
+            _, first = numpy.unique(representatives, return_index=True)
+            for i in first:
+                classified[numpy.searchsorted(indices, conjugate[i])] = True
+                c_classes.append(ConjugacyClass(
+                    conjugate[i].tolist(), int(order_data[candidates[i]])))
         return tuple(sorted(c_classes))
     
     def _calc_center(self) -> 'Group':
@@ -1274,9 +1901,12 @@ class Group(object):
             この群の中心。
 
         """
-        closure = {g for g in self.elements
-                   if all(self.master.indices_are_commutable(g, h)
-                          for h in self.elements)}
+        closure = set()
+        for g in self.elements:
+            self.master.check_point()
+            if all(self.master.indices_are_commutable(g, h)
+                   for h in self.elements):
+                closure.add(g)
         return self.master.create_group(closure)
     
     def _calc_centralizer(self) -> 'Group':
@@ -1289,9 +1919,12 @@ class Group(object):
             MasterGroupに対するこの群の中心化群。
 
         """
-        closure = {g for g in self.master.all_elements
-                   if all(self.master.indices_are_commutable(g, h)
-                          for h in self.elements)}
+        closure = set()
+        for g in self.master.all_elements:
+            self.master.check_point()
+            if all(self.master.indices_are_commutable(g, h)
+                   for h in self.elements):
+                closure.add(g)
         return self.master.create_group(closure)
     
     def _calc_derived(self) -> 'Group':
@@ -1358,6 +1991,7 @@ class Group(object):
                             in itertools.product(normal_prev, seed) 
                             if not (normal1 <= normal2 or normal1 >= normal2))
             for gen in gen_list:
+                self.master.check_point()
                 closure = self.master.calc_closure(gen)
                 if len(closure) == self.order: continue
                 if closure in normal_all: continue
@@ -1382,6 +2016,7 @@ class Group(object):
         """
         closure = []
         for g in self.master.all_elements:
+            self.master.check_point()
             left = {self.master.index_prod(g, h) for h in self.elements}
             right = {self.master.index_prod(h, g) for h in self.elements}
             if left == right: closure.append(g)
@@ -1414,6 +2049,7 @@ class Group(object):
         while remaining:
             group = remaining.pop(0)
             for g in remaining:
+                self.master.check_point()
                 if group.order * g.order != self.order: continue
                 result = group.study_cartesian_product(g)               
                 if result.is_direct_product:
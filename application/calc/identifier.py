@@ -1,8 +1,129 @@
 """
 群を同定するためのモジュール。
 """
+import json
+import os
+import numpy
 from .calctools import prime_factorize
+from .fingerprint import calc_digest, calc_order_histogram
 from ..namedgroup.gdata import NamedGroupData
+from ..namedgroup.gdb import GroupDatabase
+from ..namedgroup.gpres import NamedGroupPresentation
+
+class IdentificationCache(object):
+    """
+    可換群の同定結果を、元の位数の分布のハッシュ値をキーとして記録するクラス。
+    プロセス全体で共有され、同型な部分群の同定を繰り返さないために用いる。
+    可換群の同型類は元の位数の分布で定まるため、同定結果は厳密である。
+    save() と load() によりディスクに保存して次回以降に再利用できる。
+    保存時の名前付きの群の登録内容や不変量のデータベースが
+    現在のものと異なる場合は、保存された結果を読み込まない。
+    
+    非可換群の同定結果は記録しない。
+    GroupFingerprint は非同型な群でも一致しうるうえ、
+    不変量のデータベースも各位数の全ての群を含むわけではない。
+    そのため記録された名前は同型であることを確かめ直す必要があり、
+    その費用は同定そのものとほとんど変わらないためである。
+
+    """
+    # ファイルの形式の版
+    _format_version = 3
+    # ハッシュ値 -> 同定結果
+    _results = dict()
+
+    @classmethod
+    def get(cls, key: int) -> str:
+        """
+        指定のキーの同定結果を取得する。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        key : int
+            元の位数の分布のハッシュ値。
+
+        Returns
+        -------
+        str
+            群の同型の表示。
+            記録されていない場合は None。
+
+        """
+        return cls._results.get(key)
+
+    @classmethod
+    def set(cls, key: int, symbol: str):
+        cls._results[key] = symbol
+
+    @classmethod
+    def data_version(cls) -> int:
+        """
+        同定結果の根拠となるデータの版。
+        ファイルの形式、名前付きの群の登録内容、不変量のデータベースから作成する。
+        """
+        return calc_digest((cls._format_version, NamedGroupData.version(),
+                            GroupDatabase.version()))
+
+    @classmethod
+    def clear(cls):
+        cls._results.clear()
+
+    @classmethod
+    def size(cls) -> int:
+        return len(cls._results)
+
+    @classmethod
+    def save(cls, path: str):
+        """
+        記録されている同定結果をJSON形式で保存する。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        path : str
+            保存先のファイルパス。
+
+        Returns
+        -------
+        None.
+
+        """
+        data = {"version": cls._format_version,
+                "data_version": cls.data_version(),
+                "results": {str(k): v for (k, v) in cls._results.items()}}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> bool:
+        """
+        保存された同定結果を読み込み、現在の記録に追加する。
+        ファイルが存在しない場合や、形式の版またはデータの版が異なる場合は
+        何もしない。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        path : str
+            ファイルパス。
+
+        Returns
+        -------
+        bool
+            読み込んだならばTrue。
+
+        """
+        if not os.path.exists(path): return False
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != cls._format_version: return False
+        if data.get("data_version") != cls.data_version(): return False
+        for (k, v) in data["results"].items():
+            cls._results[int(k)] = v
+        return True
 
 class GroupIdentifier(object):
     _not_exist_symbol = "?"
@@ -13,6 +134,9 @@ class GroupIdentifier(object):
     def find_isomorphic(cls, group) -> str:
         """
         指定の群の同定を行う。
+        可換群の同定結果は IdentificationCache に記録し、
+        元の位数の分布が一致する可換群については記録された結果を用いる。
+        非可換群は記録せず、毎回同定する。
 
         Parameters
         ----------
@@ -27,9 +151,36 @@ class GroupIdentifier(object):
             群の同型の表示。
 
         """
-        return (cls._find_isomorphic_abelian(group) 
-                if group.is_abelian else 
-                cls._find_isomorphic_non_abelian(group))
+        if not group.is_abelian:
+            return cls._find_isomorphic_non_abelian(group)
+        key = cls.cache_key(group)
+        symbol = IdentificationCache.get(key)
+        if symbol is None:
+            symbol = cls._find_isomorphic_abelian(group)
+            IdentificationCache.set(key, symbol)
+        return symbol
+
+    @classmethod
+    def cache_key(cls, group) -> int:
+        """
+        可換群の同定結果を記録するためのキーを作成する。
+        可換群は元の位数の分布のみで同型類が定まるため、
+        共役類を計算せずにキーを作成する。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        group : TYPE
+            可換群。
+
+        Returns
+        -------
+        int
+            元の位数の分布のハッシュ値。
+
+        """
+        return calc_digest(("abelian", calc_order_histogram(group)))
     
     @classmethod
     def _find_isomorphic_abelian(cls, group) -> str:
@@ -39,6 +190,7 @@ class GroupIdentifier(object):
             有限可換群は 「素数の自然数冪の位数の巡回群」の直積と同型である
         分解は要素としては一意的でないが、群同型の意味では一意的である。
         ここでは、最も細かい直積分解の一つの方法を与える。
+        巡回群の位数は abelian_invariants() により元の位数の分布から求める。
 
         Parameters
         ----------
@@ -52,10 +204,82 @@ class GroupIdentifier(object):
         str
             群の同型の表示。
 
+        """
+        if group.is_trivial: return cls._trivial_symbol
+        return " × ".join(f'{cls._cyclic_symbol}({order})'
+                          for order in cls.abelian_invariants(group))
+    
+    @classmethod
+    def abelian_invariants(cls, group) -> 'tuple[int]':
+        """
+        可換群を素数冪の位数の巡回群の直積に分解したときの、
+        巡回群の位数の一覧を求める。
+        群の元を生成することなく、元の位数の分布のみから計算する。
+        
+        素数pについて、x^(p^k) = 1 を満たす元の個数を n_k とし、
+        位数がpの冪である巡回群の因子の指数を e_i とすると、
+        log_p(n_k) = Σ min(e_i, k) となる。
+        よって log_p(n_k) - log_p(n_(k-1)) は指数がk以上の因子の個数に等しい。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        group : TYPE
+            可換群。
+
+        Returns
+        -------
+        'tuple[int]'
+            巡回群の位数の一覧。
+            昇順に並ぶ。自明群の場合は空のタプル。
+
+        """
+        master = group.master
+        elements = numpy.fromiter(group.elements, dtype=int,
+                                  count=group.order)
+        orders = master.index_order_data[elements]
+        invariants = []
+        for (prime, power) in prime_factorize(group.order).items():
+            # rank[k]: 指数がk以上の因子の個数
+            rank = [0 for k in range(power+2)]
+            log_prev = 0
+            for k in range(1, power+1):
+                count = numpy.count_nonzero((prime**k) % orders == 0)
+                # count は prime の冪である
+                log_count = 0
+                while count > 1:
+                    count //= prime
+                    log_count += 1
+                rank[k] = log_count - log_prev
+                log_prev = log_count
+            for k in range(1, power+1):
+                invariants += [prime**k] * (rank[k] - rank[k+1])
+        return tuple(sorted(invariants))
+    
+    @classmethod
+    def abelian_cyclic_factors(cls, group) -> 'tuple':
+        """
+        可換群を素数冪の位数の巡回群の直積に分解し、その因子となる群を作成する。
+        部分群の生成を繰り返すため時間がかかる。
+        因子の位数の一覧のみが必要な場合は abelian_invariants() を用いること。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        group : TYPE
+            可換群。
+
+        Returns
+        -------
+        tuple[Group]
+            巡回群の一覧。
+            位数の昇順に並ぶ。自明群の場合は空のタプル。
+
         """
         # アルゴリズム上、自明群は省いておく必要がある
-        # 可換群は正規部分群の探索に時間がかかるので, 単純群であるかの判定はしない
-        if group.is_trivial: return cls._trivial_symbol       
+        if group.is_trivial: return tuple()
         # 一般の場合の処理
         master = group.master
         # STEP 1. 可換群を巡回群の積に分解する
@@ -108,14 +332,7 @@ class GroupIdentifier(object):
                 decomposed_step2.append(group2)
                 next_list.append(group3)
             remaining = tuple(next_list)
-        # 分解終了
-        # Symbolを決定
-        sorted_list = sorted(decomposed_step2)
-        total_symbol = ""
-        for group1 in sorted_list:
-            symbol = f'{cls._cyclic_symbol}({group1.order})'
-            total_symbol += symbol + " × "
-        return total_symbol[:-3]
+        return tuple(sorted(decomposed_step2))
     
     @classmethod
     def _decompose_abelian(cls, group1, group2):
@@ -164,6 +381,11 @@ class GroupIdentifier(object):
         """
         非可換群の同定を行う。
         あらかじめ登録されている名付けられた群の一覧の中から、同型なものを探す。
+        群同型の不変量をキーとした辞書の検索により候補を求め、
+        表示の関係式を満たす生成元の組を探索して同型であることを確かめる。
+        見つからなければ、ディスク上の不変量のデータベースから候補を求める。
+        データベースの候補は不変量が一致するだけであるため、
+        confirm_name() により同型であることを確かめたもののみを返す。
 
         Parameters
         ----------
@@ -178,8 +400,87 @@ class GroupIdentifier(object):
             同型な群の名前。
 
         """
-        for target in NamedGroupData.groups(group.order):
+        # 不変量が一致する候補のうち、表示の関係式を満たす生成元の組が
+        # 見つかったものを同型とする
+        rejected = set()
+        for target in NamedGroupData.groups_of_fingerprint(group.fingerprint):
             if target.is_isomorpic_to_group(group):
                 return target.name
-        # 該当する群なし
-        return cls._not_exist_symbol
\ No newline at end of file
+            rejected.add(target.name)
+        # 登録されていなければ、不変量のデータベースの候補を確かめる
+        for name in GroupDatabase.find(group.fingerprint):
+            if name in rejected: continue
+            if cls.confirm_name(group, name):
+                return name
+        # 該当する群なし、または候補のいずれとも同型であると確かめられない
+        return cls._not_exist_symbol
+
+    @classmethod
+    def confirm_name(cls, group, name: str) -> bool:
+        """
+        指定の群が、指定の名前の群と同型であるか確かめる。
+        名前は GroupIdentifier や不変量のデータベースが返す形式とする。
+        可換群の名前は元の位数の分布から、名前の付けられた非可換群は
+        表示の関係式を満たす生成元の組の探索により確かめる。
+        "A × B" の形式の名前は、A と同型な正規部分群 L と
+        その正規な補群 R が存在し、R が B と同型であるかにより確かめる。
+        有限群の直積の因子は同型を除いて一意的であるため、
+        R は L ごとに一つを調べればよい。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        group : TYPE
+            指定の群。
+        name : str
+            群の名前。
+
+        Returns
+        -------
+        bool
+            True:
+                同型であることを確かめた。
+            False:
+                同型でない、または名前から群を特定できない。
+
+        """
+        parts = name.split(" × ")
+        if all(x.startswith(f'{cls._cyclic_symbol}(') for x in parts):
+            return (group.is_abelian
+                    and cls._find_isomorphic_abelian(group) == name)
+        if group.is_abelian: return False
+        if len(parts) == 1:
+            return cls._confirm_named(group, name)
+        (head, tail) = (parts[0], " × ".join(parts[1:]))
+        for left in group.all_normalsub:
+            if left.order in (1, group.order): continue
+            if group.order % left.order != 0: continue
+            # L の正規な補群を探す
+            right = None
+            for g in group.all_normalsub:
+                group.master.check_point()
+                if left.order * g.order != group.order: continue
+                if left.study_cartesian_product(g).is_direct_product:
+                    right = g
+                    break
+            if right is None: continue
+            if cls.confirm_name(left, head):
+                return cls.confirm_name(right, tail)
+        return False
+
+    @classmethod
+    def _confirm_named(cls, group, name: str) -> bool:
+        """
+        名前の付けられた非可換群と同型であるかを、表示により確かめる。
+        登録されている群の表示を優先し、なければ名前から表示を求める。
+        """
+        candidates = [(target.order, target.presentation) for target
+                      in NamedGroupData.groups(group.order)
+                      if target.name == name
+                      and target.presentation is not None]
+        if not candidates:
+            candidates = NamedGroupPresentation.from_name(name)
+        return any(order == group.order
+                   and presentation.is_isomorphic_to_group(group)
+                   for (order, presentation) in candidates)
\ No newline at end of file
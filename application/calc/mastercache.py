@@ -0,0 +1,257 @@
+"""
+生成した群と乗積表をディスクに保存して再利用するためのモジュール。
+"""
+import hashlib
+import os
+import tempfile
+import zipfile
+import numpy
+from .group import MasterGroup
+from .matcal import CayleyTable, compact_index_dtype
+
+class MasterGroupCache(object):
+    """
+    生成した MasterGroup をディスクに保存して再利用するクラス。
+    生成元の行列、許容誤差、位数の最大値から作成したハッシュ値をキーとして、
+    要素の行列表現、乗積表と、乗積表から計算される各種の表を
+    一つの .npz ファイルに保存する。
+    n×n の表は位数に応じた最小の整数型で保存し、読み込み後もその型のまま用いる。
+
+    Parameters
+    ----------
+    cache_dir : str
+        保存先のディレクトリ。
+
+    """
+    # ファイルの形式の版。形式を変更したときは値を変えること
+    _format_version = 1
+
+    def __init__(self, cache_dir: str):
+        self._cache_dir = cache_dir
+
+    @property
+    def cache_dir(self) -> str:
+        return self._cache_dir
+
+    @classmethod
+    def create_key(cls, generators: 'list[numpy.ndarray]', zero_base: float,
+                   maximal: int) -> str:
+        """
+        生成の条件からキーを作成する。
+        生成元は複素数の行列に変換してから比較するため、
+        整数の行列で与えても複素数の行列で与えても同じキーとなる。
+
+        Parameters
+        ----------
+        generators : 'list[numpy.ndarray]'
+            生成元のリスト。
+        zero_base : float
+            許容誤差。
+        maximal : int
+            位数の最大値。
+
+        Returns
+        -------
+        str
+            キー。16進数の文字列。
+
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((cls._format_version, float(zero_base), int(maximal),
+                       len(generators))).encode("ascii"))
+        for gen in generators:
+            mat = numpy.ascontiguousarray(gen, dtype=numpy.complex128)
+            h.update(repr(mat.shape).encode("ascii"))
+            h.update(mat.tobytes())
+        return h.hexdigest()
+
+    def path_of(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f'master_{key}.npz')
+
+    def load(self, key: str) -> 'MasterGroup':
+        """
+        保存された群を読み込む。
+
+        Parameters
+        ----------
+        key : str
+            キー。
+
+        Returns
+        -------
+        MasterGroup
+            読み込んだ群。
+            保存されていない場合や、読み込みに失敗した場合は None。
+            書き込みが途中で途切れたファイルや壊れたファイルも
+            保存されていないものとして扱う。
+
+        """
+        path = self.path_of(key)
+        if not os.path.exists(path): return None
+        try:
+            with numpy.load(path) as data:
+                if int(data["version"]) != self._format_version: return None
+                return decode_master(data)
+        except (OSError, KeyError, ValueError, EOFError,
+                zipfile.BadZipFile):
+            return None
+
+    def save(self, key: str, master: 'MasterGroup'):
+        """
+        群を保存する。
+        書き込み途中のファイルが読み込まれないよう、
+        一時ファイルに書き込んでから置き換える。
+        一時ファイルの名前は保存ごとに異なるため、
+        複数のプロセスが同じディレクトリに同時に保存してもよい。
+
+        Parameters
+        ----------
+        key : str
+            キー。
+        master : MasterGroup
+            保存する群。
+
+        Returns
+        -------
+        None.
+
+        """
+        os.makedirs(self._cache_dir, exist_ok=True)
+        path = self.path_of(key)
+        with tempfile.NamedTemporaryFile(
+                dir=self._cache_dir, prefix=os.path.basename(path) + ".",
+                suffix=".tmp", delete=False) as f:
+            temp_path = f.name
+            try:
+                numpy.savez(f, version=numpy.array(self._format_version),
+                            **encode_master(master))
+            except BaseException:
+                f.close()
+                os.remove(temp_path)
+                raise
+        os.replace(temp_path, path)
+
+def encode_master(master: 'MasterGroup', prefix: str = ""
+                  ) -> 'dict[str, numpy.ndarray]':
+    """
+    MasterGroup を保存するための配列の辞書を作成する。
+    要素の行列表現、乗積表と、乗積表から計算される各種の表を含む。
+    剰余群のように行列表現を持たない場合は、行列表現を含まない。
+
+    Parameters
+    ----------
+    master : MasterGroup
+        保存する群。
+    prefix : str, optional
+        配列の名前の接頭辞。
+        The default is "".
+
+    Returns
+    -------
+    'dict[str, numpy.ndarray]'
+        配列の名前と配列の辞書。
+
+    """
+    dtype = compact_index_dtype(master.order)
+    arrays = {
+        "table": master.cayley_table.astype(dtype),
+        "inverse": master.inverse_data.astype(dtype),
+        "conjugate": master.conjugate_data.astype(dtype),
+        "commutator": master.commutator_data.astype(dtype),
+        "index_order": master.index_order_data.astype(dtype),
+        }
+    if master.matrix_rep_of_elements is not None:
+        arrays["elements"] = master.matrix_rep_of_elements
+    return {prefix + name: array for (name, array) in arrays.items()}
+
+def decode_master(data, prefix: str = "") -> 'MasterGroup':
+    """
+    encode_master() で作成した配列から MasterGroup を復元する。
+
+    Parameters
+    ----------
+    data : TYPE
+        配列の名前で配列を取得できるオブジェクト。
+        numpy.load() で読み込んだ .npz ファイルなど。
+    prefix : str, optional
+        配列の名前の接頭辞。
+        The default is "".
+
+    Returns
+    -------
+    MasterGroup
+        復元した群。
+        行列表現が保存されていない場合、行列表現は None となる。
+
+    """
+    elements = (data[prefix + "elements"] if prefix + "elements" in data
+                else None)
+    cayley_table = CayleyTable(elements, data[prefix + "table"])
+    return MasterGroup(
+        cayley_table,
+        inverse_data=data[prefix + "inverse"].astype(int),
+        conjugate_data=data[prefix + "conjugate"],
+        commutator_data=data[prefix + "commutator"],
+        index_order_data=data[prefix + "index_order"].astype(int))
+
+def save_mapped_master(master: 'MasterGroup', directory: str):
+    """
+    MasterGroup を、メモリマップとして読み込める形式で保存する。
+    要素の行列表現と乗積表をそれぞれ .npy ファイルとして保存する。
+    行列表現を持たない場合は、行列表現のファイルを作成しない。
+
+    Parameters
+    ----------
+    master : MasterGroup
+        保存する群。
+    directory : str
+        保存先のディレクトリ。
+
+    Returns
+    -------
+    None.
+
+    """
+    os.makedirs(directory, exist_ok=True)
+    dtype = compact_index_dtype(master.order)
+    elements_path = os.path.join(directory, "elements.npy")
+    if master.matrix_rep_of_elements is not None:
+        numpy.save(elements_path, master.matrix_rep_of_elements)
+    elif os.path.exists(elements_path):
+        # 以前に保存した群の行列表現を読み込まないよう削除する
+        os.remove(elements_path)
+    numpy.save(os.path.join(directory, "table.npy"),
+               master.cayley_table.astype(dtype))
+    numpy.save(os.path.join(directory, "inverse.npy"),
+               master.inverse_data.astype(dtype))
+    numpy.save(os.path.join(directory, "index_order.npy"),
+               master.index_order_data.astype(dtype))
+
+def load_mapped_master(directory: str) -> 'MasterGroup':
+    """
+    save_mapped_master() で保存した MasterGroup を読み込む。
+    要素の行列表現と乗積表はメモリマップとして読み込むため、
+    ファイル全体はメモリに展開されない。
+    同じファイルを読み込んだ複数のプロセスは、ページキャッシュを共有する。
+
+    Parameters
+    ----------
+    directory : str
+        保存先のディレクトリ。
+
+    Returns
+    -------
+    MasterGroup
+        読み込んだ群。
+        行列表現が保存されていない場合、行列表現は None となる。
+
+    """
+    elements_path = os.path.join(directory, "elements.npy")
+    elements = (numpy.load(elements_path, mmap_mode="r")
+                if os.path.exists(elements_path) else None)
+    table = numpy.load(os.path.join(directory, "table.npy"), mmap_mode="r")
+    inverse = numpy.load(os.path.join(directory, "inverse.npy"))
+    index_order = numpy.load(os.path.join(directory, "index_order.npy"))
+    return MasterGroup(CayleyTable(elements, table),
+                       inverse_data=inverse.astype(int),
+                       index_order_data=index_order.astype(int))
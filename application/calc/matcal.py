@@ -1,9 +1,21 @@
 """
 行列計算を行うためのモジュール。
 """
+import concurrent.futures
+import hashlib
 import itertools
+import json
+import os
+import tempfile
+import time
+import zipfile
 import numpy
-from ..controller import Controller, NullController
+from numpy.lib.format import open_memmap
+from ..controller import Controller, NullController, ProgressTracker
+from ..exceptions import GenerateGroupError, CalculationInterrupted
+
+# 群の生成において、一度にまとめて計算する行列の積の個数
+_LAYER_CHUNK_SIZE = 2**16
 
 def is_zero_num(num: complex, zero_base: float) -> bool:
     """
@@ -111,8 +123,9 @@ def has_unit_determinant(mat: numpy.ndarray, zero_base: float) -> bool:
 
 def generate_group(
         matlist: 'list[numpy.ndarray]', zero_base: float, maximal: int,
-        controller: 'Controller' = None
-        ) -> 'GenerateGroupResult':
+        controller: 'Controller' = None, checkpoint_path: str = None,
+        checkpoint_interval: float = 60.0, workers: int = None,
+        record_words: bool = False) -> 'GenerateGroupResult':
     """
     指定の生成元のリストから群を生成する。
     以下のいずれかの場合は生成に失敗する。
@@ -122,6 +135,8 @@ def generate_group(
     生成元の次数が合っていない。
     生成元に行列式の絶対値が1でないものが含まれている。
     要素数が最大値を超えても群が閉じない。
+    コントローラーの中断用のトークンによって中断された場合は、
+    途中経過を保存したうえで CalculationInterrupted を送出する。
 
     Parameters
     ----------
@@ -135,6 +150,21 @@ def generate_group(
     controller : 'Controller', optional
         コントローラー。
         The default is None.
+    checkpoint_path : str, optional
+        途中経過の保存先のファイルパス。
+        指定した場合は途中経過を定期的に保存し、
+        保存された途中経過があれば続きから生成する。
+        The default is None.
+    checkpoint_interval : float, optional
+        途中経過を保存する間隔（秒）。
+        The default is 60.0.
+    workers : int, optional
+        積の計算に用いるスレッドの数。Noneまたは1ならば並列化しない。
+        The default is None.
+    record_words : bool, optional
+        True ならば各要素の親と生成元を SchreierTree として記録し、
+        結果の tree に設定する。各要素を生成元の語として表せる。
+        The default is False.
 
     Returns
     -------
@@ -144,65 +174,372 @@ def generate_group(
     """
     ctrl = (controller if controller is not None else NullController())
     n_mat = len(matlist)
-    ctrl.calc_start("%d個の生成元から群の生成を開始" % n_mat)
+    with ctrl.span("generate_group"):
+        ctrl.calc_start("%d個の生成元から群の生成を開始" % n_mat)
+        error = _check_generators(matlist, zero_base)
+        if error is not None:
+            ctrl.calc_end("失敗：" + error)
+            return GenerateGroupResult()
+        tree = SchreierTree(matlist) if record_words else None
+        # 位数は maximal 以下であるため、maximal までの残り時間を見積もる
+        tracker = ProgressTracker(ctrl, maximal, "要素", "要素数",
+                                  total_is_bound=True)
+        try:
+            # 各段を別に保持せず、ElementLocator に追加された要素をそのまま用いる
+            for (n_loop, (locator, layer)) in enumerate(_iter_located_layers(
+                    matlist, zero_base, maximal, checkpoint_path,
+                    checkpoint_interval, ctrl, workers, tree)):
+                n_all = len(locator)
+                # 最初の段は生成元、または再開時には保存された要素
+                if n_loop == 0: tracker.start_from(n_all)
+                tracker.update(n_all, "loop(%d)" % n_loop)
+        except GenerateGroupError as e:
+            ctrl.calc_end("失敗：" + str(e))
+            return GenerateGroupResult()
+        except CalculationInterrupted as e:
+            ctrl.calc_end("中断：" + str(e))
+            raise
+        ctrl.calc_end("生成完了：位数(%d)" % n_all)
+        return GenerateGroupResult(locator.release_elements(), tree)
+
+def iter_group_layers(
+        matlist: 'list[numpy.ndarray]', zero_base: float, maximal: int,
+        checkpoint_path: str = None, checkpoint_interval: float = 60.0,
+        controller: 'Controller' = None, workers: int = None,
+        tree: 'SchreierTree' = None):
+    """
+    指定の生成元のリストから群を生成し、幅優先探索の各段で
+    新たに生成された要素を順に返す。
+    最初の段は単位元と生成元からなる。
+    全ての段を連結したものは generate_group() の結果と一致する。
+
+    checkpoint_path を指定した場合は、生成済みの要素と最後の段を
+    checkpoint_interval 秒ごとに保存する。
+    同じ生成元、許容誤差、最大値で再び呼び出すと、
+    保存された段の次の段から生成を続ける。このとき、保存済みの段は
+    連結したものが一つの段として最初に返される。
+    生成が完了すると保存したファイルは削除される。
+    コントローラーによって中断された場合は、直前の段までを保存する。
+
+    各段では、前の段の要素と生成元の積をまとめて numpy.matmul で計算し、
+    ElementLocator により既存の要素との一致を判定する。
+    workers を指定すると、大きな段の積を複数のスレッドで分担して計算する。
+    tree を指定すると、生成した要素の親と生成元を順に追加する。
+
+    Parameters
+    ----------
+    matlist : 'list[numpy.ndarray]'
+        生成元のリスト。
+    zero_base : float
+        許容誤差。
+    maximal : int
+        群の要素の最大値。
+    checkpoint_path : str, optional
+        途中経過の保存先のファイルパス。
+        The default is None.
+    checkpoint_interval : float, optional
+        途中経過を保存する間隔（秒）。
+        The default is 60.0.
+    controller : 'Controller', optional
+        中断の確認に用いるコントローラー。
+        The default is None.
+    workers : int, optional
+        積の計算に用いるスレッドの数。Noneまたは1ならば並列化しない。
+        The default is None.
+    tree : 'SchreierTree', optional
+        要素の親と生成元の記録先。matlist から作成した空の木を指定する。
+        The default is None.
+
+    Raises
+    ------
+    GenerateGroupError
+        生成元が不適切である場合や、要素数が最大値を超えても群が閉じない場合。
+    CalculationInterrupted
+        コントローラーによって中断された場合。
+
+    Yields
+    ------
+    numpy.ndarray
+        各段で新たに生成された要素。形状が (k, d, d) の配列。
+
+    """
+    layers = _iter_located_layers(matlist, zero_base, maximal,
+                                  checkpoint_path, checkpoint_interval,
+                                  controller, workers, tree)
+    try:
+        for (n_loop, (locator, layer)) in enumerate(layers):
+            # 最初の段は ElementLocator の配列のビューであるため複製する
+            yield layer.copy() if n_loop == 0 else layer
+    finally:
+        layers.close()
+
+def _iter_located_layers(
+        matlist: 'list[numpy.ndarray]', zero_base: float, maximal: int,
+        checkpoint_path: str, checkpoint_interval: float,
+        controller: 'Controller', workers: int, tree: 'SchreierTree'):
+    """
+    iter_group_layers() の処理。各段で (ElementLocator, 新たな要素) を返す。
+    ElementLocator は生成済みの全ての要素を保持する。
+    最初の段は ElementLocator の要素の配列のビューである。
+    """
+    error = _check_generators(matlist, zero_base)
+    if error is not None:
+        raise GenerateGroupError(error)
+    ctrl = (controller if controller is not None else NullController())
+    # 生成元の整理：単位元の除外、重複削除
+    order = matlist[0].shape[0]
+    gen_list = []
+    # gen_list の各生成元の matlist でのインデックス
+    gen_index = []
+    identity = numpy.identity(order)
+    for (k, i) in enumerate(matlist):
+        if is_zero_mat(i-identity,zero_base): continue
+        if is_mat_in_list(i,gen_list,zero_base): continue
+        gen_list.append(i)
+        gen_index.append(k)
+    gen_index = numpy.array(gen_index, dtype=int)
+    checkpoint = (None if checkpoint_path is None else
+                  _GenerateCheckpoint(checkpoint_path, gen_list, zero_base,
+                                      maximal, checkpoint_interval))
+    restored = (checkpoint.load(tree is not None) if checkpoint is not None
+                else None)
+    if restored is None:
+        element_all = [identity] + gen_list
+        element_prev = gen_list
+        if tree is not None:
+            tree.extend(numpy.array([-1] + [0]*len(gen_list)),
+                        numpy.concatenate(([-1], gen_index)))
+    else:
+        (element_all, element_prev, tree_data) = restored
+        if tree is not None: tree.extend(*tree_data)
+    locator = ElementLocator(as_element_array(element_all), zero_base)
+    frontier = as_element_array(element_prev)
+    generators = as_element_array(gen_list)
+    yield (locator, locator.elements)
+    executor = (concurrent.futures.ThreadPoolExecutor(workers)
+                if workers is not None and workers > 1 else None)
+    try:
+        while len(frontier):
+            if len(locator) > maximal:
+                raise GenerateGroupError(
+                    "要素数が最大値(%d)を超えても群が閉じない" % maximal)
+            try:
+                (products, positions) = _multiply_layer(
+                    frontier, generators, locator, ctrl, executor)
+            except CalculationInterrupted:
+                # 直前の段までを保存して、再開時にはこの段から生成する
+                if checkpoint is not None:
+                    checkpoint.save(locator.elements, len(frontier), tree)
+                raise
+            # 既存の要素と一致しない積のうち、同じ段で最初に現れたものを追加する
+            first = _first_occurrences(products, zero_base)
+            if tree is not None:
+                # 積の位置は (前の段の要素, 生成元) の順に数えたもの
+                (row, gen) = numpy.divmod(positions[first], len(generators))
+                tree.extend(len(locator) - len(frontier) + row,
+                            gen_index[gen])
+            frontier = products[first]
+            locator.add(frontier)
+            if checkpoint is not None:
+                checkpoint.save_if_due(locator.elements, len(frontier), tree)
+            if len(frontier):
+                yield (locator, frontier)
+    finally:
+        if executor is not None: executor.shutdown()
+    if checkpoint is not None:
+        checkpoint.remove()
+
+def _multiply_layer(frontier: numpy.ndarray, generators: numpy.ndarray,
+                    locator: 'ElementLocator', ctrl: 'Controller',
+                    executor) -> numpy.ndarray:
+    """
+    前の段の各要素と各生成元の積をまとめて計算し、
+    既存の要素と一致しない積を、(要素, 生成元) の順に並べて返す。
+    積は一定の個数ごとに計算し、executor が指定されていれば並列に計算する。
+    戻り値は (積の配列, 各積の位置)。位置は前の段の要素 i と
+    生成元 j の積について i * (生成元の個数) + j である。
+    """
+    (m, d) = generators.shape[:2]
+    rows = max(1, _LAYER_CHUNK_SIZE // m)
+    starts = range(0, len(frontier), rows)
+    def multiply(start):
+        chunk = frontier[start:start+rows]
+        ctrl.check_point(len(chunk) * m)
+        products = numpy.matmul(chunk[:,numpy.newaxis],
+                                generators[numpy.newaxis]).reshape(-1, d, d)
+        new = numpy.flatnonzero(locator.locate(products) < 0)
+        return (products[new], start * m + new)
+    ctrl.count("matrix_lookups", len(frontier) * m)
+    if executor is None or len(starts) == 1:
+        results = [multiply(start) for start in starts]
+    else:
+        results = list(executor.map(multiply, starts))
+    return (numpy.concatenate([r[0] for r in results]),
+            numpy.concatenate([r[1] for r in results]))
+
+def _first_occurrences(matrices: numpy.ndarray, zero_base: float
+                       ) -> numpy.ndarray:
+    """
+    許容誤差の範囲で一致する行列のうち、最初に現れたもののインデックスを
+    昇順に返す。
+    """
+    if len(matrices) <= 1: return numpy.arange(len(matrices))
+    # 一致する行列の組は、同じ代表（キーの最も小さい行列）を持つ
+    representative = ElementLocator(matrices, zero_base).locate(matrices)
+    first = numpy.full(len(matrices), len(matrices))
+    numpy.minimum.at(first, representative, numpy.arange(len(matrices)))
+    return numpy.flatnonzero(
+        first[representative] == numpy.arange(len(matrices)))
+
+def _check_generators(matlist: 'list[numpy.ndarray]', zero_base: float
+                      ) -> str:
+    """
+    生成元のリストが群の生成に使用できるかを確認する。
+
+    Returns
+    -------
+    str
+        使用できない理由。使用できる場合は None。
+
+    """
     # 許容誤差が負ならば失敗
     # 一致判定で常に不一致とされて、無限に生成されるため
     if zero_base < 0:
-        ctrl.calc_end("失敗：許容誤差が負である")
-        return GenerateGroupResult()   
+        return "許容誤差が負である"
     # 生成元が0個ならば失敗
-    if n_mat == 0:
-        ctrl.calc_end("失敗：生成元の個数が0である")
-        return GenerateGroupResult()
+    if len(matlist) == 0:
+        return "生成元の個数が0である"
     # 生成元が正方行列でなければ失敗。
     if any(i.ndim != 2 for i in matlist):
-        ctrl.calc_end("失敗：生成元が正方行列でない")
-        return GenerateGroupResult()        
+        return "生成元が正方行列でない"
     order = matlist[0].shape[0]
     correct_shape = (order, order)
     # 生成元の次数が合っていなければ失敗
     if any(i.shape != correct_shape for i in matlist):
-        ctrl.calc_end("失敗：生成元の次数が合っていない")
-        return GenerateGroupResult()
+        return "生成元の次数が合っていない"
     # 生成元に行列式の絶対値が1でないものが含まれていたら失敗
     # 有限で閉じないため
     if any(not has_unit_determinant(i,zero_base) for i in matlist):
-        ctrl.calc_end("失敗：生成元に行列式の絶対値が1でないものが含まれている")
-        return GenerateGroupResult()
-    # 生成元の整理：単位元の除外、重複削除
-    gen_list = []
-    identity = numpy.identity(order)
-    for i in matlist:
-        if is_zero_mat(i-identity,zero_base): continue
-        if is_mat_in_list(i,gen_list,zero_base): continue
-        gen_list.append(i)
-    # 元の生成
-    element_all = [identity] + gen_list
-    element_prev = tuple(gen_list)
-    element_new = []
-    n_all = len(element_all)
-    n_loop= 0
-    while element_prev:
-        if n_all > maximal:
-            ctrl.calc_end(
-                "失敗：要素数が最大値(%d)を超えても群が閉じない" % maximal)
-            return GenerateGroupResult()
-        n_loop += 1
-        ctrl.calc_progress("-- loop(%d): 要素数(%d)" % (n_loop,n_all))
-        # 新しい行列を生成
-        new_list = [numpy.dot(mat1,mat2) for (mat1, mat2) 
-                    in itertools.product(element_prev,gen_list)]
-        # 生成されたものが既存の行列と被っていなければリストに追加
-        for i in new_list:
-            if is_mat_in_list(i,element_all,zero_base): continue
-            element_new.append(i)
-            element_all.append(i)
-        # 情報を更新
-        n_all += len(element_new)
-        element_prev = tuple(element_new)
-        element_new = []
-    ctrl.calc_end("生成完了：位数(%d)" % n_all)
-    return GenerateGroupResult(element_all)
+        return "生成元に行列式の絶対値が1でないものが含まれている"
+    return None
+
+class _GenerateCheckpoint(object):
+    """
+    群の生成の途中経過を .npz ファイルとして保存し、読み込む。
+    生成元、許容誤差、最大値が一致する場合にのみ読み込む。
+    """
+    def __init__(self, path: str, gen_list: 'list[numpy.ndarray]',
+                 zero_base: float, maximal: int, interval: float):
+        self._path = path
+        self._interval = interval
+        self._last_saved = time.monotonic()
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((float(zero_base), int(maximal))).encode("ascii"))
+        for gen in gen_list:
+            h.update(numpy.ascontiguousarray(gen, dtype=complex).tobytes())
+        self._digest = h.hexdigest()
+
+    def load(self, need_tree: bool = False):
+        """
+        保存された途中経過を読み込む。
+
+        Parameters
+        ----------
+        need_tree : bool, optional
+            True ならば SchreierTree の内容を含む途中経過のみを読み込む。
+            The default is False.
+
+        Returns
+        -------
+        tuple
+            (生成済みの要素のリスト, 最後の段の要素のタプル,
+            (各要素の親, 各要素の生成元) または None)。
+            読み込めない場合は None。
+
+        """
+        if not os.path.exists(self._path): return None
+        # 他のプロセスが同時に削除した場合や、壊れている場合は読み込まない
+        try:
+            with numpy.load(self._path) as data:
+                if str(data["digest"]) != self._digest: return None
+                if need_tree and "parent" not in data: return None
+                elements = list(data["elements"])
+                n_prev = int(data["n_prev"])
+                tree_data = ((data["parent"], data["generator"])
+                             if "parent" in data else None)
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            return None
+        return (elements, tuple(elements[len(elements)-n_prev:]), tree_data)
+
+    def save_if_due(self, element_all: 'list[numpy.ndarray]', n_prev: int,
+                    tree: 'SchreierTree' = None):
+        """
+        前回の保存から一定時間が経過していれば途中経過を保存する。
+        最後の段は、生成済みの要素の末尾 n_prev 個である。
+        """
+        if time.monotonic() - self._last_saved < self._interval: return
+        self.save(element_all, n_prev, tree)
+
+    def save(self, element_all: 'list[numpy.ndarray]', n_prev: int,
+             tree: 'SchreierTree' = None):
+        """
+        途中経過を保存する。tree を指定した場合はその内容も保存する。
+        複数のプロセスが同じファイルに保存してもよいよう、
+        一時ファイルはプロセスごとに異なる名前とする。
+        """
+        arrays = dict()
+        if tree is not None:
+            arrays = {"parent": tree.parent, "generator": tree.generator}
+        temp_path = _write_temp_file(
+            self._path, lambda f: numpy.savez(
+                f, digest=numpy.array(self._digest),
+                elements=numpy.array(element_all, dtype=complex),
+                n_prev=numpy.array(n_prev), **arrays))
+        os.replace(temp_path, self._path)
+        self._last_saved = time.monotonic()
+
+    def remove(self):
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
+
+def _write_temp_file(path: str, write, mode: str = "wb",
+                     encoding: str = None) -> str:
+    """
+    path と同じディレクトリに一意な名前の一時ファイルを作成し、
+    write(f) で書き込む。書き込みに失敗した場合は一時ファイルを削除する。
+
+    Parameters
+    ----------
+    path : str
+        最終的な保存先のファイルパス。一時ファイルの名前に用いる。
+    write : TYPE
+        開いたファイルを受け取って書き込む関数。
+    mode : str, optional
+        ファイルを開くモード。
+        The default is "wb".
+    encoding : str, optional
+        テキストモードの場合の文字コード。
+        The default is None.
+
+    Returns
+    -------
+    str
+        一時ファイルのパス。os.replace() で path に置き換える。
+
+    """
+    with tempfile.NamedTemporaryFile(
+            mode, encoding=encoding, dir=os.path.dirname(path) or ".",
+            prefix=os.path.basename(path) + ".", suffix=".tmp",
+            delete=False) as f:
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    return f.name
 
 def calc_cayleytable(matlist: 'list[numpy.ndarray]', zero_base: float,
                      controller: 'Controller' = None
@@ -231,46 +568,507 @@ def calc_cayleytable(matlist: 'list[numpy.ndarray]', zero_base: float,
     CalcCayleyTableResult
         作成結果を表すクラス。
 
+    """
+    ctrl = controller if controller is not None else NullController()
+    with ctrl.span("calc_cayleytable"):
+        n = len(matlist)
+        ctrl.calc_start("位数(%d)の群の乗積表の作成を開始" % n)
+        # 許容誤差が負ならば失敗
+        # 一致判定で常に不一致と判定されるため
+        if zero_base < 0:
+            ctrl.calc_end("失敗：許容誤差が負である")
+            return CalcCayleyTableResult()
+        # 位数が0ならば失敗
+        if n == 0:
+            ctrl.calc_end("失敗：位数が0である")
+            return CalcCayleyTableResult()   
+        # 乗積表を表す行列を作成
+        table = numpy.zeros((n,n),dtype=int)
+        # 行列の一致判定にコストがかかるため、なるべく回避する   
+        check_list_column = [[False for i1 in range(n)] for i2 in range(n)]
+        tracker = ProgressTracker(ctrl, n, "行")
+        for i1 in range(n):
+            ctrl.check_point(n)
+            n_compare = 0
+            check_list_row = [False for i2 in range(n)]
+            for i2 in range(n):
+                mat = numpy.dot( matlist[i1],matlist[i2])
+                flag = False
+                for i3 in range(n):
+                    if check_list_row[i3]: continue
+                    if check_list_column[i2][i3]: continue
+                    n_compare += 1
+                    if is_zero_mat(mat-matlist[i3],zero_base):
+                        flag = True
+                        table[i1,i2] = i3
+                        check_list_row[i3] = True
+                        check_list_column[i2][i3] = True
+                        break
+                # 見つからなかった場合は失敗
+                # 群が閉じていないため
+                if not flag:
+                    ctrl.calc_end("失敗：群が閉じていない")
+                    return CalcCayleyTableResult()
+            ctrl.count("matrix_comparisons", n_compare)
+            tracker.update(i1+1)
+        ctrl.calc_end("作成完了")
+        cayley_table = CayleyTable(matlist, table)
+        return CalcCayleyTableResult(cayley_table)     
+
+def calc_cayleytable_to_file(matlist: 'list[numpy.ndarray]', zero_base: float,
+                             path: str, controller: 'Controller' = None,
+                             max_products: int = 2**20
+                             ) -> 'CalcCayleyTableResult':
+    """
+    指定の群の乗積表を、行のまとまりごとに計算してファイルに書き込む。
+    乗積表は .npy 形式のメモリマップとして作成するため、
+    乗積表全体をメモリに展開することはない。
+    書き込んだ行数を進捗ファイル（path + ".progress"）に記録し、
+    中断された場合には、同じ引数で再び呼び出すと続きから計算する。
+    以下のいずれかの場合には作成に失敗する。
+    許容誤差が負である。
+    位数が0である。
+    群が閉じていない。
+
+    Parameters
+    ----------
+    matlist : 'list[numpy.ndarray]'
+        群の要素のリスト。
+        generate_group()で作成された行列のリストを指定する。
+    zero_base : float
+        許容誤差。
+    path : str
+        乗積表の保存先のファイルパス。
+    controller : 'Controller', optional
+        コントローラー。
+        The default is None.
+    max_products : int, optional
+        一度に計算する行列の積の個数の上限。
+        一度に計算する行数は max_products を位数で割った値となる。
+        The default is 2**20.
+
+    Returns
+    -------
+    CalcCayleyTableResult
+        作成結果を表すクラス。
+        乗積表は読み込み専用のメモリマップとなる。
+
     """
     ctrl = controller if controller is not None else NullController()
     n = len(matlist)
     ctrl.calc_start("位数(%d)の群の乗積表の作成を開始" % n)
-    # 許容誤差が負ならば失敗
-    # 一致判定で常に不一致と判定されるため
     if zero_base < 0:
         ctrl.calc_end("失敗：許容誤差が負である")
         return CalcCayleyTableResult()
-    # 位数が0ならば失敗
     if n == 0:
         ctrl.calc_end("失敗：位数が0である")
-        return CalcCayleyTableResult()   
-    # 乗積表を表す行列を作成
-    table = numpy.zeros((n,n),dtype=numpy.int)
-    # 行列の一致判定にコストがかかるため、なるべく回避する   
-    check_list_column = [[False for i1 in range(n)] for i2 in range(n)]
-    for i1 in range(n):
-        check_list_row = [False for i2 in range(n)]
-        for i2 in range(n):
-            mat = numpy.dot( matlist[i1],matlist[i2])
-            flag = False
-            for i3 in range(n):
-                if check_list_row[i3]: continue
-                if check_list_column[i2][i3]: continue
-                if is_zero_mat(mat-matlist[i3],zero_base):
-                    flag = True
-                    table[i1,i2] = i3
-                    check_list_row[i3] = True
-                    check_list_column[i2][i3] = True
-                    break
-            # 見つからなかった場合は失敗
-            # 群が閉じていないため
-            if not flag:
-                ctrl.calc_end("失敗：群が閉じていない")
-                return CalcCayleyTableResult()
-        ctrl.calc_progress("-- 進捗: %d/%d" % (i1+1,n))
+        return CalcCayleyTableResult()
+    elements = as_element_array(matlist)
+    locator = ElementLocator(elements, zero_base)
+    # 進捗ファイルが同じ要素の一覧に対するものならば続きから計算する
+    progress_path = path + ".progress"
+    digest = hashlib.blake2b(elements.tobytes(), digest_size=16).hexdigest()
+    start = 0
+    tracker = ProgressTracker(ctrl, n, "行")
+    if os.path.exists(progress_path) and os.path.exists(path):
+        with open(progress_path, "r", encoding="utf-8") as f:
+            progress = json.load(f)
+        if progress.get("digest") == digest:
+            start = progress["rows"]
+            tracker.start_from(start)
+            ctrl.calc_progress("-- 再開: %d/%d" % (start, n))
+    if start == 0:
+        table = open_memmap(path, mode="w+", dtype=compact_index_dtype(n),
+                            shape=(n, n))
+    else:
+        table = open_memmap(path, mode="r+")
+    block = max(1, max_products // n)
+    identity = numpy.arange(n)
+    for row in range(start, n, block):
+        stop = min(row+block, n)
+        # 中断された場合は、記録済みの行から再開できる
+        ctrl.check_point((stop-row) * n)
+        products = numpy.matmul(elements[row:stop,numpy.newaxis],
+                                elements[numpy.newaxis,:])
+        rows = locator.locate(products.reshape(-1, *elements.shape[1:]))
+        rows = rows.reshape(stop-row, n)
+        # 積が要素の一覧に含まれない場合や、
+        # 行に同じ元が重複する場合は、群が閉じていない
+        if (rows < 0).any() or not (numpy.sort(rows, axis=1)
+                                    == identity).all():
+            del table
+            ctrl.calc_end("失敗：群が閉じていない")
+            return CalcCayleyTableResult()
+        table[row:stop] = rows
+        table.flush()
+        # 書き込みが完了してから進捗を記録する
+        temp_path = _write_temp_file(
+            progress_path, lambda f: json.dump(
+                {"digest": digest, "rows": stop}, f), "w", "utf-8")
+        os.replace(temp_path, progress_path)
+        tracker.update(stop)
+    del table
+    if os.path.exists(progress_path): os.remove(progress_path)
     ctrl.calc_end("作成完了")
-    cayley_table = CayleyTable(matlist, table)
-    return CalcCayleyTableResult(cayley_table)     
+    table = numpy.load(path, mmap_mode="r")
+    return CalcCayleyTableResult(CayleyTable(matlist, table))
+
+def as_element_array(matlist: 'list[numpy.ndarray]') -> numpy.ndarray:
+    """
+    行列のリストを、形状が (n, d, d) の連続した複素数の配列に変換する。
+    既にそのような配列である場合は複製しない。
+    numpy.memmap の場合も複製せず、マップされたファイルをそのまま用いる。
+
+    Parameters
+    ----------
+    matlist : 'list[numpy.ndarray]'
+        行列のリスト、または形状が (n, d, d) の配列。
+
+    Returns
+    -------
+    numpy.ndarray
+        行列を並べた配列。
+
+    """
+    if isinstance(matlist, numpy.memmap):
+        return matlist
+    if len(matlist) == 0:
+        return numpy.zeros((0, 0, 0), dtype=complex)
+    return numpy.ascontiguousarray(
+        matlist if isinstance(matlist, numpy.ndarray) else list(matlist),
+        dtype=complex)
+
+def compact_index_dtype(order: int) -> numpy.dtype:
+    """
+    指定の位数の群の元のインデックスを表せる最小の整数型を返す。
+
+    Parameters
+    ----------
+    order : int
+        群の位数。
+
+    Returns
+    -------
+    numpy.dtype
+        int16 または int32。
+
+    """
+    return numpy.dtype(numpy.int16 if order <= 2**15 else numpy.int32)
+
+class ElementLocator(object):
+    """
+    行列が群のどの要素と許容誤差の範囲で一致するかを検索する。
+    各行列を実数値のキーに写し、キーの近い要素のみを候補として比較する。
+    行列の各成分の差が許容誤差以内ならばキーの差は eps 以内となるため、
+    一致する要素を見落とすことはない。
+    add() により要素を後から追加できる。
+
+    Parameters
+    ----------
+    elements : numpy.ndarray
+        群の要素。形状が (n, d, d) の複素数の配列。
+    zero_base : float
+        許容誤差。
+
+    """
+    def __init__(self, elements: numpy.ndarray, zero_base: float):
+        n = elements.shape[0]
+        self._shape = elements.shape[1:]
+        self._size = elements.shape[1] * elements.shape[2]
+        self._zero_base = zero_base
+        # 要素を追加する場合に備え、配列の先頭 n 行を要素として用いる
+        self._elements = elements.reshape(n, self._size)
+        self._count = n
+        # キーを作成するための重み。再現性のため乱数の種を固定する
+        rng = numpy.random.default_rng(0)
+        self._weight_real = rng.uniform(-1, 1, self._size)
+        self._weight_imag = rng.uniform(-1, 1, self._size)
+        self._eps = zero_base * (numpy.abs(self._weight_real).sum()
+                                 + numpy.abs(self._weight_imag).sum())
+        keys = self._keys(self._elements)
+        self._sorted_index = numpy.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._sorted_index]
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def elements(self) -> numpy.ndarray:
+        """
+        要素の配列。形状は (n, d, d)。要素を追加すると無効になるビューである。
+        """
+        return self._elements[:self._count].reshape(-1, *self._shape)
+
+    def release_elements(self) -> numpy.ndarray:
+        """
+        要素の配列を、余分な容量を切り詰めて返す。
+        可能な場合は複製せずに配列の大きさを変更するため、
+        以降はこの ElementLocator を使用してはならない。
+
+        Returns
+        -------
+        numpy.ndarray
+            形状が (n, d, d) の複素数の配列。
+
+        """
+        elements = self._elements
+        if len(elements) > self._count:
+            if elements.flags["OWNDATA"]:
+                # add() で確保した配列は他から参照されない
+                elements.resize((self._count, self._size), refcheck=False)
+            else:
+                elements = elements[:self._count].copy()
+        self._elements = None
+        return elements.reshape(-1, *self._shape)
+
+    def add(self, matrices: numpy.ndarray):
+        """
+        要素を末尾に追加する。追加する行列どうしは一致しないものとする。
+        要素の配列は容量を倍にしながら確保するため、
+        追加を繰り返しても複製の回数は少ない。
+
+        Parameters
+        ----------
+        matrices : numpy.ndarray
+            形状が (m, d, d) の複素数の配列。
+
+        Returns
+        -------
+        None.
+
+        """
+        flat = matrices.reshape(-1, self._size)
+        (n, m) = (self._count, len(flat))
+        if m == 0: return
+        if n + m > len(self._elements):
+            # 最初の追加で呼び出し元の配列から複製されるため、元の配列は変更しない
+            capacity = max(2*len(self._elements), n + m)
+            buffer = numpy.empty((capacity, self._size), dtype=complex)
+            buffer[:n] = self._elements[:n]
+            self._elements = buffer
+        self._elements[n:n+m] = flat
+        self._count = n + m
+        keys = self._keys(flat)
+        order = numpy.argsort(keys, kind="stable")
+        position = numpy.searchsorted(self._sorted_keys, keys[order], "right")
+        self._sorted_keys = numpy.insert(self._sorted_keys, position,
+                                         keys[order])
+        self._sorted_index = numpy.insert(self._sorted_index, position,
+                                          n + order)
+
+    def locate(self, matrices: numpy.ndarray) -> numpy.ndarray:
+        """
+        各行列と一致する要素のインデックスを求める。
+
+        Parameters
+        ----------
+        matrices : numpy.ndarray
+            形状が (m, d, d) の複素数の配列。
+
+        Returns
+        -------
+        numpy.ndarray
+            一致する要素のインデックスの一覧。
+            一致する要素が存在しない場合は -1。
+
+        """
+        flat = matrices.reshape(-1, self._size)
+        keys = self._keys(flat)
+        first = numpy.searchsorted(self._sorted_keys, keys - self._eps, "left")
+        last = numpy.searchsorted(self._sorted_keys, keys + self._eps, "right")
+        result = numpy.full(len(flat), -1)
+        # 多くの場合は候補がただ一つであるため、最初の候補をまとめて比較する
+        n = len(self._sorted_index)
+        candidate = self._sorted_index[numpy.minimum(first, n-1)]
+        found = (first < last) & self._match(flat, candidate)
+        result[found] = candidate[found]
+        # 残りは候補を一つずつ比較する
+        for i in numpy.flatnonzero(~found & (last - first > 1)):
+            for k in range(first[i]+1, last[i]):
+                index = self._sorted_index[k]
+                if self._match(flat[i:i+1], numpy.array([index]))[0]:
+                    result[i] = index
+                    break
+        return result
+
+    def _keys(self, flat: numpy.ndarray) -> numpy.ndarray:
+        return flat.real @ self._weight_real + flat.imag @ self._weight_imag
+
+    def _match(self, flat: numpy.ndarray, indices: numpy.ndarray
+               ) -> numpy.ndarray:
+        diff = flat - self._elements[indices]
+        return ((numpy.abs(diff.real) <= self._zero_base)
+                & (numpy.abs(diff.imag) <= self._zero_base)).all(axis=1)
+
+class SchreierTree(object):
+    """
+    群の生成における幅優先探索の全域木。
+    各要素について、親の要素のインデックスと、親に右から掛けた生成元の
+    インデックスを記録する。すなわち 要素 = 親 @ 生成元 である。
+    単位元は親と生成元がともに -1 である。
+    行列の代わりに整数を2つずつ保持するため、
+    行列は必要になったときに生成元から再構成する。
+
+    例:
+        gens = NamedGroupGenerator.D_n(4)
+        result = matcal.generate_group(gens, 0.0001, 2000, record_words=True)
+        result.tree.word_text(7)    # 'a^2b'
+        result.tree.word_text(7, ["r", "s"])    # 'r^2s'
+
+    Parameters
+    ----------
+    generators : 'list[numpy.ndarray]'
+        生成元のリスト。generate_group() に指定したもの。
+
+    """
+    def __init__(self, generators: 'list[numpy.ndarray]'):
+        self._generators = as_element_array(generators)
+        self._parent_chunks = []
+        self._generator_chunks = []
+        self._parent = None
+        self._generator = None
+        self._depth = None
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    @property
+    def generators(self) -> numpy.ndarray:
+        return self._generators
+
+    @property
+    def parent(self) -> numpy.ndarray:
+        """
+        各要素の親のインデックス。単位元は -1。
+        """
+        if self._parent is None:
+            self._parent = numpy.concatenate(
+                [numpy.empty(0, dtype=int)] + self._parent_chunks)
+            self._parent_chunks = [self._parent]
+        return self._parent
+
+    @property
+    def generator(self) -> numpy.ndarray:
+        """
+        各要素について、親に掛けた生成元のインデックス。単位元は -1。
+        """
+        if self._generator is None:
+            self._generator = numpy.concatenate(
+                [numpy.empty(0, dtype=int)] + self._generator_chunks)
+            self._generator_chunks = [self._generator]
+        return self._generator
+
+    @property
+    def depth(self) -> numpy.ndarray:
+        """
+        各要素の語の長さ。単位元は 0。
+        """
+        if self._depth is None:
+            parent = self.parent
+            depth = numpy.zeros(len(parent), dtype=int)
+            # 全ての要素について同時に親をたどり、単位元に着くまでの回数を数える
+            current = parent
+            while (current >= 0).any():
+                depth += current >= 0
+                current = numpy.where(current >= 0, parent[current], -1)
+            self._depth = depth
+        return self._depth
+
+    def extend(self, parent: numpy.ndarray, generator: numpy.ndarray):
+        """
+        要素の親と生成元を末尾に追加する。
+        """
+        self._parent_chunks.append(numpy.asarray(parent, dtype=int))
+        self._generator_chunks.append(numpy.asarray(generator, dtype=int))
+        self._parent = None
+        self._generator = None
+        self._depth = None
+
+    def word(self, index: int) -> 'tuple[int]':
+        """
+        要素を生成元の積として表したときの、生成元のインデックスの列。
+        単位元は空のタプル。
+
+        Parameters
+        ----------
+        index : int
+            要素のインデックス。
+
+        Returns
+        -------
+        'tuple[int]'
+            生成元のインデックスの列。左から順に掛ける。
+
+        """
+        (parent, generator) = (self.parent, self.generator)
+        word = []
+        while parent[index] >= 0:
+            word.append(int(generator[index]))
+            index = parent[index]
+        return tuple(reversed(word))
+
+    def word_text(self, index: int, names: 'list[str]' = None) -> str:
+        """
+        要素を生成元の積として表した文字列。単位元は "e"。
+        GroupPresentation の関係式と同じく、積は名前を並べて表し、
+        同じ生成元が続く場合は累乗で表す。
+
+        Parameters
+        ----------
+        index : int
+            要素のインデックス。
+        names : 'list[str]', optional
+            生成元の名前。指定しない場合は a, b, c, ... （27個以上ならば x0, x1, ...）とする。
+            名前に2文字以上のものがある場合は "*" で区切る。
+            The default is None.
+
+        Returns
+        -------
+        str
+            "ab^2" の形式の文字列。
+
+        """
+        word = self.word(index)
+        if not word: return "e"
+        if names is None:
+            n_gen = len(self._generators)
+            names = ("abcdefghijklmnopqrstuvwxyz"[:n_gen] if n_gen <= 26
+                     else ["x%d" % k for k in range(n_gen)])
+        terms = []
+        for (k, run) in itertools.groupby(word):
+            power = len(list(run))
+            terms.append(names[k] if power == 1 else f'{names[k]}^{power}')
+        separator = "" if all(len(x) == 1 for x in names) else "*"
+        return separator.join(terms)
+
+    def matrix(self, index: int) -> numpy.ndarray:
+        """
+        要素の行列を生成元から再構成する。
+        """
+        mat = numpy.identity(self._generators.shape[1], dtype=complex)
+        for k in self.word(index):
+            mat = mat @ self._generators[k]
+        return mat
+
+    def matrices(self) -> numpy.ndarray:
+        """
+        全ての要素の行列を再構成する。語の長さが同じ要素はまとめて計算する。
+
+        Returns
+        -------
+        numpy.ndarray
+            形状が (n, d, d) の複素数の配列。生成時の要素と同じ順に並ぶ。
+
+        """
+        (parent, generator, depth) = (self.parent, self.generator, self.depth)
+        d = self._generators.shape[1]
+        result = numpy.empty((len(parent), d, d), dtype=complex)
+        result[depth == 0] = numpy.identity(d)
+        for n in range(1, depth.max(initial=0) + 1):
+            index = numpy.flatnonzero(depth == n)
+            result[index] = numpy.matmul(result[parent[index]],
+                                         self._generators[generator[index]])
+        return result
 
 class GenerateGroupResult(object):
     """
@@ -287,9 +1085,13 @@ class GenerateGroupResult(object):
         False:
             生成に失敗した。
     
-    value : 'tuple[numpy.ndarray]'
-        生成された行列のタプル。
+    value : numpy.ndarray
+        生成された行列を並べた、形状が (n, d, d) の連続した複素数の配列。
         生成に失敗した場合はNone。
+    
+    tree : SchreierTree
+        各要素の親と生成元の記録。
+        記録しない場合や生成に失敗した場合はNone。
 
     Parameters
     ----------
@@ -298,11 +1100,42 @@ class GenerateGroupResult(object):
         リストがNoneでなければ生成成功の結果を作成する。
         リストがNoneならば生成失敗の結果を作成する。
         The default is None.
+    tree : SchreierTree, optional
+        各要素の親と生成元の記録。
+        The default is None.
 
     """
-    def __init__(self, matlist: 'list[numpy.ndarray]' = None):
+    def __init__(self, matlist: 'list[numpy.ndarray]' = None,
+                 tree: 'SchreierTree' = None):
         self.has_value = True if matlist is not None else False
-        self.value = tuple(matlist) if matlist is not None else None
+        self.value = (as_element_array(matlist) if matlist is not None
+                      else None)
+        self.tree = tree if matlist is not None else None
+    
+    @property
+    def elements(self) -> numpy.ndarray:
+        """
+
+        Returns
+        -------
+        numpy.ndarray
+            生成された行列を並べた配列。value と同じ。
+
+        """
+        return self.value
+    
+    def iter_elements(self):
+        """
+        生成された行列を順に返す。
+        各行列は配列のビューであり、複製は作成しない。
+
+        Yields
+        ------
+        numpy.ndarray
+            生成された行列。
+
+        """
+        yield from self.value
         
 class CalcCayleyTableResult(object):
     """
@@ -342,8 +1175,9 @@ class CayleyTable(object):
     
     Attributes
     ----------
-    matlist : 'tuple[numpy.ndarray]'
-        要素のタプル。
+    matlist : numpy.ndarray
+        要素を並べた、形状が (n, d, d) の連続した複素数の配列。
+        行列表現を持たない群の場合は None。
     
     table: numpy.ndarray
         乗積表。
@@ -353,10 +1187,14 @@ class CayleyTable(object):
     matlist : 'list[numpy.ndarray]'
         要素のリスト。
         この順番で採番する。
+        剰余群のように行列表現を持たない群の場合は None とする。
     table : numpy.ndarray
         乗積表。
+        numpy.memmap の場合は複製せず、マップされたファイルをそのまま用いる。
 
     """
     def __init__(self, matlist: 'list[numpy.ndarray]', table: numpy.ndarray):
-        self.matlist = tuple(matlist)
-        self.table = table.copy()
\ No newline at end of file
+        self.matlist = (as_element_array(matlist) if matlist is not None
+                        else None)
+        self.table = (table if isinstance(table, numpy.memmap)
+                      else table.copy())
\ No newline at end of file
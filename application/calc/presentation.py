@@ -0,0 +1,227 @@
+"""
+群の表示（生成元と基本関係式）を扱うためのモジュール。
+"""
+
+class GroupPresentation(object):
+    """
+    群の表示を表す。
+    生成元は英小文字一文字で表し、大文字はその逆元を表す。
+    関係式は単位元に等しい語として与える。
+    語には "(ab)^3" や "a^-2" のように冪を含めることができる。
+
+    例：二面体群 D(4) は
+        GroupPresentation("ab", (4, 2), ("a^4", "b^2", "(ab)^2"))
+
+    注意:
+        表示が定める群の位数が、登録される群の位数と一致するように与えること。
+        同型判定では、関係式を満たして群全体を生成する元の組が存在するかを調べる。
+
+    Parameters
+    ----------
+    letters : str
+        生成元を表す文字の一覧。
+    orders : 'tuple[int]'
+        表示が定める群における各生成元の位数。
+        探索する元の候補を絞り込むために用いる。
+    relators : 'tuple[str]'
+        基本関係式の一覧。
+
+    """
+    def __init__(self, letters: str, orders: 'tuple[int]',
+                 relators: 'tuple[str]'):
+        if len(letters) != len(orders):
+            raise ValueError("[GroupPresentation] 生成元と位数の個数が異なる。")
+        self._letters = letters
+        self._orders = tuple(orders)
+        self._relators = tuple(relators)
+        parsed = [_parse_word(word, letters) for word in relators]
+        # 関係式を、含まれる生成元の最大のインデックスごとに分類する
+        # 探索中は、その生成元の像が決まった時点で関係式を確認できる
+        self._relators_of_level = [[] for i in letters]
+        for word in parsed:
+            if not word: continue
+            level = max(gen for (gen, exponent) in word)
+            self._relators_of_level[level].append(word)
+
+    def __str__(self):
+        letters = ", ".join(self._letters)
+        relators = ", ".join(self._relators)
+        return f'< {letters} | {relators} >'
+
+    @property
+    def letters(self) -> str:
+        return self._letters
+
+    @property
+    def orders(self) -> 'tuple[int]':
+        return self._orders
+
+    @property
+    def relators(self) -> 'tuple[str]':
+        return self._relators
+
+    def find_generator_images(self, group) -> 'tuple[int]':
+        """
+        指定の群の元のうち、関係式を満たして群全体を生成する元の組を探す。
+        生成元の像の候補を位数で絞り込み、乗積表で関係式を確認しながら
+        深さ優先で探索する。
+        一つ目の生成元の像は、共役類ごとに一つの代表元に限定する。
+        （共役変換は同型写像を同型写像に移すため）
+
+        Parameters
+        ----------
+        group : Group
+            指定の群。
+
+        Returns
+        -------
+        'tuple[int]'
+            生成元の像のインデックスの一覧。
+            存在しない場合は None。
+
+        """
+        master = group.master
+        first = tuple(min(c.elements) for c in group.conjugacy_classes
+                      if c.order == self._orders[0])
+        candidates = [first] + [group.elements_of_order(order)
+                                for order in self._orders[1:]]
+        if any(len(c) == 0 for c in candidates): return None
+        images = [None for i in self._letters]
+        return self._search(group, master, candidates, images, 0)
+
+    def is_isomorphic_to_group(self, group) -> bool:
+        """
+        表示が定める群と指定の群が同型であるか判定する。
+        表示が定める群の位数は指定の群の位数以下と仮定している。
+        このとき、関係式を満たして群全体を生成する元の組が存在すれば
+        全射準同型が存在するため、同型である。
+
+        Parameters
+        ----------
+        group : Group
+            指定の群。
+
+        Returns
+        -------
+        bool
+            True:
+                同型である。
+            False:
+                同型でない。
+
+        """
+        return self.find_generator_images(group) is not None
+
+    def _search(self, group, master, candidates, images, level):
+        """
+        生成元の像を深さ優先で探索する。
+        """
+        last = len(images) - 1
+        for image in candidates[level]:
+            master.check_point()
+            images[level] = image
+            if not all(_evaluate_word(master, word, images)
+                       == master.identity_index
+                       for word in self._relators_of_level[level]):
+                continue
+            if level < last:
+                result = self._search(group, master, candidates, images,
+                                      level+1)
+                if result is not None: return result
+                continue
+            # 全ての像が決まったら、群全体を生成するかを確認する
+            if len(master.calc_closure(set(images))) == group.order:
+                return tuple(images)
+        images[level] = None
+        return None
+
+def _evaluate_word(master, word: 'list[tuple[int]]', images: 'list[int]'
+                   ) -> int:
+    """
+    生成元の像を代入して語を計算する。
+    冪乗は冪写像の表を用いて計算する。
+
+    Parameters
+    ----------
+    master : MasterGroup
+        乗積表を持つ群。
+    word : 'list[tuple[int]]'
+        (生成元のインデックス, 指数) の一覧。
+    images : 'list[int]'
+        生成元の像の一覧。
+
+    Returns
+    -------
+    int
+        計算結果の元のインデックス。
+
+    """
+    result = master.identity_index
+    for (gen, exponent) in word:
+        index = images[gen]
+        if exponent < 0:
+            index = master.index_inverse(index)
+            exponent = -exponent
+        if exponent != 1:
+            index = master.power_map(exponent)[index]
+        result = master.index_prod(result, index)
+    return result
+
+def _parse_word(word: str, letters: str) -> 'list[tuple[int]]':
+    """
+    語を (生成元のインデックス, 指数) の一覧に変換する。
+    隣り合う同じ生成元はまとめる。
+
+    Parameters
+    ----------
+    word : str
+        語。
+    letters : str
+        生成元を表す文字の一覧。
+
+    Returns
+    -------
+    'list[tuple[int]]'
+        (生成元のインデックス, 指数) の一覧。
+
+    """
+    (result, position) = _parse_sequence(word.replace(" ", ""), 0, letters)
+    if position != len(word.replace(" ", "")):
+        raise ValueError(f"[GroupPresentation] 語の書式が不適切: {word}")
+    return result
+
+def _parse_sequence(word: str, position: int, letters: str):
+    """
+    括弧の内部、または語全体の文字列を解析する。
+    """
+    result = []
+    while position < len(word) and word[position] != ")":
+        char = word[position]
+        if char == "(":
+            (part, position) = _parse_sequence(word, position+1, letters)
+            if position >= len(word):
+                raise ValueError(
+                    f"[GroupPresentation] 括弧が閉じていない: {word}")
+            position += 1
+        elif char.lower() in letters:
+            gen = letters.index(char.lower())
+            part = [(gen, 1 if char.islower() else -1)]
+            position += 1
+        else:
+            raise ValueError(f"[GroupPresentation] 不明な文字: {char}")
+        # 冪の指定
+        if position < len(word) and word[position] == "^":
+            end = position + 1
+            if end < len(word) and word[end] == "-": end += 1
+            while end < len(word) and word[end].isdigit(): end += 1
+            exponent = int(word[position+1:end])
+            position = end
+            if exponent < 0:
+                part = [(gen, -e) for (gen, e) in reversed(part)]
+            part = part * abs(exponent)
+        for (gen, exponent) in part:
+            if result and result[-1][0] == gen:
+                exponent += result.pop()[1]
+                if exponent == 0: continue
+            result.append((gen, exponent))
+    return (result, position)
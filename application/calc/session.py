@@ -0,0 +1,288 @@
+"""
+解析の途中経過（セッション）を保存して復元するためのモジュール。
+"""
+import itertools
+import os
+import tempfile
+import numpy
+from .conjugacy import ConjugacyClass
+from .groupstructure import DirectProduct, SemidirectProduct
+from .mastercache import encode_master, decode_master
+
+class GroupSession(object):
+    """
+    MasterGroup と、作成された全ての部分群、および各部分群の計算済みの値を
+    一つの .npz ファイルに保存し、復元するクラス。
+
+    部分群は元の集合をビット列として保存する。
+    計算済みの値は属性ごとに配列へまとめ、部分群を参照する値は
+    保存した部分群の番号で表す。未計算の値は保存しない。
+
+    復元時には MasterGroup と部分群の元の集合のみを読み込み、
+    各属性の値は初めて参照されたときにその属性の配列のみを読み込む。
+    そのため復元した群はファイルを開いたままとなる。
+    不要になったら close() で閉じること。
+
+    """
+    # ファイルの形式の版。形式を変更したときは値を変えること
+    _format_version = 1
+    # 部分群を値とする属性
+    _group_fields = ("center", "centralizer", "derived", "normalizer")
+    # 部分群のタプルを値とする属性
+    _groups_fields = ("derived_series", "all_normalsub")
+    # 真偽値を値とする属性
+    _bool_fields = ("is_abelian", "is_perfect", "is_solvable", "is_simple")
+    # 部分群の組のタプルを値とする属性
+    _pair_fields = ("direct_product", "semidirect_product")
+
+    @classmethod
+    def save(cls, master, path: str):
+        """
+        セッションを保存する。
+        復元したセッションの値のうち未読み込みのものも読み込んで保存する。
+        一時ファイルに書き込んでから置き換えるため、
+        復元中のセッションと同じファイルに保存してもよい。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        master : MasterGroup
+            保存する群。
+        path : str
+            保存先のファイルパス。
+
+        Returns
+        -------
+        None.
+
+        """
+        groups = master.all_groups
+        number = {id(g): i for (i, g) in enumerate(groups)}
+        membership = numpy.zeros((len(groups), master.order), dtype=bool)
+        for (i, g) in enumerate(groups):
+            membership[i, list(g.elements)] = True
+        arrays = encode_master(master, "master_")
+        arrays["version"] = numpy.array(cls._format_version)
+        arrays["group_initial"] = numpy.array(master.group_initial)
+        arrays["group_count"] = numpy.array(master.group_count)
+        arrays["group_names"] = numpy.array([g.name for g in groups],
+                                            dtype=str)
+        arrays["group_elements"] = numpy.packbits(membership, axis=1)
+        for field in cls._group_fields:
+            values = [g.stored_value(field) for g in groups]
+            arrays[field] = numpy.array(
+                [-1 if v is None else number[id(v)] for v in values],
+                dtype=numpy.int32)
+        for field in cls._bool_fields:
+            values = [g.stored_value(field) for g in groups]
+            arrays[field] = numpy.array(
+                [-1 if v is None else int(v) for v in values], dtype=numpy.int8)
+        values = [g.stored_value("isomorphic") for g in groups]
+        arrays["isomorphic"] = numpy.array(
+            ["" if v is None else v for v in values], dtype=str)
+        for field in cls._groups_fields:
+            values = [g.stored_value(field) for g in groups]
+            arrays.update(cls._encode_ragged(
+                field, values,
+                lambda v: [number[id(g)] for g in v]))
+        for field in cls._pair_fields:
+            values = [g.stored_value(field) for g in groups]
+            arrays.update(cls._encode_ragged(
+                field, values,
+                lambda v: [(number[id(p.left)], number[id(p.right)])
+                           for p in v]))
+        # 共役類: 群ごとの共役類の一覧と、共役類ごとの元の一覧
+        values = [g.stored_value("conjugacy_classes") for g in groups]
+        arrays.update(cls._encode_ragged(
+            "conjugacy_classes", values,
+            lambda v: [(c.order, c.element_num) for c in v]))
+        class_elements = [sorted(c.elements) for v in values
+                          if v is not None for c in v]
+        arrays["conjugacy_classes_elements"] = numpy.array(
+            list(itertools.chain.from_iterable(class_elements)),
+            dtype=numpy.int32)
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+                dir=directory, prefix=os.path.basename(path) + ".",
+                suffix=".tmp", delete=False) as f:
+            temp_path = f.name
+            try:
+                numpy.savez(f, **arrays)
+            except BaseException:
+                f.close()
+                os.remove(temp_path)
+                raise
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        保存されたセッションを復元する。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        path : str
+            ファイルパス。
+
+        Returns
+        -------
+        MasterGroup
+            復元した群。
+
+        """
+        data = numpy.load(path)
+        if int(data["version"]) != cls._format_version:
+            data.close()
+            raise ValueError("セッションの形式の版が異なります。")
+        master = decode_master(data, "master_")
+        master.group_initial = str(data["group_initial"])
+        membership = numpy.unpackbits(data["group_elements"], axis=1,
+                                      count=master.order).astype(bool)
+        groups = [master.restore_group(numpy.flatnonzero(row).tolist(),
+                                       str(name))
+                  for (row, name) in zip(membership, data["group_names"])]
+        master.restore_group_count(int(data["group_count"]))
+        restorer = _SessionRestorer(cls, data, groups)
+        for g in groups:
+            g.set_restorer(restorer)
+        return master
+
+    @classmethod
+    def close(cls, master):
+        """
+        load() で開いたファイルを閉じる。
+        未読み込みの値は読み込まれず、参照されたときに計算される。
+        セッションから復元した群でなければ何もしない。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        master : MasterGroup
+            load() で復元した群。
+
+        Returns
+        -------
+        None.
+
+        """
+        restorers = dict()
+        for g in master.all_groups:
+            if g.restorer is not None:
+                restorers[id(g.restorer)] = g.restorer
+                g.set_restorer(None)
+        for restorer in restorers.values():
+            restorer.close()
+
+    @staticmethod
+    def _encode_ragged(field: str, values: list, encode
+                       ) -> 'dict[str, numpy.ndarray]':
+        """
+        群ごとに長さの異なる値の一覧を、計算済みであるかの一覧、
+        各群の値の開始位置の一覧、全ての値を連結した配列として表す。
+        """
+        computed = numpy.array([v is not None for v in values], dtype=bool)
+        encoded = [encode(v) if v is not None else [] for v in values]
+        offsets = numpy.zeros(len(values)+1, dtype=numpy.int64)
+        offsets[1:] = numpy.cumsum([len(e) for e in encoded])
+        items = list(itertools.chain.from_iterable(encoded))
+        return {f'{field}_computed': computed,
+                f'{field}_offsets': offsets,
+                f'{field}_values': numpy.array(items, dtype=numpy.int32)}
+
+class _SessionRestorer(object):
+    """
+    保存されたセッションから、部分群の計算済みの値を必要に応じて読み込む。
+    属性ごとの配列は、その属性が初めて参照されたときにのみ読み込まれる。
+    """
+    def __init__(self, session, data, groups: list):
+        self._session = session
+        self._data = data
+        self._groups = groups
+        self._number = {id(g): i for (i, g) in enumerate(groups)}
+        # 属性名 -> 読み込んだ配列
+        self._arrays = dict()
+
+    def restore(self, group, field: str):
+        """
+        指定の群の指定の属性の計算済みの値を返す。
+
+        Parameters
+        ----------
+        group : Group
+            保存されたセッションから復元された群。
+        field : str
+            属性の名前。
+
+        Returns
+        -------
+        計算済みの値。保存されていない場合は None。
+
+        """
+        i = self._number.get(id(group))
+        if i is None: return None
+        session = self._session
+        if field in session._group_fields:
+            value = int(self._array(field)[i])
+            return None if value < 0 else self._groups[value]
+        if field in session._bool_fields:
+            value = int(self._array(field)[i])
+            return None if value < 0 else bool(value)
+        if field == "isomorphic":
+            value = str(self._array(field)[i])
+            return None if value == "" else value
+        if field in session._groups_fields:
+            values = self._ragged(field, i)
+            if values is None: return None
+            return tuple(self._groups[k] for k in values)
+        if field == "direct_product":
+            values = self._ragged(field, i)
+            if values is None: return None
+            return tuple(DirectProduct(self._groups[l], self._groups[r])
+                         for (l, r) in values)
+        if field == "semidirect_product":
+            values = self._ragged(field, i)
+            if values is None: return None
+            return tuple(SemidirectProduct(self._groups[l], self._groups[r])
+                         for (l, r) in values)
+        if field == "conjugacy_classes":
+            return self._restore_conjugacy_classes(i)
+        return None
+
+    def close(self):
+        self._arrays.clear()
+        self._data.close()
+
+    def _array(self, name: str) -> numpy.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = self._data[name]
+        return self._arrays[name]
+
+    def _ragged(self, field: str, i: int) -> numpy.ndarray:
+        if not self._array(f'{field}_computed')[i]: return None
+        offsets = self._array(f'{field}_offsets')
+        values = self._array(f'{field}_values')
+        return values[offsets[i]:offsets[i+1]]
+
+    def _restore_conjugacy_classes(self, i: int) -> 'tuple[ConjugacyClass]':
+        field = "conjugacy_classes"
+        values = self._ragged(field, i)
+        if values is None: return None
+        # 共役類の元の一覧における、この群の共役類の開始位置
+        offsets = self._array(f'{field}_offsets')
+        if f'{field}_element_offsets' not in self._arrays:
+            sizes = self._array(f'{field}_values').reshape(-1, 2)[:,1]
+            element_offsets = numpy.zeros(len(sizes)+1, dtype=numpy.int64)
+            element_offsets[1:] = numpy.cumsum(sizes)
+            self._arrays[f'{field}_element_offsets'] = element_offsets
+        element_offsets = self._arrays[f'{field}_element_offsets']
+        elements = self._array(f'{field}_elements')
+        c_classes = []
+        for (k, (order, num)) in enumerate(values.reshape(-1, 2)):
+            start = element_offsets[offsets[i] + k]
+            indexset = elements[start:start+num].tolist()
+            c_classes.append(ConjugacyClass(indexset, int(order)))
+        return tuple(c_classes)
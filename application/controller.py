@@ -1,15 +1,245 @@
 """
 アプリ制御用のモジュール。
 """  
+import contextlib
+import threading
+import time
 from abc import ABCMeta
 from abc import abstractmethod
+from .exceptions import CalculationCancelled, CalculationTimeout
+
+class CancellationToken(object):
+    """
+    時間のかかる計算を途中で中断するためのトークン。
+    計算の処理は check() を定期的に呼び出し、
+    キャンセルされた場合や制限を超えた場合には例外により中断する。
+    cancel() は別のスレッドから呼び出してよい。
+
+    """
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._start = time.monotonic()
+        self._deadline = None
+        self._step_limit = None
+        self._steps = 0
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def steps(self) -> int:
+        return self._steps
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def cancel(self):
+        """
+        計算のキャンセルを要求する。
+        """
+        self._cancelled.set()
+
+    def reset(self, time_limit: float = None, step_limit: int = None):
+        """
+        キャンセルの要求を取り消し、新たな制限を設定する。
+
+        Parameters
+        ----------
+        time_limit : float, optional
+            制限時間（秒）。Noneならば制限しない。
+            The default is None.
+        step_limit : int, optional
+            制限ステップ数。Noneならば制限しない。
+            The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._cancelled.clear()
+        self._start = time.monotonic()
+        self._deadline = (None if time_limit is None
+                          else self._start + time_limit)
+        self._step_limit = step_limit
+        self._steps = 0
+
+    def check(self, steps: int = 1):
+        """
+        中断すべきか確認する。
+
+        Parameters
+        ----------
+        steps : int, optional
+            前回の確認から進んだステップ数。
+            The default is 1.
+
+        Raises
+        ------
+        CalculationCancelled
+            キャンセルが要求された。
+        CalculationTimeout
+            制限時間または制限ステップ数を超えた。
+
+        Returns
+        -------
+        None.
+
+        """
+        self._steps += steps
+        if self._cancelled.is_set():
+            raise CalculationCancelled("計算がキャンセルされました。")
+        if self._step_limit is not None and self._steps > self._step_limit:
+            raise CalculationTimeout(
+                "制限ステップ数(%d)を超えました。" % self._step_limit,
+                self.elapsed, self._steps)
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise CalculationTimeout(
+                "制限時間(%g秒)を超えました。"
+                % (self._deadline - self._start),
+                self.elapsed, self._steps)
 
 class Controller(metaclass = ABCMeta):
     """
     コントローラー。
     画面部分や計算部分をつなぐための抽象クラス。
     
+    中断用のトークンを設定すると、時間のかかる計算は check_point() を通して
+    定期的にトークンを確認し、キャンセルや制限超過の場合に中断する。
+    
+    Profiler を設定すると、時間のかかる計算は span() と count() を通して
+    所要時間と回数を記録する。
+    
+    時間のかかる計算は、進捗を report_progress() を通して通知する。
+    通知は max_progress_rate により一秒あたりの回数が制限され、
+    制限により省略される通知の文章は作成されない。
+    
     """
+    # 進捗の通知の一秒あたりの最大回数。Noneならば制限しない
+    max_progress_rate = None
+    # 中断用のトークン。Noneならば中断しない
+    _cancellation_token = None
+    # 計測用の Profiler。Noneならば計測しない
+    _profiler = None
+    # 最後に進捗を通知した時刻
+    _last_progress = None
+    
+    @property
+    def cancellation_token(self) -> 'CancellationToken':
+        return self._cancellation_token
+    
+    @cancellation_token.setter
+    def cancellation_token(self, token: 'CancellationToken'):
+        self._cancellation_token = token
+    
+    def check_point(self, steps: int = 1):
+        """
+        時間のかかる計算の途中で呼び出し、中断すべきか確認する。
+        トークンが設定されていなければ何もしない。
+
+        Parameters
+        ----------
+        steps : int, optional
+            前回の確認から進んだステップ数。
+            The default is 1.
+
+        Raises
+        ------
+        CalculationInterrupted
+            キャンセルが要求された、または制限を超えた。
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._cancellation_token is not None:
+            self._cancellation_token.check(steps)
+    
+    @property
+    def profiler(self) -> 'Profiler':
+        return self._profiler
+    
+    @profiler.setter
+    def profiler(self, profiler: 'Profiler'):
+        self._profiler = profiler
+    
+    def span(self, name: str):
+        """
+        with 文の区間を、名前付きのスパンとして記録する。
+        Profiler が設定されていなければ何もしない。
+
+        Parameters
+        ----------
+        name : str
+            スパンの名前。
+
+        Returns
+        -------
+        コンテキストマネージャー。
+
+        """
+        if self._profiler is None:
+            return contextlib.nullcontext()
+        return self._profiler.span(name)
+    
+    def count(self, name: str, n: int = 1):
+        """
+        名前付きのカウンターに加算する。
+        Profiler が設定されていなければ何もしない。
+
+        Parameters
+        ----------
+        name : str
+            カウンターの名前。
+        n : int, optional
+            加算する値。
+            The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._profiler is not None:
+            self._profiler.count(name, n)
+    
+    def progress_due(self) -> bool:
+        """
+        進捗を通知してよいか。
+        前回の通知から 1 / max_progress_rate 秒以上経過していれば True。
+        """
+        if self.max_progress_rate is None or self._last_progress is None:
+            return True
+        return (time.monotonic() - self._last_progress
+                >= 1.0 / self.max_progress_rate)
+    
+    def report_progress(self, text, force: bool = False) -> bool:
+        """
+        通知してよい場合にのみ、calc_progress() で進捗を通知する。
+
+        Parameters
+        ----------
+        text : TYPE
+            進捗を表す文章、または文章を返す引数のない関数。
+            関数を渡すと、通知を省略する場合には文章を作成しない。
+        force : bool, optional
+            True ならば回数の制限によらず通知する。計算の完了時などに用いる。
+            The default is False.
+
+        Returns
+        -------
+        bool
+            通知したか。
+
+        """
+        if not (force or self.progress_due()): return False
+        self._last_progress = time.monotonic()
+        self.calc_progress(text() if callable(text) else text)
+        return True
+    
     @abstractmethod
     def message(self, text: str):
         """
@@ -84,6 +314,8 @@ class NullController(Controller):
     何の機能も持たない。
     
     """
+    def message(self, text: str):
+        pass
     def calc_start(self, text: str):
         pass
     def calc_progress(self, text: str):
@@ -96,13 +328,22 @@ class ConsoleController(Controller):
     コンソール出力のみを扱うコントローラー。
     
     """
+    # 端末への出力が計算の妨げにならないよう、進捗の表示を制限する
+    max_progress_rate = 4
+    # 直前に表示した進捗の文字数
+    # 短い文章で上書きしたときに前の文章が残らないよう、空白で埋める
+    _progress_width = 0
+    
     def message(self, text: str):
         print(text)
     def calc_start(self, text: str):
         print(text)
     def calc_progress(self, text: str):
-        print("\r"+text,end ="")
+        padding = " " * max(self._progress_width - len(text), 0)
+        print("\r"+text+padding,end ="",flush=True)
+        self._progress_width = len(text)
     def calc_end(self, text: str):
+        self._progress_width = 0
         print("\n"+text)
 
 class APPController(Controller):
@@ -110,9 +351,163 @@ class APPController(Controller):
     アプリケーションを制御するためのコントローラー。
     
     """
+    # 進捗を一行ずつ出力するため、表示を制限する
+    max_progress_rate = 1
     def calc_progress(self, text: str):
         print(text)
         
     
 
 
+
+class ProgressTracker(object):
+    """
+    時間のかかる計算の進捗を、処理速度と残り時間の見積もりとともに
+    コントローラーへ通知する。
+    update() と add() は計算の途中で頻繁に呼び出してよい。
+    呼び出しをまとめて、時刻の確認も一定の間隔でのみ行う。
+    通知の回数はコントローラーの max_progress_rate により制限され、
+    総量に達したときは必ず通知する。
+
+    例:
+        tracker = ProgressTracker(ctrl, n, "行")
+        for row in range(n):
+            ...
+            tracker.update(row+1)
+
+    Parameters
+    ----------
+    controller : Controller
+        通知先のコントローラー。
+    total : int
+        処理の総量。Noneならば不明とし、残り時間を見積もらない。
+    unit : str
+        処理の単位。"行", "要素" など。
+    label : str, optional
+        通知する文章の見出し。
+        The default is "進捗".
+    total_is_bound : bool, optional
+        True ならば total は総量の上限とし、上限までの残り時間を見積もる。
+        The default is False.
+
+    """
+    # 時刻を確認するおおよその間隔（秒）
+    _check_interval = 0.02
+    
+    def __init__(self, controller: 'Controller', total: int, unit: str,
+                 label: str = "進捗", total_is_bound: bool = False):
+        self._controller = controller
+        self._total = total
+        self._unit = unit
+        self._label = label
+        self._total_is_bound = total_is_bound
+        self._start = time.monotonic()
+        self._initial = 0
+        self._done = 0
+        # 時刻を確認するまでの呼び出しの回数と、前回の確認からの呼び出しの回数
+        self._stride = 1
+        self._pending = 0
+        self._last_check = self._start
+
+    @property
+    def done(self) -> int:
+        return self._done
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    @property
+    def rate(self) -> float:
+        """
+        開始してからの、一秒あたりの処理量。
+        再開した計算では、再開前の処理量を含めない。
+        """
+        elapsed = self.elapsed
+        if elapsed <= 0: return 0.0
+        return (self._done - self._initial) / elapsed
+
+    @property
+    def remaining_time(self) -> float:
+        """
+        総量に達するまでの残り時間（秒）の見積もり。
+        総量が不明な場合や、処理速度が求まらない場合は None。
+        """
+        rate = self.rate
+        if self._total is None or rate <= 0: return None
+        return max(self._total - self._done, 0) / rate
+
+    def start_from(self, done: int):
+        """
+        途中から再開した計算の、再開時点の処理量を設定する。
+        """
+        self._initial = done
+        self._done = done
+
+    def add(self, n: int = 1, note: str = ""):
+        """
+        処理量に加算する。通知の条件は update() と同じ。
+        """
+        self.update(self._done + n, note)
+
+    def update(self, done: int, note: str = ""):
+        """
+        処理量を更新し、コントローラーが通知を受け付ければ通知する。
+        一定の回数の呼び出しごとにのみ時刻を確認し、その回数は
+        時刻の確認がおおよそ一定の間隔となるよう調整する。
+
+        Parameters
+        ----------
+        done : int
+            ここまでの処理量。
+        note : str, optional
+            通知する文章の末尾に加える文字列。
+            The default is "".
+
+        Returns
+        -------
+        None.
+
+        """
+        self._done = done
+        finished = self._total is not None and done >= self._total
+        self._pending += 1
+        if self._pending < self._stride and not finished: return
+        self._pending = 0
+        now = time.monotonic()
+        if now - self._last_check < self._check_interval:
+            self._stride *= 2
+        elif self._stride > 1:
+            self._stride //= 2
+        self._last_check = now
+        self._controller.report_progress(lambda: self.text(note),
+                                         force=finished)
+
+    def text(self, note: str = "") -> str:
+        """
+        現在の進捗を表す文章。
+        """
+        if self._total is None:
+            text = f'-- {self._label}: {self._done}{self._unit}'
+        else:
+            text = f'-- {self._label}: {self._done}/{self._total}{self._unit}'
+        # 処理速度が求まるまでは、速度と残り時間を表示しない
+        rate = self.rate
+        if rate > 0:
+            text += f' ({rate:.1f}{self._unit}/秒'
+            remaining = self.remaining_time
+            if remaining is not None:
+                prefix = "上限まで" if self._total_is_bound else ""
+                text += f', {prefix}残り約{format_seconds(remaining)}'
+            text += ")"
+        if note: text += " " + note
+        return text
+
+def format_seconds(seconds: float) -> str:
+    """
+    秒数を「1時間2分」「3分4秒」「5.6秒」のような文字列にする。
+    """
+    if seconds < 60: return f'{seconds:.1f}秒'
+    seconds = int(seconds)
+    if seconds < 3600: return f'{seconds // 60}分{seconds % 60}秒'
+    return f'{seconds // 3600}時間{seconds % 3600 // 60}分'
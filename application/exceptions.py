@@ -6,4 +6,34 @@ class GenerateGroupError(Exception):
     """
     群の生成に失敗したことを表す例外。
     """
-    pass
\ No newline at end of file
+    pass
+class CalculationInterrupted(Exception):
+    """
+    計算が途中で中断されたことを表す例外。
+    """
+    pass
+
+class CalculationCancelled(CalculationInterrupted):
+    """
+    計算がキャンセルされたことを表す例外。
+    """
+    pass
+
+class CalculationTimeout(CalculationInterrupted):
+    """
+    計算が制限時間または制限ステップ数を超えたことを表す例外。
+
+    Parameters
+    ----------
+    message : str
+        超えた制限の説明。
+    elapsed : float
+        中断までの経過時間（秒）。
+    steps : int
+        中断までのステップ数。
+
+    """
+    def __init__(self, message: str, elapsed: float, steps: int):
+        super().__init__(message)
+        self.elapsed = elapsed
+        self.steps = steps
@@ -0,0 +1,182 @@
+"""
+解析結果を解析画面に表示する文字列に変換するモジュール。
+analyzer.py の GroupAnalyzer が返すオブジェクトを受け取る。
+"""
+
+class AnalysisFormatter(object):
+    """
+    解析結果を文字列に変換するクラス。
+    各メソッドは対象の群と、GroupAnalyzer の対応するメソッドの結果を受け取る。
+
+    """
+    @classmethod
+    def overview(cls, overview: 'GroupOverview') -> str:
+        group = overview.group
+        text = (
+            f'{overview.name} の概要：\n'+
+            "Name\tOrder\tIsomorphic\n"+
+            f'{overview.name}\t{overview.order}\t{overview.isomorphic}'
+            )
+        text += "\n"
+        text += f'\nIsAbelian\t\t{overview.is_abelian}'
+        text += f'\nIsPerfect\t\t{overview.is_perfect}'
+        text += f'\nIsSimple\t\t{overview.is_simple}'
+        text += f'\nIsSolvable\t\t{overview.is_solvable}'
+        text += "\n\n分解パターン"
+        text += "\n\n" + cls.direct_products(group, overview.direct_products)
+        text += "\n\n" + cls.semidirect_products(
+            group, overview.semidirect_products)
+        return text
+
+    @staticmethod
+    def elements(group, elements: 'tuple[int]') -> str:
+        return (
+            f'{group.name} の要素：\n'+
+            f'{list(elements)}'
+            )
+
+    @staticmethod
+    def cayley_table(group, table) -> str:
+        return (
+            f'{group.name} の乗積表：\n'+
+            f'{table}'
+            )
+
+    @staticmethod
+    def conjugacy_classes(group, conj_classes: 'tuple[ConjugacyClass]'
+                          ) -> str:
+        text = (
+            f'{group.name} の共役類の一覧：\n'+
+            "位数\t要素数\t共役類"
+            )
+        for c in conj_classes:
+            elements = sorted(list(c.elements))
+            text += f'\n{c.order}\t{c.element_num}\t{elements}'
+        return text
+
+    @staticmethod
+    def conjugacy_count(group, conj_count: 'ConjugacyCount') -> str:
+        return (
+            f'{group.name} の共役類のカウント：\n'+
+            "(位数, 要素数, 重複度)の一覧\n"+
+            f'{conj_count}'
+            )
+
+    @staticmethod
+    def isomorphic(group, symbol: str) -> str:
+        return f'{group.name} の群同型： {symbol}\n'
+
+    @staticmethod
+    def is_abelian(group, is_abelian: bool) -> str:
+        result = "可換群" if is_abelian else "非可換群"
+        return f'{group.name} は {result} である。\n'
+
+    @staticmethod
+    def is_perfect(group, is_perfect: bool) -> str:
+        result = "完全群" if is_perfect else "不完全群"
+        return f'{group.name} は {result} である。\n'
+
+    @staticmethod
+    def is_simple(group, is_simple: bool) -> str:
+        result = "ある" if is_simple else "ない"
+        return f'{group.name} は 単純群で{result}。\n'
+
+    @staticmethod
+    def is_solvable(group, is_solvable: bool) -> str:
+        result = "可解群" if is_solvable else "非可解群"
+        return f'{group.name} は {result} である。\n'
+
+    @classmethod
+    def center(cls, group, center) -> str:
+        return f'{group.name} の中心：\n' + cls._group_table((center,))
+
+    @classmethod
+    def centralizer(cls, group, centralizer, maximal) -> str:
+        return (f'{maximal.name} における {group.name} の中心化群：\n'
+                + cls._group_table((centralizer,)))
+
+    @classmethod
+    def derived(cls, group, derived) -> str:
+        return f'{group.name} の導来部分群：\n' + cls._group_table((derived,))
+
+    @classmethod
+    def derived_series(cls, group, series: 'tuple[Group]') -> str:
+        return f'{group.name} の導来列の一覧：\n' + cls._group_table(series)
+
+    @staticmethod
+    def normal_subgroups(group, normals: 'tuple[Group]') -> str:
+        text = (
+            f'{group.name} の正規部分群の一覧：\n'+
+            "Name\tOrder\tIsAbelian\t\tIsomorphic"
+            )
+        for g in normals:
+            is_abelian = 'Abelian'if g.is_abelian else 'non'
+            text += f'\n{g.name}\t{g.order}\t{is_abelian}\t\t{g.isomorphic}'
+        return text
+
+    @classmethod
+    def normalizer(cls, group, normalizer, maximal) -> str:
+        return (f'{maximal.name} における {group.name} の正規化群：\n'
+                + cls._group_table((normalizer,)))
+
+    @classmethod
+    def group_list(cls, groups: 'tuple[Group]') -> str:
+        """
+        作成された群の一覧。
+        """
+        return "作成された群の一覧：\n" + cls._group_table(groups)
+
+    @staticmethod
+    def direct_products(group, direct_list: 'tuple[DirectProduct]') -> str:
+        text = (
+            f'{group.name} の直積への分解：\n'+
+            "(\'x\' means \'\\times\')\n"+
+            "Name(Order)"
+            )
+        if not direct_list:
+            return text + "\n分解なし"
+        for data in direct_list:
+            left = data.left
+            right = data.right
+            text += (
+                f'\n{left.name}({left.order}) x {right.name}({right.order})'+
+                f'\t<==> ( {left.isomorphic} ) x ( {right.isomorphic} )'
+                )
+        return text
+
+    @staticmethod
+    def semidirect_products(group, semi_list: 'tuple[SemidirectProduct]'
+                            ) -> str:
+        text = (
+            f'{group.name} の半直積への分解：\n'+
+            "(\'r\' means \'\\rtimes\')\n"+
+            "Name(Order)"
+            )
+        if not semi_list:
+            return text + "\n分解なし"
+        for data in semi_list:
+            left = data.left
+            right = data.right
+            text += (
+                f'\n{left.name}({left.order}) r {right.name}({right.order})'+
+                f'\t<==> ( {left.isomorphic} ) r ( {right.isomorphic} )')
+        return text
+
+    @classmethod
+    def decompositions(cls, group, direct_list: 'tuple[DirectProduct]',
+                       semi_list: 'tuple[SemidirectProduct]') -> str:
+        text = f'{group.name} の分解：\n'
+        text += cls.direct_products(group, direct_list)
+        text += "\n\n"
+        text += cls.semidirect_products(group, semi_list)
+        return text
+
+    @staticmethod
+    def _group_table(groups: 'tuple[Group]') -> str:
+        """
+        群の名前、位数、群同型の表。
+        """
+        text = "Name\tOrder\tIsomorphic"
+        for g in groups:
+            text += f'\n{g.name}\t{g.order}\t{g.isomorphic}'
+        return text
@@ -2,11 +2,14 @@
 名前の付けられた群の共役類の特性を記録する。
 """
 from ..calc.conjugacy import ConjugacyCount
+from ..calc.fingerprint import calc_digest
+from .gpres import NamedGroupPresentation as P
 
 class NamedGroup(object):
-    def __init__(self, name: str, data):
+    def __init__(self, name: str, data, presentation = None):
         self._name = name
         self._conjugacy_count = ConjugacyCount.create_from_data(data)
+        self._presentation = presentation
         order = 0
         for unit in self.conjugacy_count.count:
             order += unit.element_num * unit.degeneracy
@@ -24,10 +27,29 @@ class NamedGroup(object):
     def order(self):
         return self._order
     
+    @property
+    def presentation(self):
+        return self._presentation
+    
+    @property
+    def fingerprint_key(self) -> 'tuple[tuple[int]]':
+        """
+
+        Returns
+        -------
+        tuple[tuple[int]]
+            群同型の不変量のうち、共役類の特性から定まる部分のキー。
+            GroupFingerprint.class_key と比較する。
+
+        """
+        return self._conjugacy_count.key
+    
     def is_isomorpic_to_group(self, group) -> bool:
         """
         指定の群と同型であるか判定する。
-        conjugacy_countが一致すれば同型であると判定する。
+        conjugacy_countが一致し、かつ表示の関係式を満たす生成元の組が
+        指定の群の中に存在すれば同型であると判定する。
+        表示が登録されていない場合は、conjugacy_countの一致のみで判定する。
 
         Parameters
         ----------
@@ -43,7 +65,10 @@ class NamedGroup(object):
                 同型でない。
 
         """
-        return self.conjugacy_count.equal_to(group.conjugacy_count)
+        if group.order != self.order: return False
+        if self.fingerprint_key != group.fingerprint.class_key: return False
+        if self.presentation is None: return True
+        return self.presentation.is_isomorphic_to_group(group)
 
 class NamedGroupData(object):
     """
@@ -73,7 +98,80 @@ class NamedGroupData(object):
                 if order in cls._named_group_dict
                 else tuple())
     
-    # 非可換群の位数ごとの conjugacy_count
+    @classmethod
+    def groups_of_fingerprint(cls, fingerprint) -> 'tuple[NamedGroup]':
+        """
+        登録されている群から、指定の不変量を持つ群の一覧を取得する。
+        不変量のキーによる辞書の検索で求める。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        fingerprint : GroupFingerprint
+            群同型の不変量。
+
+        Returns
+        -------
+        tuple[NamedGroup]
+            指定の不変量を持つ群の一覧。
+            該当する群が登録されていない場合には、空のタプル。
+
+        """
+        if cls._fingerprint_dict is None:
+            cls._fingerprint_dict = cls._create_fingerprint_dict()
+        return cls._fingerprint_dict.get(fingerprint.class_key, tuple())
+    
+    @classmethod
+    def version(cls) -> int:
+        """
+        登録されている群の名前、共役類の特性、表示から作成したハッシュ値。
+        登録内容を変更すると値が変わるため、
+        登録内容に基づく記録が有効であるかの判定に用いる。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+
+        Returns
+        -------
+        int
+            ハッシュ値。
+
+        """
+        key = []
+        for order in sorted(cls._named_group_dict):
+            for group in cls._named_group_dict[order]:
+                p = group.presentation
+                key.append((group.name, order, group.fingerprint_key,
+                            None if p is None else
+                            (p.letters, p.orders, p.relators)))
+        return calc_digest(tuple(key))
+
+    @classmethod
+    def _create_fingerprint_dict(cls) -> dict:
+        """
+        不変量のキーから群の一覧を引く辞書を作成する。
+
+        Returns
+        -------
+        dict
+            不変量のキーをkeyとして、群のタプルをvalueとする辞書。
+
+        """
+        fingerprint_dict = dict()
+        for groups in cls._named_group_dict.values():
+            for group in groups:
+                key = group.fingerprint_key
+                fingerprint_dict[key] = fingerprint_dict.get(key, ()) + (group,)
+        return fingerprint_dict
+    
+    # 不変量のキーから群の一覧を引く辞書
+    # 初回の検索時にのみ作成される
+    _fingerprint_dict = None
+    
+    # 非可換群の位数ごとの conjugacy_count と表示
     # (確定)ならば, 非可換群ならば必ずいずれかと同型となる
     # (候補)ならば, 他の候補が存在する (分解など)
     _named_group_dict = dict()
@@ -81,21 +179,21 @@ class NamedGroupData(object):
     #### 6 -> (確定): D3
     D3 = ((1, 1, 1), (2, 3, 1), (3, 2, 1))
     _named_group_dict[6] = (
-        NamedGroup("D(3)",D3),
+        NamedGroup("D(3)",D3, P.D_n(3)),
         )
     
     #### 8 -> (確定): Q4, D4
     D4 = ((1, 1, 1), (2, 1, 1), (2, 2, 2), (4, 2, 1))
     Q4 = ((1, 1, 1), (2, 1, 1), (4, 2, 3))
     _named_group_dict[8] = (
-        NamedGroup("D(4)",D4),
-        NamedGroup("Q(4)",Q4),
+        NamedGroup("D(4)",D4, P.D_n(4)),
+        NamedGroup("Q(4)",Q4, P.Q_n(4)),
         )
     
     #### 10 -> (確定) D5
     D5 = ((1, 1, 1), (2, 5, 1), (5, 2, 2))
     _named_group_dict[10] = (
-        NamedGroup("D(5)",D5),
+        NamedGroup("D(5)",D5, P.D_n(5)),
         )
     
     #### 12 -> (確定): D6, Q6, A4
@@ -103,15 +201,15 @@ class NamedGroupData(object):
     Q6 = ((1, 1, 1), (2, 1, 1), (3, 2, 1), (4, 3, 2), (6, 2, 1))
     A4  = ((1, 1, 1), (2, 3, 1), (3, 4, 2))
     _named_group_dict[12] = (
-        NamedGroup("D(6)",D6),
-        NamedGroup("Q(6)",Q6),
-        NamedGroup("A(4)",A4),
+        NamedGroup("D(6)",D6, P.D_n(6)),
+        NamedGroup("Q(6)",Q6, P.Q_n(6)),
+        NamedGroup("A(4)",A4, P.A_4()),
         )
     
     #### 14 -> (確定): D7
     D7 = ((1, 1, 1), (2, 7, 1), (7, 2, 3))
     _named_group_dict[14] = (
-        NamedGroup("D(7)",D7),
+        NamedGroup("D(7)",D7, P.D_n(7)),
         )
     
     #### 16 -> (候補): D8, Q8, QD16
@@ -119,37 +217,37 @@ class NamedGroupData(object):
     Q8 = ((1, 1, 1), (2, 1, 1), (4, 2, 1), (4, 4, 2), (8, 2, 2))
     QD16 = ((1, 1, 1), (2, 1, 1), (2, 4, 1), (4, 2, 1), (4, 4, 1), (8, 2, 2))
     _named_group_dict[16] = (
-        NamedGroup("D(8)",D8),
-        NamedGroup("Q(8)",Q8),
-        NamedGroup("QD(16)",QD16),
+        NamedGroup("D(8)",D8, P.D_n(8)),
+        NamedGroup("Q(8)",Q8, P.Q_n(8)),
+        NamedGroup("QD(16)",QD16, P.QD_2n(8)),
         )
     
     #### 18 -> (候補): D9, Sigma18
     D9 = ((1, 1, 1), (2, 9, 1), (3, 2, 1), (9, 2, 3))
     Sigma18 = ((1, 1, 1), (2, 3, 1), (3, 1, 2), (3, 2, 3), (6, 3, 2))
     _named_group_dict[18] = (
-        NamedGroup("D(9)",D9),
-        NamedGroup("Sigma(18)",Sigma18),
+        NamedGroup("D(9)",D9, P.D_n(9)),
+        NamedGroup("Sigma(18)",Sigma18, P.Sigma_2n_2(3)),
         )
     
     #### 20 -> (候補): D10, Q10
     D10 = ((1, 1, 1), (2, 1, 1), (2, 5, 2), (5, 2, 2), (10, 2, 2))
     Q10 = ((1, 1, 1), (2, 1, 1), (4, 5, 2), (5, 2, 2), (10, 2, 2))
     _named_group_dict[20] = (
-        NamedGroup("D(10)",D10),
-        NamedGroup("Q(10)",Q10),
+        NamedGroup("D(10)",D10, P.D_n(10)),
+        NamedGroup("Q(10)",Q10, P.Q_n(10)),
         )
     
     #### 21 -> (候補): T7
     T7 = ((1, 1, 1), (3, 7, 2), (7, 3, 2))
     _named_group_dict[21] = (
-        NamedGroup("T(7)",T7),
+        NamedGroup("T(7)",T7, P.T_n(7)),
         )
     
     #### 22 -> (確定): D11
     D11 = ((1, 1, 1), (2, 11, 1), (11, 2, 5))
     _named_group_dict[22] = (
-        NamedGroup("D(11)",D11),
+        NamedGroup("D(11)",D11, P.D_n(11)),
         )
     
     #### 24 -> (候補): D12, Q12, S4, Tprime, Sigma24
@@ -161,37 +259,37 @@ class NamedGroupData(object):
     Tprime = ((1, 1, 1), (2, 1, 1), (3, 4, 2), (4, 6, 1), (6, 4, 2))
     Sigma24 = ((1, 1, 1), (2, 1, 1), (2, 3, 2), (3, 4, 2), (6, 4, 2))
     _named_group_dict[24] = (
-        NamedGroup("D(12)",D12),
-        NamedGroup("Q(12)",Q12),
-        NamedGroup("S(4)",S4),
-        NamedGroup("Tprime",Tprime),
-        NamedGroup("Sigma(24)",Sigma24),
+        NamedGroup("D(12)",D12, P.D_n(12)),
+        NamedGroup("Q(12)",Q12, P.Q_n(12)),
+        NamedGroup("S(4)",S4, P.S_n(4)),
+        NamedGroup("Tprime",Tprime, P.Tprime()),
+        NamedGroup("Sigma(24)",Sigma24, P.Sigma_24()),
         )
     
     #### 26 -> (確定): D13
     D13 = ((1, 1, 1), (2, 13, 1), (13, 2, 6))
     _named_group_dict[26] = (
-        NamedGroup("D(13)",D13),
+        NamedGroup("D(13)",D13, P.D_n(13)),
         )
     
     #### 27 -> (候補): Delta27
     Delta27 = ((1, 1, 1), (3, 1, 2), (3, 3, 8))
     _named_group_dict[27] = (
-        NamedGroup("Delta(27)",Delta27),
+        NamedGroup("Delta(27)",Delta27, P.Delta_3n_2(3)),
         )
 
     #### 28 -> (確定): D14, Q14
     D14 = ((1, 1, 1), (2, 1, 1), (2, 7, 2), (7, 2, 3), (14, 2, 3))
     Q14 = ((1, 1, 1), (2, 1, 1), (4, 7, 2), (7, 2, 3), (14, 2, 3))
     _named_group_dict[28] = (
-        NamedGroup("D(14)",D14),
-        NamedGroup("Q(14)",Q14),
+        NamedGroup("D(14)",D14, P.D_n(14)),
+        NamedGroup("Q(14)",Q14, P.Q_n(14)),
         )
     
     #### 30 -> (確定): D15
     D15 = ((1, 1, 1), (2, 15, 1), (3, 2, 1), (5, 2, 2), (15, 2, 4))
     _named_group_dict[30] = (
-        NamedGroup("D(15)",D15),
+        NamedGroup("D(15)",D15, P.D_n(15)),
         )
     
     ##### 32 -> (候補): D16, Q16, QD32, Sigma(32)
@@ -202,16 +300,16 @@ class NamedGroupData(object):
     Sigma32 = ((1, 1, 1), (2, 1, 1), (2, 2, 1), (2, 4, 1), (4, 1, 2), 
                (4, 2, 5), (4, 4, 1), (8, 4, 2))
     _named_group_dict[32] = (
-        NamedGroup("D(16)",D16),
-        NamedGroup("Q(16)",Q16),
-        NamedGroup("QD(32)",QD32),
-        NamedGroup("Sigma(32)",Sigma32),
+        NamedGroup("D(16)",D16, P.D_n(16)),
+        NamedGroup("Q(16)",Q16, P.Q_n(16)),
+        NamedGroup("QD(32)",QD32, P.QD_2n(16)),
+        NamedGroup("Sigma(32)",Sigma32, P.Sigma_2n_2(4)),
         )
     
     ##### 34 -> (確定): D17
     D17 = ((1, 1, 1), (2, 17, 1), (17, 2, 8))
     _named_group_dict[34] = (
-        NamedGroup("D(17)",D17),
+        NamedGroup("D(17)",D17, P.D_n(17)),
         )
     
     ##### 36 -> (候補): D18, Q18
@@ -220,20 +318,20 @@ class NamedGroupData(object):
     Q18 = ((1, 1, 1), (2, 1, 1), (3, 2, 1), (4, 9, 2), (6, 2, 1), 
            (9, 2, 3), (18, 2, 3))
     _named_group_dict[36] = (
-        NamedGroup("D(18)",D18),
-        NamedGroup("Q(18)",Q18),
+        NamedGroup("D(18)",D18, P.D_n(18)),
+        NamedGroup("Q(18)",Q18, P.Q_n(18)),
         )
 
     ##### 38 -> (確定): D19
     D19 = ((1, 1, 1), (2, 19, 1), (19, 2, 9))
     _named_group_dict[38] = (
-        NamedGroup("D(19)",D19),
+        NamedGroup("D(19)",D19, P.D_n(19)),
         )
     
     #### 39 -> (候補): T13
     T13 = ((1, 1, 1), (3, 13, 2), (13, 3, 4))
     _named_group_dict[39] = (
-        NamedGroup("T(13)",T13),
+        NamedGroup("T(13)",T13, P.T_n(13)),
         )    
     
     ##### 40 -> (候補) D20, Q20
@@ -242,28 +340,28 @@ class NamedGroupData(object):
     Q20 = ((1, 1, 1), (2, 1, 1), (4, 2, 1), (4, 10, 2), (5, 2, 2), 
            (10, 2, 2), (20, 2, 4))
     _named_group_dict[40] = (
-        NamedGroup("D(20)",D20),
-        NamedGroup("Q(20)",Q20),
+        NamedGroup("D(20)",D20, P.D_n(20)),
+        NamedGroup("Q(20)",Q20, P.Q_n(20)),
         )
     
     #### 42 -> (候補)D21
     D21 = ((1, 1, 1), (2, 21, 1), (3, 2, 1), (7, 2, 3), (21, 2, 6))
     _named_group_dict[42] = (
-        NamedGroup("D(21)",D21),
+        NamedGroup("D(21)",D21, P.D_n(21)),
         )
     
     #### 44 -> (候補) D22, Q22
     D22 = ((1, 1, 1), (2, 1, 1), (2, 11, 2), (11, 2, 5), (22, 2, 5))
     Q22 = ((1, 1, 1), (2, 1, 1), (4, 11, 2), (11, 2, 5), (22, 2, 5))
     _named_group_dict[44] = (
-        NamedGroup("D(22)",D22),
-        NamedGroup("Q(22)",Q22),
+        NamedGroup("D(22)",D22, P.D_n(22)),
+        NamedGroup("Q(22)",Q22, P.Q_n(22)),
         )
     
     #### 46 -> (確定): D23
     D23 = ((1, 1, 1), (2, 23, 1), (23, 2, 11))
     _named_group_dict[46] = (
-        NamedGroup("D(23)",D23),
+        NamedGroup("D(23)",D23, P.D_n(23)),
         )
     
     #### 48 -> (候補): D24, Q24, Delta48
@@ -273,40 +371,40 @@ class NamedGroupData(object):
            (6, 2, 1), (8, 2, 2), (12, 2, 2), (24, 2, 4))
     Delta48 = ((1, 1, 1), (2, 3, 1), (3, 16, 2), (4, 3, 4))
     _named_group_dict[48] = (
-        NamedGroup("D(24)",D24),
-        NamedGroup("Q(24)",Q24),
-        NamedGroup("Delta(48)",Delta48),
+        NamedGroup("D(24)",D24, P.D_n(24)),
+        NamedGroup("Q(24)",Q24, P.Q_n(24)),
+        NamedGroup("Delta(48)",Delta48, P.Delta_3n_2(4)),
         )
     
     #### 50 -> (候補): Sigma50
     Sigma50 = ((1, 1, 1), (2, 5, 1), (5, 1, 4), (5, 2, 10), (10, 5, 4))
     _named_group_dict[50] = (
-        NamedGroup("Sigma(50)",Sigma50),
+        NamedGroup("Sigma(50)",Sigma50, P.Sigma_2n_2(5)),
         )
     
     #### 54 -> (候補): Delta54
     Delta54 = ((1, 1, 1), (2, 9, 1), (3, 1, 2), (3, 6, 4), (6, 9, 2))
     _named_group_dict[54] = (
-        NamedGroup("Delta(54)",Delta54),
+        NamedGroup("Delta(54)",Delta54, P.Delta_6n_2(3)),
         )
     
     #### 57 -> (候補): T19
     T19 = ((1, 1, 1), (3, 19, 2), (19, 3, 6))
     _named_group_dict[57] = (
-        NamedGroup("T(19)",T19),
+        NamedGroup("T(19)",T19, P.T_n(19)),
         )    
     
     #### 60 -> (候補): A5
     A5 = ((1, 1, 1), (2, 15, 1), (3, 20, 1), (5, 12, 2))
     _named_group_dict[60] = (
-        NamedGroup("A(5)",A5),
+        NamedGroup("A(5)",A5, P.A_5()),
         )
     
     #### 64 -> (候補): QD64
     QD64 = ((1, 1, 1), (2, 1, 1), (2, 16, 1), (4, 2, 1), (4, 16, 1), 
             (8, 2, 2), (16, 2, 4), (32, 2, 8))
     _named_group_dict[64] = (
-        NamedGroup("QD(64)",QD64),
+        NamedGroup("QD(64)",QD64, P.QD_2n(32)),
         )
     
     #### 72 -> (候補): Sigma72
@@ -314,46 +412,46 @@ class NamedGroupData(object):
                (3, 2, 3), (4, 6, 1), (6, 1, 2), (6, 2, 11), (6, 6, 2), 
                (12, 6, 2))
     _named_group_dict[72] = (
-        NamedGroup("Sigma(72)",Sigma72),
+        NamedGroup("Sigma(72)",Sigma72, P.Sigma_2n_2(6)),
         )
 
     #### 75 -> (候補): Delta75
     Delta75 = ((1, 1, 1), (3, 25, 2), (5, 3, 8))
     _named_group_dict[75] = (
-        NamedGroup("Delta(75)",Delta75),
+        NamedGroup("Delta(75)",Delta75, P.Delta_3n_2(5)),
         )
     
     #### 81 -> (候補): Sigma81
     Sigma81 = ((1, 1, 1), (3, 1, 2), (3, 3, 8), (3, 9, 2), (9, 9, 4))
     _named_group_dict[81] = (
-        NamedGroup("Sigma(81)",Sigma81),
+        NamedGroup("Sigma(81)",Sigma81, P.Sigma_3n_3(3)),
         )
     
     #### 96 -> (候補): Delta96
     Delta96 = ((1, 1, 1), (2, 3, 1), (2, 12, 1), (3, 32, 1), (4, 3, 2), 
                (4, 6, 1), (4, 12, 1), (8, 12, 2))
     _named_group_dict[96] = (
-        NamedGroup("Delta(96)",Delta96),
+        NamedGroup("Delta(96)",Delta96, P.Delta_6n_2(4)),
         )
     
     #### 98 -> (候補): Sigma98
     Sigma98 = ((1, 1, 1), (2, 7, 1), (7, 1, 6), (7, 2, 21), (14, 7, 6))
     _named_group_dict[98] = (
-        NamedGroup("Sigma(98)",Sigma98),
+        NamedGroup("Sigma(98)",Sigma98, P.Sigma_2n_2(7)),
         )
     
     #### 108 -> (候補): Delta108
     Delta108 = ((1, 1, 1), (2, 3, 1), (3, 1, 2), (3, 3, 2), (3, 12, 6), 
                (6, 3, 8))
     _named_group_dict[108] = (
-        NamedGroup("Delta(108)",Delta108),
+        NamedGroup("Delta(108)",Delta108, P.Delta_3n_2(6)),
         )
     
     #### 120 -> (候補): S5
     S5 = ((1, 1, 1), (2, 10, 1), (2, 15, 1), (3, 20, 1), 
           (4, 30, 1), (5, 24, 1), (6, 20, 1))
     _named_group_dict[120] = (
-        NamedGroup("S(5)",S5),
+        NamedGroup("S(5)",S5, P.S_n(5)),
         )
     
     #### 128 -> (候補): QD128, Sigma128
@@ -363,28 +461,28 @@ class NamedGroupData(object):
                 (4, 2, 5), (4, 8, 1), (8, 1, 4), (8, 2, 22), (8, 8, 2), 
                 (16, 8, 4))
     _named_group_dict[128] = (
-        NamedGroup("QD(128)",QD128),
-        NamedGroup("Sigma(128)",Sigma128),
+        NamedGroup("QD(128)",QD128, P.QD_2n(64)),
+        NamedGroup("Sigma(128)",Sigma128, P.Sigma_2n_2(8)),
         )
         
     #### 147 -> (候補): Delta147
     Delta147 = ((1, 1, 1), (3, 49, 2), (7, 3, 16))
     _named_group_dict[147] = (
-        NamedGroup("Delta(147)",Delta147),
+        NamedGroup("Delta(147)",Delta147, P.Delta_3n_2(7)),
         )
     
     #### 150 -> (候補): Delta150
     Delta150 = ((1, 1, 1), (2, 15, 1), (3, 50, 1), (5, 3, 4), 
                 (5, 6, 2), (10, 15, 4))
     _named_group_dict[150] = (
-        NamedGroup("Delta(150)",Delta150),
+        NamedGroup("Delta(150)",Delta150, P.Delta_6n_2(5)),
         )
     
     #### 162 -> (候補): Sigma162
     Sigma162 = ((1, 1, 1), (2, 9, 1), (3, 1, 2), (3, 2, 3), (6, 9, 2), 
                 (9, 1, 6), (9, 2, 33), (18, 9, 6))
     _named_group_dict[162] = (
-        NamedGroup("Sigma(162)",Sigma162),
+        NamedGroup("Sigma(162)",Sigma162, P.Sigma_2n_2(9)),
         )
 
     #### 192 -> (候補): Delta192, Sigma192
@@ -392,8 +490,8 @@ class NamedGroupData(object):
     Sigma192 =((1, 1, 1), (2, 1, 1), (2, 3, 2), (3, 16, 2), (4, 1, 2), 
                (4, 3, 18), (6, 16, 2), (12, 16, 4))
     _named_group_dict[192] = (
-        NamedGroup("Delta(192)",Delta192),
-        NamedGroup("Sigma(192)",Sigma192),
+        NamedGroup("Delta(192)",Delta192, P.Delta_3n_2(8)),
+        NamedGroup("Sigma(192)",Sigma192, P.Sigma_3n_3(4)),
         )
     
     #### 200 -> (候補): Sigma200
@@ -401,7 +499,7 @@ class NamedGroupData(object):
                 (5, 1, 4), (5, 2, 10), (10, 1, 4), (10, 2, 34), 
                 (10, 10, 4), (20, 10, 4))
     _named_group_dict[200] = (
-        NamedGroup("Sigma(200)",Sigma200),
+        NamedGroup("Sigma(200)",Sigma200, P.Sigma_2n_2(10)),
         )
     
     ### 216 -> (候補): Delta216
@@ -409,20 +507,20 @@ class NamedGroupData(object):
                 (3, 24, 3), (4, 18, 1), (6, 3, 2), (6, 6, 3), (6, 18, 2), 
                 (12, 18, 2))
     _named_group_dict[216] = (
-        NamedGroup("Delta(216)",Delta216),
+        NamedGroup("Delta(216)",Delta216, P.Delta_6n_2(6)),
         )
     
     #### 256 -> (候補): QD256
     QD256 = ((1, 1, 1), (2, 1, 1), (2, 64, 1), (4, 2, 1), (4, 64, 1), 
              (8, 2, 2), (16, 2, 4), (32, 2, 8), (64, 2, 16), (128, 2, 32))
     _named_group_dict[256] = (
-        NamedGroup("QD(256)",QD256),
+        NamedGroup("QD(256)",QD256, P.QD_2n(128)),
         )
     
     #### 360 -> (候補): A6
     A6 = ((1, 1, 1), (2, 45, 1), (3, 40, 2), (4, 90, 1), (5, 72, 2))
     _named_group_dict[360] = (
-        NamedGroup("A(6)",A6),
+        NamedGroup("A(6)",A6, P.A_6()),
         )
 
     #### 384 -> (候補): Delta384
@@ -430,12 +528,12 @@ class NamedGroupData(object):
                 (4, 6, 1), (4, 24, 1), (8, 3, 4), (8, 6, 6), (8, 24, 2), 
                 (16, 24, 4))
     _named_group_dict[384] = (
-        NamedGroup("Delta(384)",Delta384),
+        NamedGroup("Delta(384)",Delta384, P.Delta_6n_2(8)),
         )
 
     #### 720 -> (候補): S6
     S6 = ((1, 1, 1), (2, 15, 2), (2, 45, 1), (3, 40, 2), 
           (4, 90, 2), (5, 144, 1), (6, 120, 2))
     _named_group_dict[720] = (
-        NamedGroup("S(6)",S6),
+        NamedGroup("S(6)",S6, P.S_n(6)),
         )
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+群同型の不変量のデータベースを扱う。
+データベースは gdb_build.py で事前に作成しておく。
+"""
+import os
+import numpy
+from ..calc.fingerprint import calc_digest
+
+# データベースの各行の形式
+# digest: 不変量のハッシュ値（昇順に並ぶ）
+# order : 群の位数
+# name  : 群の名前
+DATABASE_DTYPE = numpy.dtype([("digest", "<u8"), ("order", "<u4"),
+                              ("name", "<U48")])
+
+# データベースの既定の保存先
+DEFAULT_DATABASE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "groupdb.npy")
+
+class GroupDatabase(object):
+    """
+    ディスク上に保存された群同型の不変量のデータベースを扱うクラス。
+    初回の検索時にメモリマップとして読み込み、二分探索で検索する。
+    ファイル全体をメモリに展開しないため、大きなデータベースでも
+    読み込みの時間はかからない。
+
+    """
+    # データベースのファイルパス
+    path = DEFAULT_DATABASE_PATH
+    # 読み込まれたデータベース
+    # 初回の検索時にのみ読み込まれる
+    _database = None
+    # データベースの内容のハッシュ値
+    # 初回の呼び出し時にのみ計算される
+    _version = None
+
+    @classmethod
+    def find(cls, fingerprint) -> 'tuple[str]':
+        """
+        指定の不変量を持つ群の名前の一覧を取得する。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        fingerprint : GroupFingerprint
+            群同型の不変量。
+
+        Returns
+        -------
+        tuple[str]
+            群の名前の一覧。
+            該当する群が存在しない場合には、空のタプル。
+
+        """
+        database = cls._load()
+        if len(database) == 0: return tuple()
+        digests = database["digest"]
+        digest = numpy.uint64(fingerprint.digest)
+        first = numpy.searchsorted(digests, digest, side="left")
+        last = numpy.searchsorted(digests, digest, side="right")
+        return tuple(str(row["name"]) for row in database[first:last]
+                     if row["order"] == fingerprint.order)
+
+    @classmethod
+    def reload(cls, path: str = None):
+        """
+        データベースを読み込み直す。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+        path : str, optional
+            データベースのファイルパス。
+            Noneならば現在のファイルパスを用いる。
+            The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        if path is not None: cls.path = path
+        cls._database = None
+        cls._version = None
+
+    @classmethod
+    def version(cls) -> int:
+        """
+        データベースの内容のハッシュ値。
+        データベースを作成し直すと値が変わるため、
+        データベースに基づく記録が有効であるかの判定に用いる。
+
+        Parameters
+        ----------
+        cls : TYPE
+            DESCRIPTION.
+
+        Returns
+        -------
+        int
+            ハッシュ値。
+
+        """
+        if cls._version is None:
+            database = cls._load()
+            cls._version = calc_digest(tuple(
+                (int(row["digest"]), int(row["order"]), str(row["name"]))
+                for row in database))
+        return cls._version
+
+    @classmethod
+    def _load(cls) -> numpy.ndarray:
+        """
+        データベースをメモリマップとして読み込む。
+        ファイルが存在しない場合には空のデータベースとする。
+        """
+        if cls._database is None:
+            if os.path.exists(cls.path):
+                cls._database = numpy.load(cls.path, mmap_mode="r")
+            else:
+                cls._database = numpy.zeros(0, dtype=DATABASE_DTYPE)
+        return cls._database
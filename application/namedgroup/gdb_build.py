@@ -0,0 +1,206 @@
+"""
+群同型の不変量のデータベースを作成するスクリプト。
+NamedGroupGenerator の各群と、それらと可換群との直積などを実際に生成し、
+不変量のハッシュ値を位数ごとに記録する。
+
+使用例（リポジトリの最上位のディレクトリで実行する）:
+    python -m application.namedgroup.gdb_build --max-order 512 --exclude 256
+"""
+import argparse
+import itertools
+import math
+import numpy
+from ..controller import ConsoleController
+from ..calc import matcal
+from ..calc.calctools import prime_factorize
+from ..calc.group import MasterGroup
+from .ggen import NamedGroupGenerator as G
+from .gdb import DATABASE_DTYPE, DEFAULT_DATABASE_PATH
+
+def named_families(max_order: int) -> 'list[tuple]':
+    """
+    名前の付けられた非可換群の一覧を作成する。
+    同型な群が異なる名前で複数含まれる場合がある。
+
+    Parameters
+    ----------
+    max_order : int
+        位数の最大値。
+
+    Returns
+    -------
+    'list[tuple]'
+        (名前, 位数, 生成元のリスト) の一覧。
+
+    """
+    families = []
+    def add(name, order, generators):
+        if order <= max_order: families.append((name, order, generators))
+    for n in range(3, max_order//2 + 1):
+        add(f'D({n})', 2*n, lambda n=n: G.D_n(n))
+    for n in range(4, max_order//2 + 1, 2):
+        add(f'Q({n})', 2*n, lambda n=n: G.Q_n(n))
+    n = 8
+    while 2*n <= max_order:
+        add(f'QD({2*n})', 2*n, lambda n=n: G.QD_2n(n))
+        n *= 2
+    for n in range(3, 7):
+        add(f'S({n})', math.factorial(n), lambda n=n: G.S_n(n))
+    for n in range(4, 7):
+        add(f'A({n})', math.factorial(n)//2, lambda n=n: G.A_n(n))
+    add("Tprime", 24, G.Tprime)
+    for n in range(7, max_order//3 + 1):
+        if any(pow(r,3,n) == 1 for r in range(2,n)):
+            add(f'T({n})', 3*n, lambda n=n: G.T_n(n))
+    for n in range(2, max_order):
+        add(f'Sigma({3*n**3})', 3*n**3, lambda n=n: G.Sigma_3n_3(n))
+        if n < 3: continue
+        add(f'Sigma({2*n**2})', 2*n**2, lambda n=n: G.Sigma_2n_2(n))
+        add(f'Delta({3*n**2})', 3*n**2, lambda n=n: G.Delta_3n_2(n))
+        add(f'Delta({6*n**2})', 6*n**2, lambda n=n: G.Delta_6n_2(n))
+    return sorted(families, key=lambda f: f[1])
+
+def abelian_groups(order: int) -> 'list[tuple[int]]':
+    """
+    指定の位数の可換群を、素数冪の位数の巡回群の位数の組として列挙する。
+
+    Parameters
+    ----------
+    order : int
+        位数。
+
+    Returns
+    -------
+    'list[tuple[int]]'
+        巡回群の位数の組の一覧。各組は昇順に並ぶ。
+
+    """
+    factors_per_prime = []
+    for (prime, power) in sorted(prime_factorize(order).items()):
+        factors_per_prime.append([tuple(prime**k for k in partition)
+                                  for partition in _partitions(power)])
+    return [tuple(sorted(sum(factors, ())))
+            for factors in itertools.product(*factors_per_prime)]
+
+def product_families(families: 'list[tuple]', max_order: int
+                     ) -> 'list[tuple]':
+    """
+    名前の付けられた非可換群と、可換群または非可換群との直積の一覧を作成する。
+
+    Parameters
+    ----------
+    families : 'list[tuple]'
+        名前の付けられた非可換群の一覧。
+    max_order : int
+        位数の最大値。
+
+    Returns
+    -------
+    'list[tuple]'
+        (名前, 位数, 生成元のリスト) の一覧。
+
+    """
+    products = []
+    for (name, order, generators) in families:
+        for m in range(2, max_order//order + 1):
+            for cyclic in abelian_groups(m):
+                symbol = " × ".join(f'Z({k})' for k in cyclic)
+                products.append((
+                    f'{name} × {symbol}', order*m,
+                    lambda g=generators, c=cyclic: _direct_sum(
+                        g(), [numpy.diag([numpy.exp(2j*numpy.pi/k)])
+                              for k in c])))
+    for ((name1, order1, gen1), (name2, order2, gen2)) in \
+            itertools.combinations_with_replacement(families, 2):
+        if order1 * order2 > max_order: continue
+        products.append((f'{name2} × {name1}', order1*order2,
+                         lambda g1=gen1, g2=gen2: _direct_sum(g2(), g1())))
+    return sorted(products, key=lambda f: f[1])
+
+def build_database(max_order: int, exclude: 'set[int]', path: str,
+                   controller = None):
+    """
+    データベースを作成して保存する。
+    不変量が一致する群が複数ある場合には、全ての名前を記録する。
+    それらの群は同型であるとは限らないため、同定時に確かめる。
+
+    Parameters
+    ----------
+    max_order : int
+        位数の最大値。
+    exclude : 'set[int]'
+        データベースに含めない位数の一覧。
+    path : str
+        保存先のファイルパス。
+    controller : Controller, optional
+        コントローラー。
+        The default is None.
+
+    Returns
+    -------
+    None.
+
+    """
+    ctrl = controller if controller is not None else ConsoleController()
+    families = named_families(max_order)
+    entries = families + product_families(families, max_order)
+    entries = [e for e in entries if e[1] not in exclude]
+    # ハッシュ値 -> [(位数, 名前)]
+    records = dict()
+    for (i, (name, order, generators)) in enumerate(entries):
+        ctrl.message(f'[{i+1}/{len(entries)}] {name} (位数 {order})')
+        result = matcal.generate_group(generators(), 0.0001, order)
+        if not result.has_value or len(result.value) != order:
+            ctrl.message(f'-- 生成失敗のため除外: {name}')
+            continue
+        result = matcal.calc_cayleytable(result.value, 0.0001)
+        fingerprint = MasterGroup(result.value).maximal_group.fingerprint
+        records.setdefault(fingerprint.digest, []).append((order, name))
+    rows = [(digest, order, name) for digest in sorted(records)
+            for (order, name) in records[digest]]
+    database = numpy.array(rows, dtype=DATABASE_DTYPE)
+    numpy.save(path, database)
+    ctrl.message(f'{len(database)}件の群（{len(records)}種類の不変量）を'
+                 f' {path} に保存しました。')
+
+def _direct_sum(gens1: 'list[numpy.ndarray]', gens2: 'list[numpy.ndarray]'
+                ) -> 'list[numpy.ndarray]':
+    """
+    二つの群の生成元から、直積の生成元をブロック対角行列として作成する。
+    """
+    d1 = gens1[0].shape[0]
+    d2 = gens2[0].shape[0]
+    result = []
+    for g in gens1:
+        mat = numpy.identity(d1+d2, dtype=complex)
+        mat[:d1,:d1] = g
+        result.append(mat)
+    for g in gens2:
+        mat = numpy.identity(d1+d2, dtype=complex)
+        mat[d1:,d1:] = g
+        result.append(mat)
+    return result
+
+def _partitions(n: int, largest: int = None) -> 'list[tuple[int]]':
+    """
+    自然数の分割を列挙する。
+    """
+    largest = n if largest is None else largest
+    if n == 0: return [()]
+    return [(k,) + rest for k in range(min(n, largest), 0, -1)
+            for rest in _partitions(n-k, k)]
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(
+        description="群同型の不変量のデータベースを作成する。")
+    parser.add_argument("--max-order", type=int, default=512,
+                        help="データベースに含める群の位数の最大値")
+    parser.add_argument("--exclude", type=int, nargs="*", default=[256],
+                        help="データベースに含めない位数")
+    parser.add_argument("--output", default=DEFAULT_DATABASE_PATH,
+                        help="保存先のファイルパス")
+    args = parser.parse_args(argv)
+    build_database(args.max_order, set(args.exclude), args.output)
+
+if __name__ == '__main__':
+    main()
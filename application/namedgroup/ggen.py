@@ -31,7 +31,7 @@ class NamedGroupGenerator(object):
         """
         generators = []
         for i1 in range(n-1):
-            gen = numpy.zeros((n,n),dtype=numpy.int)
+            gen = numpy.zeros((n,n),dtype=int)
             for i2 in range(n):
                 if i2 == i1:
                     gen[i2,i2+1] = 1
@@ -208,41 +208,97 @@ class NamedGroupGenerator(object):
                             [0,0,1]]) 
         return [gen1,gen2,gen3]
     
-    # 本を確認せよ
-    # gen2 を手動で変更する必要有り
-    # （今は n = 19 の場合の値） 
-    # @staticmethod
-    # def T_n(n: int) -> 'list[numpy.ndarray]':
-    #     """
-    #     Class:  (),
-
-    #     Name: T(n),
-
-    #     Order: 3n,
-
-    #     Generators: 2,
-
-    #     Matrix dim.: 3.
-
-    #     Parameters
-    #     ----------
-    #     n : int
-    #         n = 7,13,19,31,43,49,....
-
-    #     Returns
-    #     -------
-    #     list:
-    #         Generators of the group.
-
-    #     """
-    #     p = numpy.exp(2*numpy.pi*1j / float(n))
-    #     gen1 = numpy.array([[0,1,0],
-    #                         [0,0,1],
-    #                         [1,0,0]])
-    #     gen2 = numpy.array([[p,0,0],
-    #                         [0,p**7,0],
-    #                         [0,0,p**11]])
-    #     return [gen1,gen2]
+    @staticmethod
+    def T_n(n: int) -> 'list[numpy.ndarray]':
+        """
+        Class:  (),
+
+        Name: T(n),
+
+        Order: 3n,
+
+        Generators: 2,
+
+        Matrix dim.: 3.
+
+        Parameters
+        ----------
+        n : int
+            n = 7,13,19,31,43,49,....
+
+        Returns
+        -------
+        list:
+            Generators of the group.
+
+        """
+        # r^3 = 1 (mod n) となる 1 でない最小の r
+        r = next(r for r in range(2,n) if pow(r,3,n) == 1)
+        p = numpy.exp(2*numpy.pi*1j / float(n))
+        gen1 = numpy.array([[0,1,0],
+                            [0,0,1],
+                            [1,0,0]])
+        gen2 = numpy.array([[p,0,0],
+                            [0,p**r,0],
+                            [0,0,p**(r*r)]])
+        return [gen1,gen2]
+
+    @staticmethod
+    def A_n(n: int) -> 'list[numpy.ndarray]':
+        """
+        Class: alternating group (交代群),
+
+        Name: A(n),
+
+        Order: n!/2,
+
+        Generators: n-2,
+
+        Matrix dim.: n.
+
+        Parameters
+        ----------
+        n : int
+            n > 2.
+
+        Returns
+        -------
+        list:
+            Generators of the group.
+
+        """
+        # 巡回置換 (0 1 i) を生成元とする
+        generators = []
+        for i in range(2,n):
+            gen = numpy.identity(n,dtype=int)
+            gen[:,[0,1,i]] = gen[:,[1,i,0]]
+            generators.append(gen)
+        return generators
+
+    @staticmethod
+    def Tprime() -> 'list[numpy.ndarray]':
+        """
+        Class: binary tetrahedral group (),
+
+        Name: Tprime,
+
+        Order: 24,
+
+        Generators: 2,
+
+        Matrix dim.: 2.
+
+        Returns
+        -------
+        list:
+            Generators of the group.
+
+        """
+        gen1 = numpy.array([[1j,0],
+                            [0,-1j]])
+        gen2 = numpy.array([[1+1j,1+1j],
+                            [-1+1j,1-1j]]) / 2
+        return [gen1,gen2]
 
     @staticmethod
     def Sigma_3n_3(n: int) -> 'list[numpy.ndarray]':
@@ -0,0 +1,416 @@
+"""
+名前の付けられた群の表示（生成元と基本関係式）を記録する。
+"""
+import re
+from ..calc.presentation import GroupPresentation
+
+class NamedGroupPresentation(object):
+    """
+    名前の付けられた群の表示を作成するクラス。
+    NamedGroupGenerator の各群に対応する。
+
+    """
+    @staticmethod
+    def S_n(n: int) -> 'GroupPresentation':
+        """
+        Class: symmetric group (対称群),
+
+        Name: S(n),
+
+        Order: n!,
+
+        Generators: n-1 (Coxeter generators).
+
+        Parameters
+        ----------
+        n : int
+            2 < n < 27.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        letters = "abcdefghijklmnopqrstuvwxyz"[:n-1]
+        relators = []
+        for (i1, x) in enumerate(letters):
+            relators.append(f'{x}^2')
+            for (i2, y) in enumerate(letters[:i1]):
+                relators.append(f'({y}{x})^3' if i1 - i2 == 1
+                                else f'({y}{x})^2')
+        return GroupPresentation(letters, (2,)*(n-1), relators)
+
+    @staticmethod
+    def A_4() -> 'GroupPresentation':
+        """
+        Class: alternating group (交代群),
+
+        Name: A(4),
+
+        Order: 12,
+
+        Generators: 2.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation("ab", (2, 3), ("a^2", "b^3", "(ab)^3"))
+
+    @staticmethod
+    def A_5() -> 'GroupPresentation':
+        """
+        Class: alternating group (交代群),
+
+        Name: A(5),
+
+        Order: 60,
+
+        Generators: 2.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation("ab", (2, 3), ("a^2", "b^3", "(ab)^5"))
+
+    @staticmethod
+    def A_6() -> 'GroupPresentation':
+        """
+        Class: alternating group (交代群),
+
+        Name: A(6),
+
+        Order: 360,
+
+        Generators: 2.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation(
+            "ab", (2, 4), ("a^2", "b^4", "(ab)^5", "(ab^2)^5"))
+
+    @staticmethod
+    def D_n(n: int) -> 'GroupPresentation':
+        """
+        Class: dihedral group (二面体群),
+
+        Name: D(n),
+
+        Order: 2n,
+
+        Generators: 2.
+
+        Parameters
+        ----------
+        n : int
+            n > 2.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation("ab", (n, 2), (f'a^{n}', "b^2", "(ab)^2"))
+
+    @staticmethod
+    def Q_n(n: int) -> 'GroupPresentation':
+        """
+        Class: binary dihedral group (),
+
+        Name: Q(n),
+
+        Order: 2n,
+
+        Generators: 2.
+
+        Parameters
+        ----------
+        n : int
+            n > 2, even.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        m = n // 2
+        return GroupPresentation(
+            "ab", (n, 4), (f'a^{n}', f'b^2a^-{m}', "Baba"))
+
+    @staticmethod
+    def QD_2n(n: int) -> 'GroupPresentation':
+        """
+        Class:  (),
+
+        Name: QD(2n),
+
+        Order: 2n,
+
+        Generators: 2.
+
+        Parameters
+        ----------
+        n : int
+            n = 2^k, (k = 3,4,...).
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        r = n // 2 - 1
+        return GroupPresentation(
+            "ab", (n, 2), (f'a^{n}', "b^2", f'baba^-{r}'))
+
+    @staticmethod
+    def T_n(n: int) -> 'GroupPresentation':
+        """
+        Class:  (),
+
+        Name: T(n),
+
+        Order: 3n,
+
+        Generators: 2.
+
+        Parameters
+        ----------
+        n : int
+            n = 7,13,19,31,43,49,....
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        # r^3 = 1 (mod n) となる 1 でない最小の r
+        r = next(r for r in range(2,n) if pow(r,3,n) == 1)
+        return GroupPresentation(
+            "ab", (n, 3), (f'a^{n}', "b^3", f'baBa^-{r}'))
+
+    @staticmethod
+    def Tprime() -> 'GroupPresentation':
+        """
+        Class: binary tetrahedral group (),
+
+        Name: Tprime,
+
+        Order: 24,
+
+        Generators: 2.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation(
+            "ab", (6, 6), ("(ab)^2a^-3", "a^3b^-3"))
+
+    @staticmethod
+    def Sigma_24() -> 'GroupPresentation':
+        """
+        Class:  (),
+
+        Name: Sigma(24),
+
+        Order: 24,
+
+        Generators: 3.
+
+        Sigma(24) = Z(2) × A(4).
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation(
+            "abz", (2, 3, 2),
+            ("a^2", "b^3", "(ab)^3", "z^2", "zaZA", "zbZB"))
+
+    @staticmethod
+    def Sigma_2n_2(n: int) -> 'GroupPresentation':
+        """
+        Class:  (),
+
+        Name: Sigma(2n^2),
+
+        Order: 2n^2,
+
+        Generators: 2.
+
+        Sigma(2n^2) = (Z(n) × Z(n)) ⋊ Z(2).
+
+        Parameters
+        ----------
+        n : int
+            n > 2.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation(
+            "ac", (n, 2), (f'a^{n}', "c^2", "acaCAcAC"))
+
+    @staticmethod
+    def Delta_3n_2(n: int) -> 'GroupPresentation':
+        """
+        Class:  (),
+
+        Name: Delta(3n^2),
+
+        Order: 3n^2,
+
+        Generators: 2.
+
+        Delta(3n^2) = (Z(n) × Z(n)) ⋊ Z(3).
+
+        Parameters
+        ----------
+        n : int
+            n > 2.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation(
+            "ac", (n, 3), (f'a^{n}', "c^3", "acaCAcAC", "c^2aC^2acaC"))
+
+    @staticmethod
+    def Sigma_3n_3(n: int) -> 'GroupPresentation':
+        """
+        Class:  (),
+
+        Name: Sigma(3n^3),
+
+        Order: 3n^3,
+
+        Generators: 2.
+
+        Sigma(3n^3) = (Z(n) × Z(n) × Z(n)) ⋊ Z(3).
+
+        Parameters
+        ----------
+        n : int
+            n > 2.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation(
+            "at", (n, 3), (f'a^{n}', "t^3", "ataTAtAT"))
+
+    @staticmethod
+    def Delta_6n_2(n: int) -> 'GroupPresentation':
+        """
+        Class:  (),
+
+        Name: Delta(6n^2),
+
+        Order: 6n^2,
+
+        Generators: 3.
+
+        Delta(6n^2) = (Z(n) × Z(n)) ⋊ S(3).
+
+        Parameters
+        ----------
+        n : int
+            n > 1.
+
+        Returns
+        -------
+        GroupPresentation:
+            Presentation of the group.
+
+        """
+        return GroupPresentation(
+            "acd", (n, 3, 2),
+            (f'a^{n}', "c^3", "d^2", "(cd)^2", "acaCAcAC", "c^2aC^2acaC",
+             "dada"))
+
+    @classmethod
+    def from_name(cls, name: str) -> 'tuple[tuple[int, GroupPresentation]]':
+        """
+        群の名前から、その群の位数と表示を求める。
+        gdb_build.py の named_families() と同じ形式の名前を扱う。
+        Sigma(648) のように異なる系列が同じ名前となる場合は、全ての候補を返す。
+
+        Parameters
+        ----------
+        name : str
+            群の名前。"D(4)", "Sigma(24)", "Tprime" など。
+
+        Returns
+        -------
+        'tuple[tuple[int, GroupPresentation]]'
+            (位数, 表示) の一覧。
+            該当する系列がない場合には、空のタプル。
+
+        """
+        if name == "Tprime": return ((24, cls.Tprime()),)
+        match = re.fullmatch(r'([A-Za-z]+)\((\d+)\)', name)
+        if match is None: return tuple()
+        (family, m) = (match.group(1), int(match.group(2)))
+        result = []
+        if family == "D" and m > 2:
+            result.append((2*m, cls.D_n(m)))
+        elif family == "Q" and m > 2 and m % 2 == 0:
+            result.append((2*m, cls.Q_n(m)))
+        elif family == "QD" and m >= 16 and m & (m-1) == 0:
+            result.append((m, cls.QD_2n(m//2)))
+        elif family == "S" and 2 < m < 27:
+            order = 1
+            for k in range(2, m+1): order *= k
+            result.append((order, cls.S_n(m)))
+        elif family == "A" and m in (4, 5, 6):
+            result.append(({4: 12, 5: 60, 6: 360}[m],
+                           {4: cls.A_4, 5: cls.A_5, 6: cls.A_6}[m]()))
+        elif family == "T" and any(pow(r,3,m) == 1 for r in range(2,m)):
+            result.append((3*m, cls.T_n(m)))
+        elif family == "Sigma":
+            n = _integer_root(m, 3, 3)
+            if n == 2: result.append((m, cls.Sigma_24()))
+            if n is not None and n > 2: result.append((m, cls.Sigma_3n_3(n)))
+            n = _integer_root(m, 2, 2)
+            if n is not None and n > 2: result.append((m, cls.Sigma_2n_2(n)))
+        elif family == "Delta":
+            n = _integer_root(m, 3, 2)
+            if n is not None and n > 2: result.append((m, cls.Delta_3n_2(n)))
+            n = _integer_root(m, 6, 2)
+            if n is not None and n > 1: result.append((m, cls.Delta_6n_2(n)))
+        return tuple(result)
+
+def _integer_root(m: int, coefficient: int, power: int) -> int:
+    """
+    m = coefficient * n^power を満たす自然数 n を求める。存在しなければ None。
+    """
+    if m % coefficient != 0: return None
+    n = round((m // coefficient) ** (1 / power))
+    return n if coefficient * n**power == m else None
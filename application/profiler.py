@@ -0,0 +1,215 @@
+"""
+計算の所要時間や回数を記録するためのモジュール。
+コントローラーに Profiler を設定すると、時間のかかる計算の区間（スパン）と
+カウンターが記録され、JSON または Chrome のトレース形式で出力できる。
+
+使用例:
+    profiler = Profiler(track_memory=True)
+    ctrl = ConsoleController()
+    ctrl.profiler = profiler
+    result = matcal.generate_group(generators, 0.0001, 2000, ctrl)
+    profiler.save_chrome_trace("trace.json")
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+class Profiler(object):
+    """
+    名前付きのスパンの経過時間、CPU時間、メモリ使用量のピークと、
+    名前付きのカウンターを記録するクラス。
+    スパンは入れ子にでき、スレッドごとに記録する。
+
+    Parameters
+    ----------
+    track_memory : bool, optional
+        True ならば tracemalloc を用いてスパンごとのメモリ使用量のピークを記録する。
+        tracemalloc の計測により計算は遅くなる。
+        The default is False.
+
+    """
+    def __init__(self, track_memory: bool = False):
+        self._track_memory = track_memory
+        self._origin = time.perf_counter()
+        # 終了したスパンの一覧
+        self._spans = []
+        # カウンター名 -> 値
+        self._counters = dict()
+        # カウンターの変化の一覧。(時刻, 名前, 値)
+        self._counter_events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._peak_memory = 0
+        # この Profiler が tracemalloc を開始したか
+        self._started_tracing = False
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @property
+    def spans(self) -> 'list[dict]':
+        """
+        終了したスパンの一覧。終了した順に並ぶ。
+        各スパンは name, start, wall, cpu, depth, thread を持ち、
+        メモリを記録する場合は peak_memory も持つ。
+        時間の単位は秒で、start は Profiler の作成時からの経過時間。
+        """
+        with self._lock:
+            return list(self._spans)
+
+    @property
+    def counters(self) -> 'dict[str, int]':
+        with self._lock:
+            return dict(self._counters)
+
+    @property
+    def peak_memory(self) -> int:
+        """
+        記録したメモリ使用量のピーク（バイト）。記録しない場合は 0。
+        """
+        return self._peak_memory
+
+    def close(self):
+        """
+        メモリの記録を終了する。記録した内容は引き続き参照できる。
+        """
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+        self._track_memory = False
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        """
+        with 文の区間をスパンとして記録する。
+
+        Parameters
+        ----------
+        name : str
+            スパンの名前。
+
+        """
+        stack = self._stack()
+        if self._track_memory and tracemalloc.is_tracing():
+            # 親のスパンのここまでのピークを記録してから計測し直す
+            peak = tracemalloc.get_traced_memory()[1]
+            if stack: stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+        frame = {"peak": 0}
+        stack.append(frame)
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - cpu_start
+            stack.pop()
+            record = {"name": name, "start": start - self._origin,
+                      "wall": wall, "cpu": cpu, "depth": len(stack),
+                      "thread": threading.get_ident()}
+            if self._track_memory and tracemalloc.is_tracing():
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                if stack: stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+                tracemalloc.reset_peak()
+                record["peak_memory"] = peak
+                self._peak_memory = max(self._peak_memory, peak)
+            with self._lock:
+                self._spans.append(record)
+
+    def count(self, name: str, n: int = 1):
+        """
+        カウンターに加算する。
+
+        Parameters
+        ----------
+        name : str
+            カウンターの名前。
+        n : int, optional
+            加算する値。
+            The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self._lock:
+            value = self._counters.get(name, 0) + n
+            self._counters[name] = value
+            self._counter_events.append(
+                (time.perf_counter() - self._origin, name, value))
+
+    def summary(self) -> 'dict[str, dict]':
+        """
+        スパンの名前ごとの集計。
+
+        Returns
+        -------
+        'dict[str, dict]'
+            名前 -> {"calls", "wall", "cpu", "peak_memory"}。
+            wall, cpu は合計（秒）、peak_memory は最大値（バイト）。
+
+        """
+        result = dict()
+        for span in self.spans:
+            item = result.setdefault(span["name"], {
+                "calls": 0, "wall": 0.0, "cpu": 0.0, "peak_memory": 0})
+            item["calls"] += 1
+            item["wall"] += span["wall"]
+            item["cpu"] += span["cpu"]
+            item["peak_memory"] = max(item["peak_memory"],
+                                      span.get("peak_memory", 0))
+        return result
+
+    def to_dict(self) -> dict:
+        """
+        記録した内容を JSON に変換できる辞書として返す。
+        """
+        return {"spans": self.spans, "counters": self.counters,
+                "summary": self.summary(), "peak_memory": self._peak_memory}
+
+    def save_json(self, path: str):
+        """
+        記録した内容を JSON ファイルに保存する。
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+
+    def to_chrome_trace(self) -> dict:
+        """
+        記録した内容を Chrome のトレース形式（chrome://tracing, Perfetto）の
+        辞書として返す。スパンは完了イベント、カウンターはカウンターイベントとなる。
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            args = {"cpu_ms": span["cpu"] * 1e3}
+            if "peak_memory" in span: args["peak_memory"] = span["peak_memory"]
+            events.append({"name": span["name"], "ph": "X", "pid": pid,
+                           "tid": span["thread"], "ts": span["start"] * 1e6,
+                           "dur": span["wall"] * 1e6, "args": args})
+        with self._lock:
+            counter_events = list(self._counter_events)
+        for (t, name, value) in counter_events:
+            events.append({"name": name, "ph": "C", "pid": pid,
+                           "ts": t * 1e6, "args": {name: value}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: str):
+        """
+        記録した内容を Chrome のトレース形式のファイルに保存する。
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def _stack(self) -> list:
+        """
+        現在のスレッドで実行中のスパンのスタック。
+        """
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
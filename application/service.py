@@ -1,12 +1,18 @@
 """
 プログラム全体の処理を担う。
 """
+import os
 import traceback;
-from application.controller import ConsoleController
+from application.controller import ConsoleController, CancellationToken
 from application.calc import matcal
 from application.calc.group import MasterGroup
-from application.view import AppWindow
+from application.calc.identifier import IdentificationCache
+from application.calc.mastercache import MasterGroupCache
+from application.calc.session import GroupSession
+from application.analyzer import GroupAnalyzer
+from application.formatter import AnalysisFormatter
 from application.exceptions import GenerateGroupError
+from application.exceptions import CalculationCancelled, CalculationTimeout
 
 class AppServise(object):
     def _create_cmd_func_dict(self):
@@ -59,10 +65,30 @@ class AppServise(object):
     _errmsg_expr = "引数が不適切です。"
     _errmsg_exec = "プログラムエラー：実行時エラー"
     _errmsg_not_implemented = "プログラムエラー：未完成"
+    _errmsg_cancelled = "計算をキャンセルしました。"
+    _errmsg_timeout = "計算を中断しました："
    
-    def __init__(self, generators, zero_base, maximal):             
+    # 同定結果の保存ファイル名
+    _identification_cache_name = "identification.json"
+   
+    def __init__(self, generators, zero_base, maximal, cache_dir=None,
+                 controller=None, command_time_limit=None,
+                 command_step_limit=None, profiler=None):
         self._cmd_func_dict = self._create_cmd_func_dict()
-        self._console_ctrl = ConsoleController()
+        self._console_ctrl = (controller if controller is not None
+                              else ConsoleController())
+        # コマンドの中断用のトークンと、コマンドごとの制限
+        self._cancellation_token = CancellationToken()
+        self._console_ctrl.cancellation_token = self._cancellation_token
+        # 計測用の Profiler。Noneならば計測しない
+        self._console_ctrl.profiler = profiler
+        self._command_time_limit = command_time_limit
+        self._command_step_limit = command_step_limit
+        # 解析画面は初めて開くときに作成する
+        self._app_window = None
+        # 前回までの同定結果を読み込む
+        self._cache_dir = cache_dir
+        self._load_identification_cache()
         # 群の生成を実行
         result = self._generate_master(generators, zero_base, maximal)
         # 失敗なら終了
@@ -71,6 +97,8 @@ class AppServise(object):
             return
         self._is_succeeded = True
         self._master = result.master
+        self._master.controller = self._console_ctrl
+        self._analyzer = GroupAnalyzer(self._master)
         maximal = self._master.maximal_group
         trivial = self._master.trivial_group
         self._console_ctrl.message(
@@ -79,7 +107,6 @@ class AppServise(object):
             f'\n{maximal.name}\t{maximal.order}\t{maximal.isomorphic}'+
             f'\n{trivial.name}\t{trivial.order}\t{trivial.isomorphic}'
             )
-        self._app_window = AppWindow(self._exec_cmd)
     
     def __call__(self):
         # 群の生成に失敗したにもかかわらずアクセスした場合
@@ -89,8 +116,13 @@ class AppServise(object):
             "\n解析画面を開きました。\n"+
             "以降は解析画面上で操作してください。"
             )
+        if self._app_window is None:
+            # 画面を使用しない場合に tkinter を必要としないよう、ここで読み込む
+            from application.view import AppWindow
+            self._app_window = AppWindow(self._exec_cmd, self.cancel_command)
         self._app_window.text_ini = self._create_text_ini()
         self._app_window()
+        self._save_identification_cache()
         self._console_ctrl.message(
             "\n解析画面を閉じました。\n"+
             "再び解析画面を開くには、コンソールに app() と入力して実行してください。"
@@ -100,6 +132,98 @@ class AppServise(object):
     def is_succeeded(self):
         return self._is_succeeded
     
+    @property
+    def master(self):
+        return self._master
+    
+    @property
+    def analyzer(self) -> 'GroupAnalyzer':
+        """
+        解析画面のコマンドと同じ解析を、文字列ではなくオブジェクトとして返す。
+        """
+        return self._analyzer
+    
+    @property
+    def profiler(self) -> 'Profiler':
+        """
+        計算の所要時間と回数を記録する Profiler。Noneならば計測しない。
+        コンソールから app.profiler = Profiler() のように設定し、
+        コマンドの実行後に app.profiler.save_chrome_trace("trace.json") で出力する。
+        """
+        return self._console_ctrl.profiler
+    
+    @profiler.setter
+    def profiler(self, profiler: 'Profiler'):
+        self._console_ctrl.profiler = profiler
+    
+    @property
+    def command_time_limit(self) -> float:
+        """
+        コマンドごとの制限時間（秒）。Noneならば制限しない。
+        コンソールから app.command_time_limit = 10 のように変更できる。
+        """
+        return self._command_time_limit
+    
+    @command_time_limit.setter
+    def command_time_limit(self, seconds: float):
+        self._command_time_limit = seconds
+    
+    @property
+    def command_step_limit(self) -> int:
+        """
+        コマンドごとの制限ステップ数。Noneならば制限しない。
+        """
+        return self._command_step_limit
+    
+    @command_step_limit.setter
+    def command_step_limit(self, steps: int):
+        self._command_step_limit = steps
+    
+    @property
+    def command_names(self) -> 'tuple[str]':
+        """
+        使用できるコマンド名の一覧。
+        """
+        return tuple(self._cmd_func_dict.keys())
+    
+    def exec_command(self, cmd_text: str) -> str:
+        """
+        解析画面と同じ書式のコマンドを実行し、結果の文字列を返す。
+        例： exec_command("Normal[g0]")
+        """
+        return self._exec_cmd(cmd_text)
+    
+    def cancel_command(self):
+        """
+        実行中のコマンドの中断を要求する。別のスレッドから呼び出してよい。
+        計算は次の確認箇所で中断され、コマンドの結果は中断を表す文字列となる。
+        """
+        self._cancellation_token.cancel()
+    
+    def save_session(self, path):
+        """
+        作成された群と計算済みの値を保存する。
+        コンソールから app.save_session("session.npz") のように実行する。
+        """
+        GroupSession.save(self._master, path)
+        self._save_identification_cache()
+        self._console_ctrl.message(f'\nセッションを {path} に保存しました。')
+    
+    def load_session(self, path):
+        """
+        保存されたセッションを読み込み、解析対象の群を置き換える。
+        計算済みの値は、初めて参照されたときに読み込まれる。
+        置き換える前の群がセッションから読み込んだものであれば、そのファイルを閉じる。
+        """
+        master = GroupSession.load(path)
+        if self._is_succeeded:
+            GroupSession.close(self._master)
+        self._master = master
+        self._master.controller = self._console_ctrl
+        self._analyzer = GroupAnalyzer(self._master)
+        self._is_succeeded = True
+        self._console_ctrl.message(f'\nセッションを {path} から読み込みました。')
+    
     def _exec_cmd(self, cmd_text):
         """
         解析画面上に入力されたコマンドを実行する。
@@ -117,8 +241,15 @@ class AppServise(object):
         if group is None:
             return self._errmsg_expr
         # コマンド関数実行
+        # 制限はコマンドごとに数え直す
+        self._cancellation_token.reset(self._command_time_limit,
+                                       self._command_step_limit)
         try:
             return cmd_func(group)
+        except CalculationCancelled:
+            return self._errmsg_cancelled
+        except CalculationTimeout as e:
+            return self._errmsg_timeout + str(e)
         except NotImplementedError:
             print(traceback.format_exc())
             return self._errmsg_not_implemented
@@ -126,29 +257,64 @@ class AppServise(object):
             print(traceback.format_exc())
             return self._errmsg_exec      
     
+    def _identification_cache_path(self):
+        if self._cache_dir is None:
+            return None
+        return os.path.join(self._cache_dir, self._identification_cache_name)
+    
+    def _load_identification_cache(self):
+        """
+        保存された同定結果を読み込む。
+        """
+        path = self._identification_cache_path()
+        if path is not None:
+            IdentificationCache.load(path)
+    
+    def _save_identification_cache(self):
+        """
+        同定結果を保存する。
+        """
+        path = self._identification_cache_path()
+        if path is not None:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            IdentificationCache.save(path)
+    
     def _generate_master(self, generators, zero_base, maximal):
         """
         行列表示の生成元を与えて群を生成する。
         """
         ctrl = self._console_ctrl
-        result = matcal.generate_group(generators, zero_base, maximal, ctrl)
+        # 同じ条件で生成済みならば保存された群を用いる
+        cache = (None if self._cache_dir is None
+                 else MasterGroupCache(self._cache_dir))
+        if cache is not None:
+            key = MasterGroupCache.create_key(generators, zero_base, maximal)
+            master = cache.load(key)
+            if master is not None:
+                ctrl.message("保存された群を読み込みました。")
+                master.group_initial  = "g"
+                return GenerateMasterResult.create_succeeded(master)
+        # 中断に備えて生成の途中経過を保存する
+        checkpoint_path = (None if cache is None else
+                           os.path.join(self._cache_dir, f'generate_{key}.npz'))
+        result = matcal.generate_group(generators, zero_base, maximal, ctrl,
+                                       checkpoint_path)
         if not result.has_value:
             return GenerateMasterResult.create_failed()
         result = matcal.calc_cayleytable(result.value, zero_base, ctrl)
         if not result.has_value:
             return GenerateMasterResult.create_failed()
-        master = MasterGroup(result.value)
+        master = MasterGroup(result.value, controller=ctrl)
         master.group_initial  = "g"
+        if cache is not None:
+            cache.save(key, master)
         return GenerateMasterResult.create_succeeded(master)
     
     def _create_text_ini(self) -> str:
         """
         作成された群の一覧を表す文字列を作成する。
         """
-        text = "作成された群の一覧：\nName\tOrder\tIsomorphic"
-        for group in self._master.all_groups:
-            text += f'\n{group.name}\t{group.order}\t{group.isomorphic}'
-        return text
+        return AnalysisFormatter.group_list(self._analyzer.all_groups)
     
     def _divide_command_expr(self, cmd_text):
         """
@@ -168,184 +334,83 @@ class AppServise(object):
         return self._cmd_func_dict[cmd]
     
     def _name_to_group(self, name: str):
-        return self._master.name_to_group(name)
+        return self._analyzer.group(name)
     
     def _cmd_overview_of(self, group):
-        text = (
-            f'{group.name} の概要：\n'+
-            "Name\tOrder\tIsomorphic\n"+
-            f'{group.name}\t{group.order}\t{group.isomorphic}'
-            )
-        text += "\n"
-        text += f'\nIsAbelian\t\t{group.is_abelian}'
-        text += f'\nIsPerfect\t\t{group.is_perfect}'
-        text += f'\nIsSimple\t\t{group.is_simple}'
-        text += f'\nIsSolvable\t\t{group.is_solvable}'
-        text += "\n\n分解パターン"
-        text += "\n\n" + self._cmd_direct_decompose(group)
-        text += "\n\n" + self._cmd_semidirect_decompose(group)
-        return text
+        return AnalysisFormatter.overview(self._analyzer.overview(group))
 
     def _cmd_elements(self, group):
-        elements = sorted(list(group.elements))
-        text = (
-            f'{group.name} の要素：\n'+
-            f'{elements}'
-            )
-        return text
+        return AnalysisFormatter.elements(
+            group, self._analyzer.elements(group))
     
     def _cmd_cayley_table(self, group):
-        table = group.cayley_table
-        text = (
-            f'{group.name} の乗積表：\n'+
-            f'{table}'
-            )
-        return text
+        return AnalysisFormatter.cayley_table(
+            group, self._analyzer.cayley_table(group))
     
     def _cmd_conj_class(self, group):
-        conj_classes = group.conjugacy_classes
-        text = (
-            f'{group.name} の共役類の一覧：\n'+
-            "位数\t要素数\t共役類"
-            )
-        for c in conj_classes:
-            elements = sorted(list(c.elements))
-            text += f'\n{c.order}\t{c.element_num}\t{elements}'
-        return text
+        return AnalysisFormatter.conjugacy_classes(
+            group, self._analyzer.conjugacy_classes(group))
     
     def _cmd_conj_count(self, group):
-        conj_count = group.conjugacy_count
-        text = (
-            f'{group.name} の共役類のカウント：\n'+
-            "(位数, 要素数, 重複度)の一覧\n"+
-            f'{conj_count}'
-            )
-        return text
+        return AnalysisFormatter.conjugacy_count(
+            group, self._analyzer.conjugacy_count(group))
     
     def _cmd_isomorphic(self, group):
-        text = (f'{group.name} の群同型： {group.isomorphic}\n')
-        return text
+        return AnalysisFormatter.isomorphic(
+            group, self._analyzer.isomorphic(group))
 
     def _cmd_is_abelian(self, group):
-        result = "可換群" if group.is_abelian else "非可換群"
-        text = (f'{group.name} は {result} である。\n')
-        return text
+        return AnalysisFormatter.is_abelian(
+            group, self._analyzer.is_abelian(group))
     
     def _cmd_is_perfect(self, group):
-        result = "完全群" if group.is_perfect else "不完全群"
-        text = (f'{group.name} は {result} である。\n')
-        return text
+        return AnalysisFormatter.is_perfect(
+            group, self._analyzer.is_perfect(group))
 
     def _cmd_is_simple(self, group):
-        result = "ある" if group.is_solvable else "ない"
-        text = (f'{group.name} は 単純群で{result}。\n')
-        return text
+        return AnalysisFormatter.is_simple(
+            group, self._analyzer.is_simple(group))
     
     def _cmd_is_solvable(self, group):
-        result = "可解群" if group.is_solvable else "非可解群"
-        text = (f'{group.name} は {result} である。\n')
-        return text
+        return AnalysisFormatter.is_solvable(
+            group, self._analyzer.is_solvable(group))
 
     def _cmd_center(self, group):
-        center = group.center
-        text = (
-            f'{group.name} の中心：\n'+
-            "Name\tOrder\tIsomorphic\n"+
-            f'{center.name}\t{center.order}\t{center.isomorphic}'
-            )
-        return text
+        return AnalysisFormatter.center(group, self._analyzer.center(group))
     
     def _cmd_centralizer(self, group):
-        centralizer = group.centralizer
-        maximal = self._master.maximal_group
-        text = (
-            f'{maximal.name} における {group.name} の中心化群：\n'+
-            "Name\tOrder\tIsomorphic\n"+
-            f'{centralizer.name}\t{centralizer.order}\t{centralizer.isomorphic}'
-            )
-        return text
+        return AnalysisFormatter.centralizer(
+            group, self._analyzer.centralizer(group),
+            self._analyzer.maximal_group)
     
     def _cmd_derived(self, group):
-        derived = group.derived
-        text = (
-            f'{group.name} の導来部分群：\n'+
-            "Name\tOrder\tIsomorphic\n"+
-            f'{derived.name}\t{derived.order}\t{derived.isomorphic}'
-            )
-        return text
+        return AnalysisFormatter.derived(group, self._analyzer.derived(group))
     
     def _cmd_derived_series(self, group):
-        series = group.derived_series
-        text = (
-            f'{group.name} の導来列の一覧：\n'+
-            "Name\tOrder\tIsomorphic"
-            )
-        for g in series:
-            text += f'\n{g.name}\t{g.order}\t{g.isomorphic}'
-        return text
+        return AnalysisFormatter.derived_series(
+            group, self._analyzer.derived_series(group))
 
     def _cmd_normal(self, group):
-        normals = group.all_normalsub
-        text = (
-            f'{group.name} の正規部分群の一覧：\n'+
-            "Name\tOrder\tIsAbelian\t\tIsomorphic"
-            )
-        for g in normals:
-            is_abelian = 'Abelian'if g.is_abelian else 'non'
-            text += f'\n{g.name}\t{g.order}\t{is_abelian}\t\t{g.isomorphic}'
-        return text
+        return AnalysisFormatter.normal_subgroups(
+            group, self._analyzer.normal_subgroups(group))
     
     def _cmd_normalzer(self, group):
-        normalizer = group.normalizer
-        maximal = self._master.maximal_group
-        text = (
-            f'{maximal.name} における {group.name} の正規化群：\n'+
-            "Name\tOrder\tIsomorphic\n"+
-            f'{normalizer.name}\t{normalizer.order}\t{normalizer.isomorphic}'
-            )
-        return text
+        return AnalysisFormatter.normalizer(
+            group, self._analyzer.normalizer(group),
+            self._analyzer.maximal_group)
     
     def _cmd_direct_decompose(self, group):
-        direct_list = group.direct_product
-        text = (
-            f'{group.name} の直積への分解：\n'+
-            "(\'x\' means \'\\times\')\n"+
-            "Name(Order)"
-            )
-        if not direct_list:
-            return text + "\n分解なし"
-        for data in direct_list:
-            left = data.left
-            right = data.right
-            text += (
-                f'\n{left.name}({left.order}) x {right.name}({right.order})'+
-                f'\t<==> ( {left.isomorphic} ) x ( {right.isomorphic} )'
-                )
-        return text
+        return AnalysisFormatter.direct_products(
+            group, self._analyzer.direct_products(group))
     
     def _cmd_semidirect_decompose(self, group):
-        semi_list = group.semidirect_product
-        text = (
-            f'{group.name} の半直積への分解：\n'+
-            "(\'r\' means \'\\rtimes\')\n"+
-            "Name(Order)"
-            )
-        if not semi_list:
-            return text + "\n分解なし"
-        for data in semi_list:
-            left = data.left
-            right = data.right
-            text += (
-                f'\n{left.name}({left.order}) r {right.name}({right.order})'+
-                f'\t<==> ( {left.isomorphic} ) r ( {right.isomorphic} )')
-        return text
+        return AnalysisFormatter.semidirect_products(
+            group, self._analyzer.semidirect_products(group))
 
     def _cmd_decompose(self, group):
-        text = f'{group.name} の分解：\n'
-        text += self._cmd_direct_decompose(group)
-        text += "\n\n"
-        text += self._cmd_semidirect_decompose(group)   
-        return text
+        return AnalysisFormatter.decompositions(
+            group, self._analyzer.direct_products(group),
+            self._analyzer.semidirect_products(group))
     
 class CmdExprPair(object):
     def __init__(self, has_value: bool, cmd: str, expr: str):
@@ -1,15 +1,45 @@
 """
 アプリ画面。
 """
+import queue
+import threading
 import tkinter
 import tkinter.scrolledtext
 import tkinter.ttk
 
 class AppWindow(object):
-    def __init__(self, exec_func_pointer):
+    """
+    解析画面。
+    コマンドは画面とは別のスレッドで一つずつ実行し、
+    実行結果はキューを通して画面のスレッドで表示する。
+    実行中は進捗表示を動かし、Escキーまたはキャンセルボタンで
+    実行中のコマンドの結果を破棄し、計算の中断を要求できる。
+    画面を閉じる際は計算の中断を要求し、スレッドの終了を待つ。
+
+    Parameters
+    ----------
+    exec_func_pointer : TYPE
+        コマンド文字列を受け取り、実行結果の文字列を返す関数。
+    cancel_func_pointer : TYPE, optional
+        キャンセル時に呼び出す関数。実行中の計算に中断を要求する。
+        The default is None.
+
+    """
+    # 実行結果のキューを確認する間隔（ミリ秒）
+    _poll_interval = 100
+    
+    def __init__(self, exec_func_pointer, cancel_func_pointer = None):
         self._exec_cmd = exec_func_pointer
+        self._cancel_cmd = cancel_func_pointer
         self._text_ini = "デフォルトメッセージ"
         self._cmd_count = 0
+        # 実行待ちのコマンドと実行結果のキュー
+        self._job_queue = None
+        self._result_queue = None
+        # 実行中のコマンドの番号。実行中でなければNone
+        self._running_job = None
+        # キャンセルされたコマンドの番号
+        self._cancelled_jobs = set()
     
     def __call__(self):
         self._app_window()
@@ -50,12 +80,35 @@ class AppWindow(object):
         self.result_window = result_window
         #
         n_row += 1
+        status_frame = tkinter.Frame(root)
+        status_frame.columnconfigure(1, weight=1)
+        status_frame.grid(column=0, row=n_row,
+                          sticky=tkinter.EW, padx=20, pady=5)
+        progress_bar = tkinter.ttk.Progressbar(
+                status_frame, mode='indeterminate', length=120)
+        progress_bar.grid(column=0, row=0, padx=0, pady=0)
+        self.progress_bar = progress_bar
+        status_label = tkinter.Label(status_frame, anchor=tkinter.W)
+        status_label.grid(column=1, row=0, sticky=tkinter.EW, padx=10)
+        self.status_label = status_label
+        cancel_button = tkinter.ttk.Button(
+                status_frame, text="キャンセル", command=self._cancel,
+                state='disabled')
+        cancel_button.grid(column=2, row=0, padx=0, pady=0)
+        self.cancel_button = cancel_button
+        #
+        n_row += 1
         sizegrip = tkinter.ttk.Sizegrip(root)
         sizegrip.grid(column=0, row=n_row,
                       sticky=tkinter.NSEW, padx=0, pady=0)
         #
+        self.root = root
+        self._start_worker()
         root.bind('<Return>', self._pressed_entere)
+        root.bind('<Escape>', lambda event: self._cancel())
+        root.after(self._poll_interval, self._poll_result)
         root.mainloop()
+        self._stop_worker()
 
     def _pressed_entere(self,event):
         """
@@ -66,14 +119,106 @@ class AppWindow(object):
         cmd_text = self.cmd_window.get()
         # コマンド文字列が空文字なら処理終了
         if cmd_text == "": return
+        # 実行中のコマンドがあれば受け付けない
+        if self._running_job is not None:
+            self.status_label.configure(
+                text="実行中のコマンドがあります（Escでキャンセル）")
+            return
         # コマンド実行回数    
         self._cmd_count += 1
         # 実行内容を出力
         self._print_command(cmd_text)
-        # 実行結果を取得
-        result = self._exec_cmd(cmd_text)
-        # 実行結果を出力
-        self._print_result(result)
+        # 別スレッドで実行する。結果は _poll_result() で出力する
+        self._running_job = self._cmd_count
+        self._job_queue.put((self._cmd_count, cmd_text))
+        self._show_running(cmd_text)
+    
+    def _start_worker(self):
+        """
+        コマンドを実行するスレッドを開始する。
+        コマンドは一つずつ順に実行されるため、群の計算が並行することはない。
+        """
+        self._job_queue = queue.Queue()
+        self._result_queue = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._worker_loop,
+            args=(self._job_queue, self._result_queue), daemon=True)
+        self._worker.start()
+    
+    def _stop_worker(self):
+        """
+        コマンドを実行するスレッドを終了させ、終了を待つ。
+        再び画面を開いたときに、中断されたコマンドの計算と
+        新たなスレッドの計算が並行しないようにする。
+        """
+        if self._running_job is not None:
+            self._cancelled_jobs.add(self._running_job)
+        self._job_queue.put(None)
+        # 実行中の計算は中断の確認箇所で終了する。
+        # 計算の開始時にトークンが戻される場合に備え、終了まで要求を繰り返す
+        while self._worker.is_alive():
+            if self._cancel_cmd is not None:
+                self._cancel_cmd()
+            self._worker.join(self._poll_interval / 1000)
+        self._running_job = None
+        self._cancelled_jobs.clear()
+    
+    def _worker_loop(self, job_queue, result_queue):
+        """
+        コマンドを実行するスレッドの処理。
+        """
+        while True:
+            job = job_queue.get()
+            if job is None: break
+            (job_id, cmd_text) = job
+            if job_id in self._cancelled_jobs: continue
+            try:
+                result = self._exec_cmd(cmd_text)
+            except Exception as e:
+                result = f'プログラムエラー：{e}'
+            result_queue.put((job_id, result))
+    
+    def _poll_result(self):
+        """
+        実行結果のキューを確認し、結果があれば出力する。
+        画面のスレッドで定期的に呼び出される。
+        """
+        try:
+            while True:
+                (job_id, result) = self._result_queue.get_nowait()
+                if job_id in self._cancelled_jobs:
+                    self._cancelled_jobs.discard(job_id)
+                    continue
+                self._print_result(result)
+                if job_id == self._running_job:
+                    self._running_job = None
+                    self._show_idle("")
+        except queue.Empty:
+            pass
+        self.root.after(self._poll_interval, self._poll_result)
+    
+    def _cancel(self):
+        """
+        実行中のコマンドをキャンセルする。
+        実行結果は破棄され、すぐに次のコマンドを受け付ける。
+        """
+        if self._running_job is None: return
+        self._cancelled_jobs.add(self._running_job)
+        self._running_job = None
+        if self._cancel_cmd is not None:
+            self._cancel_cmd()
+        self._print_result("キャンセルしました。")
+        self._show_idle("キャンセルしました")
+    
+    def _show_running(self, cmd_text: str):
+        self.progress_bar.start(10)
+        self.cancel_button.configure(state='normal')
+        self.status_label.configure(text=f'実行中: {cmd_text}')
+    
+    def _show_idle(self, text: str):
+        self.progress_bar.stop()
+        self.cancel_button.configure(state='disabled')
+        self.status_label.configure(text=text)
         
     def _print_command(self, cmd_text: str):
         """
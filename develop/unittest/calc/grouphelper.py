@@ -0,0 +1,18 @@
+"""
+calc のテストで共通して用いる関数。
+"""
+import sys
+sys.path.append('../../')
+from application.calc import matcal
+from application.calc.group import MasterGroup
+
+def create_master(generators):
+    """
+    生成元から群を生成し、乗積表を作成して MasterGroup とする。
+    部分群の名前の接頭辞は "g" とする。
+    """
+    result = matcal.generate_group(generators, 0.0001, 2000)
+    result = matcal.calc_cayleytable(result.value, 0.0001)
+    master = MasterGroup(result.value)
+    master.group_initial = "g"
+    return master
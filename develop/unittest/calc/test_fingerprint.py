@@ -0,0 +1,42 @@
+import sys
+sys.path.append('../../')
+from application.namedgroup.ggen import NamedGroupGenerator
+import unittest
+from grouphelper import create_master
+
+class TestGroupFingerprint(unittest.TestCase):
+    def test_isomorphic_groups_have_equal_fingerprint(self):
+        d3 = create_master(NamedGroupGenerator.D_n(3)).maximal_group
+        s3 = create_master(NamedGroupGenerator.S_n(3)).maximal_group
+        self.assertEqual(d3.fingerprint, s3.fingerprint)
+        self.assertEqual(hash(d3.fingerprint), hash(s3.fingerprint))
+    
+    def test_non_isomorphic_groups_have_different_fingerprint(self):
+        d4 = create_master(NamedGroupGenerator.D_n(4)).maximal_group
+        q4 = create_master(NamedGroupGenerator.Q_n(4)).maximal_group
+        self.assertNotEqual(d4.fingerprint, q4.fingerprint)
+    
+    def test_invariants(self):
+        group = create_master(NamedGroupGenerator.D_n(4)).maximal_group
+        fingerprint = group.fingerprint
+        self.assertEqual(fingerprint.order, 8)
+        self.assertEqual(fingerprint.center_order, 2)
+        self.assertEqual(fingerprint.derived_order, 2)
+        self.assertEqual(fingerprint.order_histogram, ((1, 1), (2, 5), (4, 2)))
+        self.assertEqual(fingerprint.class_key,
+                         ((1, 1, 1), (2, 1, 1), (2, 2, 2), (4, 2, 1)))
+    
+    def test_find_isomorphic(self):
+        test_case = [
+            (NamedGroupGenerator.D_n(4), "D(4)"),
+            (NamedGroupGenerator.Q_n(4), "Q(4)"),
+            (NamedGroupGenerator.S_n(4), "S(4)"),
+            (NamedGroupGenerator.Delta_3n_2(3), "Delta(27)"),
+            ]
+        for (generators, name) in test_case:
+            with self.subTest(name=name):
+                group = create_master(generators).maximal_group
+                self.assertEqual(group.isomorphic, name)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import sys
+sys.path.append('../../')
+import numpy
+from application.calc.group import MasterGroup
+from application.namedgroup.ggen import NamedGroupGenerator
+import unittest
+from grouphelper import create_master
+from unittest import mock
+
+class TestSubgroupCayleyTable(unittest.TestCase):
+    def setUp(self):
+        self.master = create_master(NamedGroupGenerator.S_n(4))
+        self.groups = self.master.maximal_group.all_normalsub
+
+    def test_cayley_table(self):
+        mastertable = self.master.cayley_table
+        for group in self.groups:
+            indexlist = sorted(group.elements)
+            table = group.cayley_table
+            self.assertEqual(table.shape, (group.order, group.order))
+            for (row, i1) in enumerate(indexlist):
+                for (column, i2) in enumerate(indexlist):
+                    self.assertEqual(table[row, column], mastertable[i1, i2])
+
+    def test_relabeled_cayley_table(self):
+        for group in self.groups:
+            relabeled = group.relabeled_cayley_table
+            numpy.testing.assert_array_equal(
+                group.index_array[relabeled], group.cayley_table)
+            # 各行は 0, ..., order-1 の置換となる
+            numpy.testing.assert_array_equal(
+                numpy.sort(relabeled, axis=1),
+                numpy.tile(numpy.arange(group.order), (group.order, 1)))
+
+class TestConjugacyClasses(unittest.TestCase):
+    def test_blocks(self):
+        # 未分類の元を少しずつ取り出しても、共役類は変わらない
+        expected = create_master(
+            NamedGroupGenerator.S_n(4)).maximal_group.conjugacy_classes
+        master = create_master(NamedGroupGenerator.S_n(4))
+        with mock.patch.object(MasterGroup, "_row_block_size", 3):
+            classes = master.maximal_group.conjugacy_classes
+        self.assertEqual([(c.order, c.elements) for c in classes],
+                         [(c.order, c.elements) for c in expected])
+        self.assertEqual(sum(c.element_num for c in classes), 24)
+
+class TestSubMaster(unittest.TestCase):
+    def setUp(self):
+        self.master = create_master(NamedGroupGenerator.S_n(4))
+        # 位数12の正規部分群は A(4)
+        self.group = [g for g in self.master.maximal_group.all_normalsub
+                      if g.order == 12][0]
+
+    def test_to_master(self):
+        sub = self.group.to_master()
+        self.assertIs(self.group.to_master(), sub)
+        self.assertIs(sub.parent, self.master)
+        self.assertEqual(sub.order, 12)
+        numpy.testing.assert_array_equal(sub.parent_index,
+                                         self.group.index_array)
+        numpy.testing.assert_array_equal(
+            sub.parent_index[sub.cayley_table], self.group.cayley_table)
+        numpy.testing.assert_array_equal(
+            sub.parent_index[sub.inverse_data],
+            self.master.inverse_data[sub.parent_index])
+        self.assertEqual(sub.maximal_group.isomorphic,
+                         self.group.isomorphic)
+        self.assertEqual(sub.maximal_group.conjugacy_count.key,
+                         self.group.conjugacy_count.key)
+
+    def test_map_subgroups(self):
+        sub = self.group.to_master()
+        normals = sub.maximal_group.all_normalsub
+        self.assertEqual(sorted(g.order for g in normals), [1, 4, 12])
+        for g in normals:
+            lifted = sub.to_parent(g)
+            self.assertIs(lifted.master, self.master)
+            self.assertEqual(lifted.elements,
+                             frozenset(sub.parent_index[list(g.elements)]))
+            self.assertTrue(sub.from_parent(lifted).equal_to(g))
+        self.assertRaises(ValueError, sub.from_parent,
+                          self.master.maximal_group)
+
+class TestQuotient(unittest.TestCase):
+    def setUp(self):
+        self.master = create_master(NamedGroupGenerator.S_n(4))
+        self.maximal = self.master.maximal_group
+        self.normals = {g.order: g for g in self.maximal.all_normalsub}
+
+    def test_coset_labels(self):
+        normal = self.normals[4]
+        labels = self.maximal.coset_labels(normal)
+        self.assertEqual(sorted(set(labels.tolist())), list(range(6)))
+        index = self.maximal.index_array
+        for label in range(6):
+            coset = {int(g) for g in index[labels == label]}
+            g = min(coset)
+            self.assertEqual(coset, {self.master.index_prod(g, n)
+                                     for n in normal.elements})
+
+    def test_quotient(self):
+        # S(4)/V(4) は S(3)、S(4)/A(4) は C(2)
+        quotient = self.maximal.quotient(self.normals[4])
+        self.assertEqual(quotient.order, 6)
+        self.assertIsNone(quotient.matrix_rep_of_elements)
+        self.assertFalse(quotient.maximal_group.is_abelian)
+        labels = self.maximal.coset_labels(self.normals[4])
+        index = self.maximal.index_array
+        for (i1, i2) in [(3, 5), (7, 11), (20, 2)]:
+            product = self.master.index_prod(index[i1], index[i2])
+            self.assertEqual(
+                quotient.index_prod(labels[i1], labels[i2]),
+                labels[numpy.searchsorted(index, product)])
+        quotient = self.maximal.quotient(self.normals[12])
+        self.assertEqual(quotient.order, 2)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, self.maximal.quotient, self.maximal)
+        # 互換の生成する部分群は正規部分群でない
+        subgroup = self.master.generate_group({1})
+        self.assertFalse(subgroup.is_normalsubgroup_of(self.maximal))
+        self.assertRaises(ValueError, self.maximal.quotient, subgroup)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys
+import os
+import tempfile
+sys.path.append('../../')
+from application.controller import NullController
+from application.namedgroup.ggen import NamedGroupGenerator
+from application.namedgroup.gdb import GroupDatabase, DEFAULT_DATABASE_PATH
+from application.namedgroup import gdb_build
+import unittest
+from grouphelper import create_master
+
+class TestGroupDatabase(unittest.TestCase):
+    def tearDown(self):
+        GroupDatabase.reload(DEFAULT_DATABASE_PATH)
+    
+    def test_build_and_find(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "groupdb.npy")
+            gdb_build.build_database(16, set(), path, NullController())
+            GroupDatabase.reload(path)
+            generators = gdb_build._direct_sum(
+                NamedGroupGenerator.D_n(4), NamedGroupGenerator.D_n(1)[1:])
+            group = create_master(generators).maximal_group
+            self.assertEqual(group.order, 16)
+            self.assertEqual(GroupDatabase.find(group.fingerprint),
+                             ("D(4) × Z(2)",))
+            self.assertEqual(group.isomorphic, "D(4) × Z(2)")
+            q8 = create_master(NamedGroupGenerator.Q_n(8)).maximal_group
+            self.assertEqual(GroupDatabase.find(q8.fingerprint), ("Q(8)",))
+    
+    def test_missing_database(self):
+        GroupDatabase.reload("not_exist.npy")
+        group = create_master(NamedGroupGenerator.D_n(4)).maximal_group
+        self.assertEqual(GroupDatabase.find(group.fingerprint), tuple())
+    
+    def test_abelian_groups(self):
+        self.assertEqual(sorted(gdb_build.abelian_groups(8)),
+                         [(2, 2, 2), (2, 4), (8,)])
+        self.assertEqual(sorted(gdb_build.abelian_groups(12)),
+                         [(2, 2, 3), (3, 4)])
+
+if __name__ == "__main__":
+    unittest.main()
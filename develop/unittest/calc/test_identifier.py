@@ -0,0 +1,122 @@
+import sys
+import numpy
+sys.path.append('../../')
+from application.calc.identifier import GroupIdentifier, IdentificationCache
+from application.namedgroup.ggen import NamedGroupGenerator
+from application.namedgroup import gdb_build
+import json
+import os
+import tempfile
+import unittest
+from grouphelper import create_master
+
+def create_abelian(cyclic_orders):
+    n = len(cyclic_orders)
+    generators = []
+    for (i, k) in enumerate(cyclic_orders):
+        diag = [1 for j in range(n)]
+        diag[i] = numpy.exp(2j*numpy.pi/k)
+        generators.append(numpy.diag(diag))
+    return create_master(generators).maximal_group
+
+class TestGroupIdentifier(unittest.TestCase):
+    def test_abelian_invariants(self):
+        test_case = [
+            ((2, 2, 2), (2, 2, 2)),
+            ((2, 4), (2, 4)),
+            ((6,), (2, 3)),
+            ((2, 6), (2, 2, 3)),
+            ((4, 6), (2, 3, 4)),
+            ((3, 9), (3, 9)),
+            ]
+        for (cyclic_orders, expected) in test_case:
+            with self.subTest(cyclic_orders=cyclic_orders):
+                group = create_abelian(cyclic_orders)
+                self.assertEqual(
+                    GroupIdentifier.abelian_invariants(group), expected)
+    
+    def test_find_isomorphic_abelian(self):
+        self.assertEqual(create_abelian((4, 6)).isomorphic,
+                         "Z(2) × Z(3) × Z(4)")
+        self.assertEqual(create_abelian((5,)).isomorphic, "Z(5)")
+        master = create_abelian((5,)).master
+        self.assertEqual(master.trivial_group.isomorphic, "Z(1)")
+    
+    def test_abelian_cyclic_factors(self):
+        group = create_abelian((2, 6))
+        factors = GroupIdentifier.abelian_cyclic_factors(group)
+        self.assertEqual(tuple(g.order for g in factors), (2, 2, 3))
+        self.assertTrue(all(g.is_subgroup_of(group) for g in factors))
+
+class TestDatabaseCandidates(unittest.TestCase):
+    def setUp(self):
+        IdentificationCache.clear()
+    
+    def tearDown(self):
+        IdentificationCache.clear()
+    
+    def test_candidates_are_confirmed(self):
+        # Z(4) ⋊ Z(4) と Q(4) × Z(2) は不変量が一致するが同型でない
+        a = numpy.diag([1j, -1j, 1])
+        b = numpy.array([[0, 1, 0], [1, 0, 0], [0, 0, 1j]])
+        semidirect = create_master([a, b]).maximal_group
+        product = create_master(gdb_build._direct_sum(
+            NamedGroupGenerator.Q_n(4),
+            NamedGroupGenerator.D_n(1)[1:])).maximal_group
+        self.assertEqual(semidirect.fingerprint.digest,
+                         product.fingerprint.digest)
+        self.assertEqual(product.isomorphic, "Q(4) × Z(2)")
+        self.assertEqual(semidirect.isomorphic, "?")
+        self.assertTrue(GroupIdentifier.confirm_name(product, "Q(4) × Z(2)"))
+        self.assertFalse(
+            GroupIdentifier.confirm_name(semidirect, "Q(4) × Z(2)"))
+
+class TestIdentificationCache(unittest.TestCase):
+    def setUp(self):
+        IdentificationCache.clear()
+    
+    def tearDown(self):
+        IdentificationCache.clear()
+    
+    def test_find_isomorphic_uses_cache(self):
+        group = create_abelian((2, 3))
+        key = GroupIdentifier.cache_key(group)
+        IdentificationCache.set(key, "cached")
+        self.assertEqual(GroupIdentifier.find_isomorphic(group), "cached")
+    
+    def test_non_abelian_not_cached(self):
+        group = create_master(NamedGroupGenerator.D_n(4)).maximal_group
+        self.assertEqual(GroupIdentifier.find_isomorphic(group), "D(4)")
+        self.assertEqual(IdentificationCache.size(), 0)
+    
+    def test_isomorphic_groups_share_key(self):
+        group1 = create_abelian((2, 3))
+        group2 = create_abelian((6,))
+        self.assertEqual(GroupIdentifier.cache_key(group1),
+                         GroupIdentifier.cache_key(group2))
+        self.assertNotEqual(GroupIdentifier.cache_key(group1),
+                            GroupIdentifier.cache_key(create_abelian((2, 2))))
+    
+    def test_save_and_load(self):
+        group = create_abelian((2, 4))
+        symbol = GroupIdentifier.find_isomorphic(group)
+        self.assertEqual(IdentificationCache.size(), 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.json")
+            IdentificationCache.save(path)
+            IdentificationCache.clear()
+            self.assertTrue(IdentificationCache.load(path))
+            key = GroupIdentifier.cache_key(group)
+            self.assertEqual(IdentificationCache.get(key), symbol)
+            # データの版が異なるファイルは読み込まない
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            data["data_version"] += 1
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            IdentificationCache.clear()
+            self.assertFalse(IdentificationCache.load(path))
+            self.assertEqual(IdentificationCache.size(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import sys
+import numpy
+sys.path.append('../../')
+from application.calc import matcal
+from application.calc.group import MasterGroup
+from application.calc.mastercache import MasterGroupCache
+from application.calc.mastercache import save_mapped_master, load_mapped_master
+from application.namedgroup.ggen import NamedGroupGenerator
+import os
+import tempfile
+import unittest
+
+class TestMasterGroupCache(unittest.TestCase):
+    def test_create_key(self):
+        gens = [numpy.array([[0,1],[1,0]]), numpy.array([[1,0],[0,-1]])]
+        gens_complex = [g.astype(complex) for g in gens]
+        key = MasterGroupCache.create_key(gens, 0.0001, 2000)
+        self.assertEqual(
+            key, MasterGroupCache.create_key(gens_complex, 0.0001, 2000))
+        self.assertNotEqual(
+            key, MasterGroupCache.create_key(gens, 0.0001, 1000))
+        self.assertNotEqual(
+            key, MasterGroupCache.create_key(gens[:1], 0.0001, 2000))
+    
+    def test_save_and_load(self):
+        gens = NamedGroupGenerator.D_n(5)
+        result = matcal.generate_group(gens, 0.0001, 2000)
+        result = matcal.calc_cayleytable(result.value, 0.0001)
+        master = MasterGroup(result.value)
+        key = MasterGroupCache.create_key(gens, 0.0001, 2000)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = MasterGroupCache(tmp)
+            self.assertIsNone(cache.load(key))
+            cache.save(key, master)
+            loaded = cache.load(key)
+        self.assertEqual(loaded.order, master.order)
+        numpy.testing.assert_array_equal(loaded.cayley_table,
+                                         master.cayley_table)
+        numpy.testing.assert_array_equal(loaded.conjugate_data,
+                                         master.conjugate_data)
+        numpy.testing.assert_allclose(
+            numpy.array(loaded.matrix_rep_of_elements),
+            numpy.array(master.matrix_rep_of_elements))
+        self.assertEqual(loaded.maximal_group.isomorphic,
+                         master.maximal_group.isomorphic)
+        self.assertEqual(len(loaded.maximal_group.all_normalsub),
+                         len(master.maximal_group.all_normalsub))
+
+    def test_corrupt_file(self):
+        gens = NamedGroupGenerator.D_n(5)
+        result = matcal.generate_group(gens, 0.0001, 2000)
+        result = matcal.calc_cayleytable(result.value, 0.0001)
+        master = MasterGroup(result.value)
+        key = MasterGroupCache.create_key(gens, 0.0001, 2000)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = MasterGroupCache(tmp)
+            cache.save(key, master)
+            # 一時ファイルは残らない
+            self.assertEqual(os.listdir(tmp),
+                             [os.path.basename(cache.path_of(key))])
+            # 途中で途切れたファイルは保存されていないものとして扱う
+            with open(cache.path_of(key), "r+b") as f:
+                f.truncate(100)
+            self.assertIsNone(cache.load(key))
+            with open(cache.path_of(key), "wb") as f:
+                f.write(b"PK\x03\x04 not a zip file")
+            self.assertIsNone(cache.load(key))
+
+    def test_mapped_master(self):
+        gens = NamedGroupGenerator.Q_n(6)
+        result = matcal.generate_group(gens, 0.0001, 2000)
+        result = matcal.calc_cayleytable(result.value, 0.0001)
+        master = MasterGroup(result.value)
+        with tempfile.TemporaryDirectory() as tmp:
+            save_mapped_master(master, tmp)
+            mapped = load_mapped_master(tmp)
+            self.assertTrue(mapped.is_mapped)
+            self.assertIsInstance(mapped.cayley_table, numpy.memmap)
+            n = master.order
+            for (g, h) in [(1, 2), (3, 5), (n-1, n-2)]:
+                self.assertEqual(mapped.index_conjugate(g, h),
+                                 master.index_conjugate(g, h))
+                self.assertEqual(mapped.index_commutator(g, h),
+                                 master.index_commutator(g, h))
+            maximal = mapped.maximal_group
+            self.assertEqual(
+                [(c.order, c.elements) for c in maximal.conjugacy_classes],
+                [(c.order, c.elements)
+                 for c in master.maximal_group.conjugacy_classes])
+            self.assertEqual(maximal.center.order, 2)
+            self.assertEqual(maximal.isomorphic,
+                             master.maximal_group.isomorphic)
+            del mapped, maximal
+
+    def test_quotient(self):
+        # 剰余群は行列表現を持たない
+        gens = NamedGroupGenerator.S_n(4)
+        result = matcal.generate_group(gens, 0.0001, 2000)
+        result = matcal.calc_cayleytable(result.value, 0.0001)
+        maximal = MasterGroup(result.value).maximal_group
+        normal = [g for g in maximal.all_normalsub if g.order == 4][0]
+        quotient = maximal.quotient(normal)
+        self.assertIsNone(quotient.matrix_rep_of_elements)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = MasterGroupCache(tmp)
+            cache.save("quotient", quotient)
+            loaded = cache.load("quotient")
+            self.assertIsNone(loaded.matrix_rep_of_elements)
+            numpy.testing.assert_array_equal(loaded.cayley_table,
+                                             quotient.cayley_table)
+            mapped_dir = os.path.join(tmp, "mapped")
+            save_mapped_master(quotient, mapped_dir)
+            mapped = load_mapped_master(mapped_dir)
+            self.assertIsNone(mapped.matrix_rep_of_elements)
+            self.assertEqual(mapped.maximal_group.order, 6)
+            self.assertFalse(mapped.maximal_group.is_abelian)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,12 @@ import sys
 import numpy
 sys.path.append('../../')
 from application.calc import matcal
+from application.controller import NullController
+from application.namedgroup.ggen import NamedGroupGenerator
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 class TestMatcal(unittest.TestCase):
     def test_are_equal_True(self):
@@ -64,5 +69,184 @@ class TestMatcal(unittest.TestCase):
             with self.subTest(csmat=csmat):
                 self.assertFalse(csmat.has_unit_determinant(0.001))       
         
+class TestGenerateGroupCheckpoint(unittest.TestCase):
+    def test_layers(self):
+        gens = NamedGroupGenerator.D_n(7)
+        expected = matcal.generate_group(gens, 0.0001, 2000).value
+        layers = list(matcal.iter_group_layers(gens, 0.0001, 2000))
+        self.assertEqual(len(layers[0]), 1 + len(gens))
+        elements = [mat for layer in layers for mat in layer]
+        self.assertEqual(len(elements), len(expected))
+        for (a, b) in zip(elements, expected):
+            numpy.testing.assert_allclose(a, b)
+    
+    def test_resume(self):
+        gens = NamedGroupGenerator.D_n(7)
+        expected = matcal.generate_group(gens, 0.0001, 2000).value
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "generate.npz")
+            layers = matcal.iter_group_layers(gens, 0.0001, 2000, path, 0.0)
+            n_done = len(next(layers)) + len(next(layers))
+            layers.close()
+            self.assertTrue(os.path.exists(path))
+            resumed = matcal.iter_group_layers(gens, 0.0001, 2000, path, 0.0)
+            self.assertEqual(len(next(resumed)), n_done)
+            resumed.close()
+            result = matcal.generate_group(gens, 0.0001, 2000,
+                                           checkpoint_path=path)
+            self.assertEqual(len(result.value), len(expected))
+            self.assertFalse(os.path.exists(path))
+    
+    def test_corrupt_checkpoint(self):
+        gens = NamedGroupGenerator.D_n(7)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "generate.npz")
+            with open(path, "wb") as f:
+                f.write(b"broken")
+            result = matcal.generate_group(gens, 0.0001, 2000,
+                                           checkpoint_path=path,
+                                           checkpoint_interval=0.0)
+            self.assertEqual(len(result.value), 14)
+            # 一時ファイルは残らない
+            self.assertEqual(os.listdir(tmp), [])
+    
+    def test_contiguous_elements(self):
+        result = matcal.generate_group(NamedGroupGenerator.D_n(7), 0.0001, 2000)
+        elements = result.elements
+        self.assertEqual(elements.shape, (14, 2, 2))
+        self.assertTrue(elements.flags["C_CONTIGUOUS"])
+        for (i, mat) in enumerate(result.iter_elements()):
+            self.assertTrue(numpy.shares_memory(mat, elements))
+            numpy.testing.assert_array_equal(mat, elements[i])
+        table = matcal.calc_cayleytable(elements, 0.0001).value
+        self.assertIs(table.matlist, elements)
+    
+    def test_release_elements(self):
+        elements = numpy.array(NamedGroupGenerator.D_n(7))
+        locator = matcal.ElementLocator(elements[:1], 0.0001)
+        # 容量は 1, 2, 4 と倍になり、3個の要素のみを返す
+        locator.add(elements[1:])
+        locator.add(-elements[:1])
+        released = locator.release_elements()
+        self.assertEqual(released.shape, (3, 2, 2))
+        self.assertTrue(released.flags["C_CONTIGUOUS"])
+        numpy.testing.assert_array_equal(
+            released, numpy.concatenate([elements, -elements[:1]]))
+    
+    def test_workers(self):
+        gens = NamedGroupGenerator.S_n(5)
+        expected = matcal.generate_group(gens, 0.0001, 2000).value
+        # 段を小さく分割し、複数のスレッドで計算させる
+        with mock.patch.object(matcal, "_LAYER_CHUNK_SIZE", 8):
+            result = matcal.generate_group(gens, 0.0001, 2000, workers=4)
+        self.assertEqual(result.value.shape, (120,) + expected.shape[1:])
+        numpy.testing.assert_allclose(result.value, expected)
+    
+    def test_not_closed(self):
+        gens = [numpy.array([[numpy.exp(0.1j)]])]
+        self.assertFalse(matcal.generate_group(gens, 0.0001, 50).has_value)
+
+class TestSchreierTree(unittest.TestCase):
+    def test_words(self):
+        gens = NamedGroupGenerator.S_n(4)
+        result = matcal.generate_group(gens, 0.0001, 2000, record_words=True)
+        tree = result.tree
+        self.assertEqual(len(tree), 24)
+        self.assertEqual(tree.word(0), ())
+        self.assertEqual(tree.word_text(0), "e")
+        numpy.testing.assert_allclose(tree.matrices(), result.value,
+                                      atol=1e-8)
+        for i in range(len(tree)):
+            self.assertEqual(len(tree.word(i)), tree.depth[i])
+            numpy.testing.assert_allclose(tree.matrix(i), result.value[i],
+                                          atol=1e-8)
+        self.assertIsNone(matcal.generate_group(gens, 0.0001, 2000).tree)
+    
+    def test_word_text(self):
+        gens = NamedGroupGenerator.D_n(4)
+        tree = matcal.generate_group(gens, 0.0001, 2000,
+                                     record_words=True).tree
+        self.assertEqual(tree.word_text(7), "a^2b")
+        self.assertEqual(tree.word_text(7, ["r", "s"]), "r^2s")
+        self.assertEqual(tree.word_text(7, ["r0", "s0"]), "r0^2*s0")
+    
+    def test_generator_index(self):
+        # 単位元や重複した生成元は、指定した生成元のインデックスで数える
+        (a, b) = NamedGroupGenerator.D_n(5)
+        gens = [numpy.identity(2), a, a, b]
+        tree = matcal.generate_group(gens, 0.0001, 2000,
+                                     record_words=True).tree
+        self.assertEqual(set(tree.generator[1:]), {1, 3})
+        self.assertEqual(tree.word_text(1, ["e", "r", "r2", "s"]), "r")
+        numpy.testing.assert_allclose(tree.matrix(2), b)
+    
+    def test_resume(self):
+        gens = NamedGroupGenerator.D_n(7)
+        expected = matcal.generate_group(gens, 0.0001, 2000,
+                                         record_words=True).tree
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "generate.npz")
+            tree = matcal.SchreierTree(gens)
+            layers = matcal.iter_group_layers(gens, 0.0001, 2000, path, 0.0,
+                                              tree=tree)
+            next(layers)
+            next(layers)
+            layers.close()
+            result = matcal.generate_group(gens, 0.0001, 2000,
+                                           checkpoint_path=path,
+                                           record_words=True)
+        numpy.testing.assert_array_equal(result.tree.parent, expected.parent)
+        numpy.testing.assert_array_equal(result.tree.generator,
+                                         expected.generator)
+
+class InterruptController(NullController):
+    """
+    指定の回数だけ進捗が報告されたら中断するコントローラー。
+    """
+    def __init__(self, count):
+        self.count = count
+    def calc_progress(self, text):
+        self.count -= 1
+        if self.count == 0: raise KeyboardInterrupt()
+
+class TestCayleyTableToFile(unittest.TestCase):
+    def setUp(self):
+        result = matcal.generate_group(NamedGroupGenerator.D_n(7), 0.0001, 2000)
+        self.matlist = result.value
+        self.expected = matcal.calc_cayleytable(self.matlist, 0.0001).value
+    
+    def test_same_as_in_memory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.npy")
+            result = matcal.calc_cayleytable_to_file(
+                self.matlist, 0.0001, path, max_products=50)
+            self.assertTrue(result.has_value)
+            self.assertIsInstance(result.value.table, numpy.memmap)
+            numpy.testing.assert_array_equal(result.value.table,
+                                             self.expected.table)
+            self.assertFalse(os.path.exists(path + ".progress"))
+            del result
+    
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.npy")
+            with self.assertRaises(KeyboardInterrupt):
+                matcal.calc_cayleytable_to_file(
+                    self.matlist, 0.0001, path, InterruptController(2),
+                    max_products=50)
+            self.assertTrue(os.path.exists(path + ".progress"))
+            result = matcal.calc_cayleytable_to_file(
+                self.matlist, 0.0001, path, max_products=50)
+            numpy.testing.assert_array_equal(result.value.table,
+                                             self.expected.table)
+            del result
+    
+    def test_not_closed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.npy")
+            result = matcal.calc_cayleytable_to_file(
+                self.matlist[:-1], 0.0001, path)
+            self.assertFalse(result.has_value)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,44 @@
+import sys
+sys.path.append('../../')
+from application.calc.presentation import GroupPresentation, _parse_word
+from application.namedgroup.ggen import NamedGroupGenerator
+from application.namedgroup.gpres import NamedGroupPresentation
+import unittest
+from grouphelper import create_master
+
+class TestGroupPresentation(unittest.TestCase):
+    def test_parse_word(self):
+        test_case = [
+            ("a^4", [(0, 4)]),
+            ("(ab)^2", [(0, 1), (1, 1), (0, 1), (1, 1)]),
+            ("Baba", [(1, -1), (0, 1), (1, 1), (0, 1)]),
+            ("b^2a^-3", [(1, 2), (0, -3)]),
+            ("aA", []),
+            ]
+        for (word, expected) in test_case:
+            with self.subTest(word=word):
+                self.assertEqual(_parse_word(word, "ab"), expected)
+    
+    def test_parse_word_invalid(self):
+        for word in ("(ab", "ax", "a^"):
+            with self.subTest(word=word):
+                with self.assertRaises(ValueError):
+                    GroupPresentation("ab", (2, 2), (word,))
+    
+    def test_is_isomorphic_to_group(self):
+        d4 = create_master(NamedGroupGenerator.D_n(4)).maximal_group
+        q4 = create_master(NamedGroupGenerator.Q_n(4)).maximal_group
+        self.assertTrue(NamedGroupPresentation.D_n(4).is_isomorphic_to_group(d4))
+        self.assertFalse(NamedGroupPresentation.D_n(4).is_isomorphic_to_group(q4))
+        self.assertTrue(NamedGroupPresentation.Q_n(4).is_isomorphic_to_group(q4))
+    
+    def test_find_generator_images(self):
+        master = create_master(NamedGroupGenerator.S_n(4))
+        images = NamedGroupPresentation.S_n(4) \
+            .find_generator_images(master.maximal_group)
+        self.assertEqual(len(images), 3)
+        self.assertEqual(len(master.calc_closure(set(images))), 24)
+        self.assertTrue(all(master.index_order(g) == 2 for g in images))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import sys
+sys.path.append('../../')
+from application.calc.session import GroupSession
+from application.namedgroup.ggen import NamedGroupGenerator
+import os
+import tempfile
+import unittest
+from grouphelper import create_master
+
+class TestGroupSession(unittest.TestCase):
+    def test_save_and_load(self):
+        master = create_master(NamedGroupGenerator.D_n(6))
+        maximal = master.maximal_group
+        normals = maximal.all_normalsub
+        semidirect = maximal.semidirect_product
+        classes = maximal.conjugacy_classes
+        isomorphic = maximal.isomorphic
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.npz")
+            GroupSession.save(master, path)
+            loaded = GroupSession.load(path)
+            self.assertEqual(loaded.group_count, master.group_count)
+            self.assertEqual({g.name for g in loaded.all_groups},
+                             {g.name for g in master.all_groups})
+            group = loaded.name_to_group(maximal.name)
+            # 計算済みの値は読み込まれ、未計算の値は未計算のまま
+            self.assertIsNone(group.cached_value("all_normalsub"))
+            self.assertEqual({g.name for g in group.all_normalsub},
+                             {g.name for g in normals})
+            self.assertTrue(all(g.master is loaded
+                                for g in group.all_normalsub))
+            self.assertEqual({(p.left.name, p.right.name)
+                              for p in group.semidirect_product},
+                             {(p.left.name, p.right.name) for p in semidirect})
+            self.assertEqual([(c.order, c.elements)
+                              for c in group.conjugacy_classes],
+                             [(c.order, c.elements) for c in classes])
+            self.assertEqual(group.isomorphic, isomorphic)
+            self.assertIsNone(group.cached_value("center"))
+            self.assertEqual(group.center.elements, maximal.center.elements)
+            GroupSession.close(loaded)
+    
+    def test_save_loaded_session(self):
+        master = create_master(NamedGroupGenerator.S_n(4))
+        maximal = master.maximal_group
+        normals = {g.name for g in maximal.all_normalsub}
+        isomorphic = maximal.isomorphic
+        with tempfile.TemporaryDirectory() as tmp:
+            path1 = os.path.join(tmp, "session1.npz")
+            path2 = os.path.join(tmp, "session2.npz")
+            GroupSession.save(master, path1)
+            # 読み込んだだけで参照していない値も保存される
+            loaded = GroupSession.load(path1)
+            loaded.name_to_group(maximal.name).center
+            GroupSession.save(loaded, path2)
+            GroupSession.close(loaded)
+            reloaded = GroupSession.load(path2)
+            group = reloaded.name_to_group(maximal.name)
+            self.assertIsNone(group.cached_value("all_normalsub"))
+            self.assertEqual({g.name for g in group.stored_value(
+                "all_normalsub")}, normals)
+            self.assertEqual(group.stored_value("isomorphic"), isomorphic)
+            self.assertIsNotNone(group.stored_value("center"))
+            GroupSession.close(reloaded)
+    
+    def test_overwrite_loaded_session(self):
+        master = create_master(NamedGroupGenerator.D_n(6))
+        maximal = master.maximal_group
+        normals = {g.name for g in maximal.all_normalsub}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.npz")
+            GroupSession.save(master, path)
+            loaded = GroupSession.load(path)
+            group = loaded.name_to_group(maximal.name)
+            # 読み込み中のファイルに上書きしても、未読み込みの値を読み込める
+            other = create_master(NamedGroupGenerator.S_n(4))
+            other.maximal_group.all_normalsub
+            GroupSession.save(other, path)
+            self.assertEqual({g.name for g in group.all_normalsub}, normals)
+            GroupSession.close(loaded)
+            self.assertEqual(os.listdir(tmp), ["session.npz"])
+            reloaded = GroupSession.load(path)
+            self.assertEqual(reloaded.order, 24)
+            GroupSession.close(reloaded)
+    
+    def test_quotient(self):
+        master = create_master(NamedGroupGenerator.S_n(4))
+        maximal = master.maximal_group
+        normal = [g for g in maximal.all_normalsub if g.order == 4][0]
+        quotient = maximal.quotient(normal)
+        normals = {g.name for g in quotient.maximal_group.all_normalsub}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.npz")
+            GroupSession.save(quotient, path)
+            loaded = GroupSession.load(path)
+            self.assertIsNone(loaded.matrix_rep_of_elements)
+            self.assertEqual(loaded.order, 6)
+            group = loaded.name_to_group(quotient.maximal_group.name)
+            self.assertEqual({g.name for g in group.all_normalsub}, normals)
+            GroupSession.close(loaded)
+
+if __name__ == "__main__":
+    unittest.main()
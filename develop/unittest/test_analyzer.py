@@ -0,0 +1,59 @@
+import sys
+sys.path.append('../')
+from application.analyzer import GroupAnalyzer
+from application.formatter import AnalysisFormatter
+from application.calc import matcal
+from application.calc.group import MasterGroup
+from application.controller import NullController
+from application.service import AppServise
+from application.namedgroup.ggen import NamedGroupGenerator
+import unittest
+
+def create_analyzer(generators):
+    result = matcal.generate_group(generators, 0.0001, 2000)
+    result = matcal.calc_cayleytable(result.value, 0.0001)
+    master = MasterGroup(result.value)
+    master.group_initial = "g"
+    return GroupAnalyzer(master)
+
+class TestGroupAnalyzer(unittest.TestCase):
+    def test_structured_results(self):
+        analyzer = create_analyzer(NamedGroupGenerator.S_n(4))
+        g0 = analyzer.maximal_group
+        self.assertIs(analyzer.group(g0.name), g0)
+        self.assertEqual([g.order for g in analyzer.normal_subgroups(g0)],
+                         [24, 12, 4, 1])
+        self.assertFalse(analyzer.is_simple(g0))
+        self.assertTrue(analyzer.is_solvable(g0))
+        self.assertEqual(analyzer.center(g0).order, 1)
+        overview = analyzer.overview(g0)
+        self.assertEqual((overview.order, overview.isomorphic), (24, "S(4)"))
+        self.assertEqual(len(analyzer.elements(g0)), 24)
+    
+    def test_is_simple_and_solvable(self):
+        analyzer = create_analyzer(NamedGroupGenerator.A_n(5))
+        g0 = analyzer.maximal_group
+        self.assertTrue(analyzer.is_simple(g0))
+        self.assertFalse(analyzer.is_solvable(g0))
+        trivial = analyzer.master.trivial_group
+        self.assertTrue(analyzer.is_solvable(trivial))
+    
+    def test_formatter(self):
+        analyzer = create_analyzer(NamedGroupGenerator.D_n(3))
+        g0 = analyzer.maximal_group
+        text = AnalysisFormatter.is_simple(g0, analyzer.is_simple(g0))
+        self.assertEqual(text, f'{g0.name} は 単純群でない。\n')
+        text = AnalysisFormatter.center(g0, analyzer.center(g0))
+        self.assertTrue(text.startswith(f'{g0.name} の中心：\n'))
+    
+    def test_service_analyzer(self):
+        service = AppServise(NamedGroupGenerator.D_n(4), 0.0001, 2000,
+                             controller=NullController())
+        analyzer = service.analyzer
+        self.assertIs(analyzer.master, service.master)
+        g0 = analyzer.maximal_group
+        self.assertEqual(analyzer.isomorphic(g0), g0.isomorphic)
+        self.assertEqual(analyzer.center(g0).order, 2)
+
+if __name__ == "__main__":
+    unittest.main()
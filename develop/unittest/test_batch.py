@@ -0,0 +1,84 @@
+import sys
+import numpy
+sys.path.append('../')
+from application import batch
+from application.controller import NullController
+from application.service import AppServise
+from application.namedgroup.ggen import NamedGroupGenerator
+import io
+import json
+import os
+import tempfile
+import unittest
+
+class TestBatch(unittest.TestCase):
+    def test_read_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "input.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps({"id": "z4",
+                                    "generators": [[[[0, 1]]]]}) + "\n")
+                f.write(json.dumps({"generators": [[[0, 1], [1, 0]]],
+                                    "maximal": 10}) + "\n")
+            sets = batch.read_generator_sets(path)
+        self.assertEqual([s["id"] for s in sets], ["z4", "1"])
+        numpy.testing.assert_array_equal(sets[0]["generators"][0], [[1j]])
+        self.assertEqual(sets[1]["maximal"], 10)
+    
+    def test_run_batch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "input.npz")
+            numpy.savez(path, d4=numpy.array(NamedGroupGenerator.D_n(4)),
+                        bad=numpy.array([[[2.0]]]))
+            sets = batch.read_generator_sets(path)
+        output = io.StringIO()
+        n = batch.run_batch(sets, ["Isomorphic", "IsAbelian"], 0.0001, 2000,
+                            output, workers=1)
+        self.assertEqual(n, 1)
+        results = {r["id"]: r for r in
+                   map(json.loads, output.getvalue().splitlines())}
+        self.assertTrue(results["d4"]["succeeded"])
+        self.assertEqual(results["d4"]["order"], 8)
+        self.assertIs(results["d4"]["commands"]["IsAbelian"], False)
+        self.assertEqual(results["d4"]["commands"]["Isomorphic"],
+                         results["d4"]["isomorphic"])
+        self.assertFalse(results["bad"]["succeeded"])
+    
+    def test_all_commands(self):
+        sets = [{"id": "d4", "generators": NamedGroupGenerator.D_n(4)}]
+        output = io.StringIO()
+        batch.run_batch(sets, batch.COMMAND_NAMES, 0.0001, 2000, output,
+                        workers=1)
+        commands = json.loads(output.getvalue())["commands"]
+        self.assertEqual(set(commands), set(batch.COMMAND_NAMES))
+        for value in commands.values():
+            self.assertFalse(isinstance(value, dict) and "error" in value)
+        self.assertEqual(len(commands["Elements"]), 8)
+        self.assertEqual(sorted(g["order"] for g in commands["Normal"]),
+                         [1, 2, 4, 4, 4, 8])
+        self.assertEqual(commands["Center"]["order"], 2)
+        self.assertEqual(sum(c["element_num"]
+                             for c in commands["ConjClass"]), 8)
+        self.assertEqual(commands["?"]["is_solvable"], True)
+    
+    def test_command_names(self):
+        # 解析画面のコマンドは全てバッチでも実行できる
+        service = AppServise(NamedGroupGenerator.D_n(3), 0.0001, 2000,
+                             controller=NullController())
+        self.assertEqual(set(batch.COMMAND_NAMES), set(service.command_names))
+    
+    def test_time_limit(self):
+        sets = [{"id": "s4", "generators": NamedGroupGenerator.S_n(4)}]
+        output = io.StringIO()
+        batch.run_batch(sets, ["Normal"], 0.0001, 2000, output, workers=1,
+                        time_limit=0.0)
+        result = json.loads(output.getvalue())
+        self.assertTrue(result["succeeded"])
+        self.assertIn("interrupted", result["commands"]["Normal"])
+    
+    def test_unknown_command(self):
+        self.assertRaises(ValueError, batch.run_batch, [], ["Unknown"],
+                          0.0001, 2000, io.StringIO())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys
+sys.path.append('../')
+from application import benchmark
+import copy
+import unittest
+
+class TestBenchmark(unittest.TestCase):
+    def test_run_benchmark(self):
+        result = benchmark.run_benchmark(["D_n", "S_n"], max_order=8)
+        self.assertEqual([(r["family"], r["n"]) for r in result["results"]],
+                         [("D_n", 4), ("S_n", 3)])
+        record = result["results"][0]
+        self.assertEqual((record["order"], record["status"]), (8, "ok"))
+        self.assertEqual(set(record["stages"]), set(benchmark.STAGES))
+        self.assertGreater(record["counters"]["closures_computed"], 0)
+    
+    def test_timeout(self):
+        record = benchmark.run_case("S_n", 4, time_limit=0.0)
+        self.assertEqual(record["status"], "timeout")
+    
+    def test_compare_results(self):
+        baseline = benchmark.run_benchmark(["D_n"], max_order=8)
+        current = copy.deepcopy(baseline)
+        stages = current["results"][0]["stages"]
+        stages["cayley_table"]["wall"] = (
+            baseline["results"][0]["stages"]["cayley_table"]["wall"]*3 + 0.01)
+        regressions = benchmark.compare_results(baseline, current)
+        self.assertEqual([r["stage"] for r in regressions], ["cayley_table"])
+
+    def test_scaling_report(self):
+        orders = [8, 16, 32, 64]
+        result = {"results": [
+            {"family": "X", "n": n, "order": n, "status": "ok",
+             "stages": {"cayley_table": {"wall": 1e-6 * n**3, "cpu": 0.0},
+                        "master": {"wall": 1e-6 * n**3, "cpu": 0.0}},
+             "counters": {"closures_computed": n}}
+            for n in orders]}
+        fit = benchmark.fit_power_law(orders, [2.0 * n**1.5 for n in orders])
+        self.assertAlmostEqual(fit["exponent"], 1.5)
+        self.assertAlmostEqual(fit["coefficient"], 2.0)
+        report = benchmark.scaling_report(result)
+        self.assertFalse(report["stages"]["cayley_table"]["flagged"])
+        self.assertTrue(report["stages"]["master"]["flagged"])
+        self.assertIsNone(report["stages"]["generate"]["fit"])
+        capacity = benchmark.estimate_capacity(report, 2.001e-6 * 100**3)
+        self.assertEqual(capacity["time"], 100)
+
+if __name__ == '__main__':
+    unittest.main()
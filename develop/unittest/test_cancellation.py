@@ -0,0 +1,59 @@
+import sys
+sys.path.append('../')
+import os
+import tempfile
+from application.controller import CancellationToken, NullController
+from application.exceptions import CalculationCancelled, CalculationTimeout
+from application.calc import matcal
+from application.namedgroup.ggen import NamedGroupGenerator
+from application.service import AppServise
+import unittest
+
+class TestCancellationToken(unittest.TestCase):
+    def test_cancel(self):
+        token = CancellationToken()
+        token.check()
+        token.cancel()
+        self.assertRaises(CalculationCancelled, token.check)
+        token.reset()
+        token.check()
+
+    def test_limits(self):
+        token = CancellationToken()
+        token.reset(step_limit=10)
+        token.check(10)
+        with self.assertRaises(CalculationTimeout) as cm:
+            token.check()
+        self.assertEqual(cm.exception.steps, 11)
+        token.reset(time_limit=0.0)
+        self.assertRaises(CalculationTimeout, token.check)
+
+class TestInterruptedCalculation(unittest.TestCase):
+    def test_generate_group_resumes(self):
+        generators = NamedGroupGenerator.S_n(4)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "checkpoint.npz")
+            ctrl = NullController()
+            ctrl.cancellation_token = CancellationToken()
+            ctrl.cancellation_token.reset(step_limit=20)
+            self.assertRaises(CalculationTimeout, matcal.generate_group,
+                              generators, 0.0001, 2000, ctrl, path)
+            self.assertTrue(os.path.exists(path))
+            result = matcal.generate_group(generators, 0.0001, 2000,
+                                           checkpoint_path=path)
+            self.assertEqual(len(result.value), 24)
+            self.assertFalse(os.path.exists(path))
+
+    def test_command_step_limit(self):
+        service = AppServise(NamedGroupGenerator.S_n(4), 0.0001, 2000,
+                             controller=NullController(),
+                             command_step_limit=5)
+        text = service.exec_command("Normal[g0]")
+        self.assertTrue(text.startswith(AppServise._errmsg_timeout))
+        # 中断された値は保持されず、制限を外せば計算できる
+        service.command_step_limit = None
+        text = service.exec_command("Normal[g0]")
+        self.assertIn("正規部分群の一覧", text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+sys.path.append('../')
+from application.controller import Controller, ProgressTracker, format_seconds
+import unittest
+
+class RecordingController(Controller):
+    def __init__(self):
+        self.progress = []
+    def message(self, text: str):
+        pass
+    def calc_start(self, text: str):
+        pass
+    def calc_progress(self, text: str):
+        self.progress.append(text)
+    def calc_end(self, text: str):
+        pass
+
+class TestProgressTracker(unittest.TestCase):
+    def test_throttle(self):
+        ctrl = RecordingController()
+        ctrl.max_progress_rate = 1 / 60
+        tracker = ProgressTracker(ctrl, 1000, "行")
+        for i in range(1000):
+            tracker.update(i+1)
+        # 最初の通知と、総量に達したときの通知のみ
+        self.assertEqual(len(ctrl.progress), 2)
+        self.assertTrue(ctrl.progress[-1].startswith("-- 進捗: 1000/1000行"))
+    
+    def test_batched_updates(self):
+        ctrl = RecordingController()
+        tracker = ProgressTracker(ctrl, None, "要素")
+        for i in range(100000):
+            tracker.add()
+        self.assertEqual(tracker.done, 100000)
+        # 制限のないコントローラーでも、時刻の確認ごとにのみ通知する
+        self.assertLess(len(ctrl.progress), 1000)
+    
+    def test_report_progress(self):
+        ctrl = RecordingController()
+        ctrl.max_progress_rate = 1 / 60
+        self.assertTrue(ctrl.report_progress("a"))
+        self.assertFalse(ctrl.report_progress(lambda: self.fail()))
+        self.assertTrue(ctrl.report_progress(lambda: "b", force=True))
+        self.assertEqual(ctrl.progress, ["a", "b"])
+
+    def test_remaining_time(self):
+        ctrl = RecordingController()
+        tracker = ProgressTracker(ctrl, 100, "要素", "要素数",
+                                  total_is_bound=True)
+        tracker.start_from(10)
+        self.assertIsNone(tracker.remaining_time)
+        tracker._start -= 2.0
+        tracker.update(30, "loop(1)")
+        self.assertAlmostEqual(tracker.rate, 10.0, places=1)
+        self.assertAlmostEqual(tracker.remaining_time, 7.0, places=1)
+        self.assertIn("上限まで残り約", ctrl.progress[-1])
+        self.assertTrue(ctrl.progress[-1].endswith("loop(1)"))
+
+    def test_format_seconds(self):
+        self.assertEqual(format_seconds(5.25), "5.2秒")
+        self.assertEqual(format_seconds(125), "2分5秒")
+        self.assertEqual(format_seconds(3725), "1時間2分")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import sys
+sys.path.append('../')
+import json
+import os
+import tempfile
+from application.controller import NullController
+from application.profiler import Profiler
+from application.calc import matcal
+from application.calc.group import MasterGroup
+from application.namedgroup.ggen import NamedGroupGenerator
+import unittest
+
+class TestProfiler(unittest.TestCase):
+    def test_nested_spans(self):
+        profiler = Profiler(track_memory=True)
+        with profiler.span("outer"):
+            with profiler.span("inner"):
+                data = [0] * 100000
+            del data
+        profiler.close()
+        spans = {s["name"]: s for s in profiler.spans}
+        self.assertEqual((spans["outer"]["depth"], spans["inner"]["depth"]),
+                         (0, 1))
+        self.assertGreaterEqual(spans["outer"]["wall"],
+                                spans["inner"]["wall"])
+        self.assertGreaterEqual(spans["outer"]["peak_memory"], 800000)
+
+    def test_pipeline(self):
+        profiler = Profiler()
+        ctrl = NullController()
+        ctrl.profiler = profiler
+        result = matcal.generate_group(NamedGroupGenerator.D_n(4), 0.0001,
+                                       2000, ctrl)
+        result = matcal.calc_cayleytable(result.value, 0.0001, ctrl)
+        master = MasterGroup(result.value, controller=ctrl)
+        master.maximal_group.all_normalsub
+        summary = profiler.summary()
+        for name in ("generate_group", "calc_cayleytable",
+                     "MasterGroup.inverse_data", "Group.all_normalsub"):
+            self.assertIn(name, summary)
+        counters = profiler.counters
+        self.assertGreater(counters["matrix_comparisons"], 0)
+        self.assertGreater(counters["closures_computed"], 0)
+        self.assertGreater(counters["subgroups_created"], 0)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "trace.json")
+            profiler.save_chrome_trace(path)
+            with open(path, "r", encoding="utf-8") as f:
+                events = json.load(f)["traceEvents"]
+        self.assertIn("X", {e["ph"] for e in events})
+        self.assertIn("C", {e["ph"] for e in events})
+
+if __name__ == '__main__':
+    unittest.main()
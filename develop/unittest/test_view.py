@@ -0,0 +1,47 @@
+import sys
+sys.path.append('../')
+from application.controller import CancellationToken
+from application.view import AppWindow
+import threading
+import time
+import unittest
+
+class TestWorker(unittest.TestCase):
+    def setUp(self):
+        self.token = CancellationToken()
+        self.running = threading.Event()
+        self.n_running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def exec_cmd(self, cmd_text):
+        # AppServise と同様に、コマンドの開始時にトークンを戻す
+        self.token.reset()
+        with self.lock:
+            self.n_running += 1
+            self.max_running = max(self.max_running, self.n_running)
+        self.running.set()
+        try:
+            while True:
+                self.token.check()
+                time.sleep(0.001)
+        finally:
+            with self.lock:
+                self.n_running -= 1
+
+    def test_stop_worker_waits_for_cancelled_command(self):
+        window = AppWindow(self.exec_cmd, self.token.cancel)
+        for job_id in (1, 2):
+            self.running.clear()
+            window._start_worker()
+            window._running_job = job_id
+            window._job_queue.put((job_id, "Normal[g0]"))
+            self.assertTrue(self.running.wait(1.0))
+            worker = window._worker
+            window._stop_worker()
+            self.assertFalse(worker.is_alive())
+            self.assertEqual(self.n_running, 0)
+        self.assertEqual(self.max_running, 1)
+
+if __name__ == "__main__":
+    unittest.main()
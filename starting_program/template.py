@@ -49,8 +49,12 @@ maximal = 2000
 # 基本的に編集不要(0.0001)
 zero_base = 0.0001
 
+# 計算結果の保存先
+# Noneならば保存しない
+cache_dir = "./cache"
+
 # 群の生成を実行
-app = AppServise(generators, zero_base, maximal)
+app = AppServise(generators, zero_base, maximal, cache_dir)
 # 生成成功なら解析画面を開く
 if app.is_succeeded:
     app()
\ No newline at end of file